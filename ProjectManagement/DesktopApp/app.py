@@ -1,15 +1,38 @@
-import json
+import multiprocessing
 import os
+import queue
+import sys
+import time
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import ttk, messagebox
 
-import pulp
-import matplotlib
-matplotlib.use("TkAgg")  # Embedding matplotlib in Tk
-from matplotlib import pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+# Shared scheduling package lives one level up in ProjectManagement/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from scheduling import sensitivity_report
+from scheduling.cache import SolutionCache
+from scheduling.dispatch import check_method, schedule
+from scheduling.incremental import IncrementalCPM
+from scheduling.project import Project
+from scheduling.resources import ROLES
 
 JSON_FILE = "tasks.json"
+COLUMNS = ("id","description","best","expected","worst",
+           "projectManager","fullStackDev1","fullStackDev2","cloudDevops","dataEngineer")
+
+
+class StaleSolve(Exception):
+    """A newer solve or edit superseded the one running."""
+
+
+def run_in_child(conn, fn, *args):
+    """Child process: send back (True, fn(*args)) or (False, error message)."""
+    try:
+        conn.send((True, fn(*args)))
+    except Exception as err:
+        conn.send((False, str(err)))
+    finally:
+        conn.close()
 
 class TaskManagerApp(tk.Tk):
     def __init__(self):
@@ -21,16 +44,41 @@ class TaskManagerApp(tk.Tk):
 
         # Store scenario choice (best/expected/worst) + last solution
         self.scenario_var = tk.StringVar(value="expected")
+        # auto: CPM, or the RCPSP solvers when staff is limited;
+        # lp/cbc/highs solve the LP with a solver backend
+        self.method_var = tk.StringVar(value="auto")
+        self.limit_staff_var = tk.BooleanVar(value=False)
+        self.capacity_vars = {role: tk.IntVar(value=1) for role in ROLES}
         self.last_solution = None  # Will hold start/end times after solving
+        self.gantt = None  # GanttChart + canvas, created on the first solve
+        self.gantt_canvas = None
+        # Re-solving unchanged inputs is a cache hit; SCHEDULE_CACHE_DIR adds a disk tier
+        self.solution_cache = SolutionCache(path=os.environ.get("SCHEDULE_CACHE_DIR"))
 
-        # Data structures for tasks
+        # Data structures for tasks (tasks_data mirrors the Treeview rows)
         self.tasks_data = []
         self.predecessors_map = {}
 
+        # Solves run on one background worker and report back through a queue
+        # polled from the Tk loop. Every new solve or edit bumps the generation
+        # so results from stale solves are dropped. Staff-limited solves (the
+        # MILP can run for its whole time limit) go to a child process that is
+        # terminated as soon as they are stale, so they never block the next one.
+        self.worker = ThreadPoolExecutor(max_workers=1)
+        self.processes = multiprocessing.get_context("spawn")  # forking a Tk process is unsafe
+        self.results_queue = queue.Queue()
+        self.generation = 0
+        self.pending = None
+        # CPM state of the last precedence-only solve, updated in place on edits
+        self.incremental = None
+        self.incremental_context = None
+
         # Build UI
         self.create_layout()
         self.load_data(JSON_FILE)
         self.populate_treeview()
+        self.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.after(50, self.poll_results)
 
     # -------------------------- LAYOUT -------------------------- #
     def create_layout(self):
@@ -47,6 +95,20 @@ class TaskManagerApp(tk.Tk):
             values=["best","expected","worst"], width=10
         )
         scenario_combo.pack(side="left")
+
+        ttk.Label(top_frame, text="Solver:").pack(side="left", padx=5)
+        method_combo = ttk.Combobox(
+            top_frame, textvariable=self.method_var,
+            values=["auto","cpm","lp","cbc","highs","milp","sgs","parallel-sgs"], width=11
+        )
+        method_combo.pack(side="left")
+
+        # Staffing limits: how many people fill each role column
+        ttk.Checkbutton(top_frame, text="Limit staff:", variable=self.limit_staff_var).pack(side="left", padx=(15, 5))
+        for role in ROLES:
+            ttk.Label(top_frame, text=role).pack(side="left")
+            ttk.Spinbox(top_frame, from_=1, to=99, width=3,
+                        textvariable=self.capacity_vars[role]).pack(side="left", padx=(0, 5))
         
         solve_btn = ttk.Button(top_frame, text="Solve Schedule", command=self.solve_schedule)
         solve_btn.pack(side="left", padx=10)
@@ -63,10 +125,8 @@ class TaskManagerApp(tk.Tk):
         right_frame.pack(side="right", fill="y", padx=5, pady=5)
 
         # Treeview in the left_frame
-        columns = ("id","description","best","expected","worst",
-                   "projectManager","fullStackDev1","fullStackDev2","cloudDevops","dataEngineer")
-        self.tree = ttk.Treeview(left_frame, columns=columns, show="headings")
-        for col in columns:
+        self.tree = ttk.Treeview(left_frame, columns=COLUMNS, show="headings")
+        for col in COLUMNS:
             self.tree.heading(col, text=col.capitalize())
             self.tree.column(col, width=100, anchor="center")
         self.tree.bind("<Double-1>", self.on_tree_double_click)
@@ -86,29 +146,21 @@ class TaskManagerApp(tk.Tk):
         if not os.path.exists(path):
             messagebox.showerror("File Error", f"Cannot find {path}")
             return
-        with open(path, "r") as f:
-            data = json.load(f)
-        self.tasks_data = data.get("tasks", [])
-        self.predecessors_map = data.get("predecessors", {})
+        try:
+            project = Project.load(path)  # streams the file; rejects cycles/unknown IDs
+        except ValueError as err:
+            messagebox.showerror("File Error", f"{path}: {err}")
+            return
+        self.tasks_data = list(project.task_rows())
+        self.predecessors_map = {t: project.predecessors[t] for t in project.predecessors}
 
     def populate_treeview(self):
         """Insert the loaded tasks into the Treeview."""
         for row_id in self.tree.get_children():
             self.tree.delete(row_id)
-        for task in self.tasks_data:
-            vals = (
-                task.get("id",""),
-                task.get("description",""),
-                task.get("best",0),
-                task.get("expected",0),
-                task.get("worst",0),
-                task.get("projectManager",0),
-                task.get("fullStackDev1",0),
-                task.get("fullStackDev2",0),
-                task.get("cloudDevops",0),
-                task.get("dataEngineer",0)
-            )
-            self.tree.insert("", tk.END, values=vals)
+        for i, task in enumerate(self.tasks_data):
+            vals = tuple(task.get(col, "" if col in ("id", "description") else 0) for col in COLUMNS)
+            self.tree.insert("", tk.END, iid=str(i), values=vals)  # iid = index into tasks_data
 
     # -------------------------- EDITING -------------------------- #
     def on_tree_double_click(self, event):
@@ -130,71 +182,184 @@ class TaskManagerApp(tk.Tk):
 
         def save_val():
             new_val = e.get()
+            if col_index >= 2:  # numeric columns
+                try:
+                    new_val = float(new_val)
+                except ValueError:
+                    messagebox.showerror("Edit", f"'{new_val}' is not a number", parent=edit_win)
+                    return
             old_values[col_index] = new_val
             self.tree.item(sel, values=old_values)
             edit_win.destroy()
+            self.apply_edit(int(sel), COLUMNS[col_index], new_val)
 
         ttk.Button(edit_win, text="OK", command=save_val).pack(pady=5)
 
-    def gather_data(self):
-        """Pull updated data from the Treeview back into a list of dicts."""
-        updated = []
-        for row_id in self.tree.get_children():
-            vals = self.tree.item(row_id, "values")
-            # Convert numeric columns to float
-            updated.append({
-                "id": vals[0],
-                "description": vals[1],
-                "best": float(vals[2]),
-                "expected": float(vals[3]),
-                "worst": float(vals[4]),
-                "projectManager": float(vals[5]),
-                "fullStackDev1": float(vals[6]),
-                "fullStackDev2": float(vals[7]),
-                "cloudDevops": float(vals[8]),
-                "dataEngineer": float(vals[9])
-            })
-        return updated
+    def apply_edit(self, row, column, value):
+        """Store an edited cell and update the schedule without a button press.
+
+        A duration edit in the scenario being shown is applied to the
+        incremental CPM state (only the edited task's cone is recomputed);
+        anything else that can change the schedule starts a background solve.
+        """
+        task = self.tasks_data[row]
+        old = task[column]
+        task[column] = value
+        if column == "id":
+            # keep predecessor references pointing at the renamed task
+            self.predecessors_map = {
+                value if t == old else t: [value if p == old else p for p in preds]
+                for t, preds in self.predecessors_map.items()
+            }
+            self.incremental = None
+        elif column == "description":
+            return
+
+        scenario = self.scenario_var.get().lower()
+        limited = self.limit_staff_var.get()
+        if column in ("best", "expected", "worst") and column != scenario:
+            return
+        if column in ROLES and not limited:
+            return
+        if column == scenario and self.incremental is not None and \
+                self.incremental_context == self.solve_context():
+            t0 = time.perf_counter()
+            touched = self.incremental.set_duration(task["id"], value)
+            sol = self.incremental.solution()
+            elapsed = (time.perf_counter() - t0) * 1000
+            self.generation += 1  # results of any solve still running are stale now
+            self.show_schedule(scenario, sol, False,
+                               f"Incremental update: {touched} task(s) re-evaluated in {elapsed:.1f} ms\n")
+            self.submit(self.generation, self.sensitivity_job,
+                        self.generation, list(self.incremental.ids), self.predecessors_map,
+                        self.incremental.duration_map(), sol)
+            return
+        self.solve_schedule()
+
+    def solve_context(self):
+        return (self.scenario_var.get().lower(), self.method_var.get().lower(),
+                self.limit_staff_var.get())
 
     # -------------------------- SOLVING -------------------------- #
     def solve_schedule(self):
-        """Build a PuLP model for the chosen scenario, solve, and display results & Gantt."""
-        scenario = self.scenario_var.get().lower()
-        task_rows = self.gather_data()
-
-        # Construct a map from taskID -> scenario hours
-        dur_map = {}
-        for t in task_rows:
-            dur_map[t["id"]] = t[scenario]
-
-        # Build LP
-        model = pulp.LpProblem("ProjectPlan", pulp.LpMinimize)
-        S = { t["id"]: pulp.LpVariable(f"S_{t['id']}", lowBound=0) for t in task_rows }
-        C = { t["id"]: pulp.LpVariable(f"C_{t['id']}", lowBound=0) for t in task_rows }
-        T_max = pulp.LpVariable("T_max", lowBound=0)
-
-        model += T_max, "MinimizeProjectFinish"
-
-        for t in task_rows:
-            tid = t["id"]
-            d = dur_map[tid]
-            model += (C[tid] == S[tid] + d), f"Duration_{tid}"
-            model += (C[tid] <= T_max),     f"Bound_{tid}"
-            
-            # Predecessors
-            preds = self.predecessors_map.get(tid, [])
-            for p in preds:
-                if p in dur_map:  # only constrain if in our known tasks
-                    model += (S[tid] >= C[p]), f"Pred_{p}_to_{tid}"
-
-        solver = pulp.PULP_CBC_CMD(msg=False)
-        model.solve(solver)
-        status = pulp.LpStatus[model.status]
-        finish_time = pulp.value(model.objective)
+        """Solve the chosen scenario (CPM, LP backend or staff-limited) on the worker thread."""
+        scenario, method, limited = self.solve_context()
+        capacities = {role: var.get() for role, var in self.capacity_vars.items()} if limited else None
+        try:
+            check_method(method, capacities)
+        except ValueError as err:
+            hint = "untick 'Limit staff'" if limited else "tick 'Limit staff'"
+            messagebox.showerror("Solver", f"{err}; or {hint}.")
+            return
+
+        self.generation += 1
+        self.results_text.delete("1.0", tk.END)
+        self.results_text.insert(tk.END, f"Solving {scenario} scenario...\n")
+        # Snapshot the rows so later edits cannot change a solve in flight
+        rows = [dict(task) for task in self.tasks_data]
+        self.submit(self.generation, self.solve_job, self.generation, rows,
+                    dict(self.predecessors_map), scenario, method, capacities)
+
+    def submit(self, generation, job, *args):
+        if self.pending is not None:
+            self.pending.cancel()  # only stops a job that has not started yet
+        self.pending = self.worker.submit(self.run_job, generation, job, *args)
+
+    def run_job(self, generation, job, *args):
+        if generation != self.generation:
+            return  # superseded before it started
+        try:
+            self.results_queue.put((generation,) + job(*args))
+        except StaleSolve:
+            pass
+        except Exception as err:  # surface solver failures in the UI
+            self.results_queue.put((generation, "error", str(err)))
+
+    def solve_job(self, generation, rows, predecessors, scenario, method, capacities):
+        """Worker thread: full solve, then (unlimited) sensitivity and CPM state."""
+        project = Project.from_dicts(rows, predecessors)
+        if capacities is not None:
+            sol = schedule(project, None, scenario, method, capacities=capacities,
+                           cache=self.solution_cache, label=scenario,
+                           runner=lambda solve, *args: self.run_cancellable(generation, solve, *args))
+            return "solved", (scenario, sol, True, None, None, None)
+
+        # Precedence-only schedule: "auto" runs the CPM passes, which give
+        # the LP optimum directly; lp/cbc/highs use that LP backend
+        sol = schedule(project, None, scenario, method, cache=self.solution_cache, label=scenario)
+        if generation != self.generation:
+            return "stale", None
+        incremental = IncrementalCPM(project, scenario) if method in ("auto", "cpm") else None
+        report = sensitivity_report(project, None, scenario)
+        return "solved", (scenario, sol, False, report, incremental, (scenario, method, False))
+
+    def run_cancellable(self, generation, fn, *args):
+        """Worker thread: fn(*args) in a child process, terminated if the solve goes stale."""
+        receiver, sender = self.processes.Pipe(duplex=False)
+        process = self.processes.Process(target=run_in_child, args=(sender, fn) + args, daemon=True)
+        process.start()
+        sender.close()
+        try:
+            while not receiver.poll(0.05):
+                if generation != self.generation:
+                    process.terminate()
+                    raise StaleSolve()
+                if not process.is_alive() and not receiver.poll():
+                    raise RuntimeError(f"Solver process exited with code {process.exitcode}")
+            ok, value = receiver.recv()
+        finally:
+            process.join()
+            receiver.close()
+        if not ok:
+            raise RuntimeError(value)
+        return value
+
+    def sensitivity_job(self, generation, task_ids, predecessors, durations, sol):
+        return "sensitivity", sensitivity_report(task_ids, predecessors, durations, solution=sol)
+
+    def poll_results(self):
+        """Tk loop: apply finished worker results that are still current."""
+        try:
+            while True:
+                generation, kind, payload = self.results_queue.get_nowait()
+                if generation != self.generation or kind == "stale":
+                    continue
+                if kind == "error":
+                    messagebox.showerror("Solver", payload)
+                elif kind == "solved":
+                    scenario, sol, limited, report, incremental, context = payload
+                    self.show_schedule(scenario, sol, limited)
+                    if incremental is not None:
+                        self.incremental = incremental
+                        self.incremental_context = context
+                    if report is not None:
+                        self.show_sensitivity(report)
+                elif kind == "sensitivity":
+                    self.show_sensitivity(payload)
+        except queue.Empty:
+            pass
+        self.after(50, self.poll_results)
+
+    def on_close(self):
+        self.generation += 1
+        self.worker.shutdown(wait=False, cancel_futures=True)
+        self.destroy()
+
+    def show_schedule(self, scenario, sol, limited, timing=None):
+        """Display textual results on the right and redraw the Gantt chart."""
+        status, finish_time = sol["status"], sol["T_max"]
+        start_dict, end_dict = sol["start_times"], sol["completion_times"]
+        if timing is None:
+            if sol.get("cached"):
+                stats = self.solution_cache.stats()
+                timing = f"Reused cached solution ({stats['hits']} hits / {stats['misses']} misses)\n"
+            elif "backend" in sol:
+                timing = (f"Backend: {sol['backend']} (build {sol['build_time'] * 1000:.1f} ms, "
+                          f"solve {sol['solve_time'] * 1000:.1f} ms)\n")
+            else:
+                timing = ""
 
         # Store solution for Gantt
-        start_dict = { t["id"]: pulp.value(S[t["id"]]) for t in task_rows }
-        end_dict   = { t["id"]: pulp.value(C[t["id"]]) for t in task_rows }
         self.last_solution = {
             "scenario": scenario.capitalize(),
             "status": status,
@@ -203,59 +368,60 @@ class TaskManagerApp(tk.Tk):
             "end_times": end_dict
         }
 
-        # Display textual results on the right
-        self.results_text.delete("1.0", tk.END)
-        self.results_text.insert(tk.END, f"Scenario: {scenario.capitalize()}\n")
-        self.results_text.insert(tk.END, f"Solver Status: {status}\n")
-        self.results_text.insert(tk.END, f"Finish Time = {finish_time:.2f} hours\n\n")
-
+        lines = [
+            f"Scenario: {scenario.capitalize()}\n",
+            f"Solver Status: {status}\n",
+            f"Finish Time = {finish_time:.2f} hours\n",
+            timing + "\n",
+        ]
         # Sort tasks by alphabetical ID for printing
-        for task in sorted(task_rows, key=lambda x: x["id"]):
-            tid = task["id"]
-            st = start_dict[tid]
-            ed = end_dict[tid]
-            self.results_text.insert(tk.END, f" Task {tid}: Start={st:.1f}, End={ed:.1f}\n")
+        for tid in sorted(start_dict):
+            lines.append(f" Task {tid}: Start={start_dict[tid]:.1f}, End={end_dict[tid]:.1f}\n")
+        if limited:
+            lines.append("\n(Sensitivity skipped: CPM floats assume unlimited staff)\n")
+        self.results_text.delete("1.0", tk.END)
+        self.results_text.insert(tk.END, "".join(lines))
 
         # Generate Gantt at bottom
         self.draw_gantt_chart()
 
+    def show_sensitivity(self, report):
+        """Append floats + the duration range that keeps the finish time."""
+        lines = ["\nSensitivity (float / duration range):\n"]
+        for tid in sorted(report):
+            row = report[tid]
+            flag = "*" if row["critical"] else " "
+            lines.append(
+                f"{flag}Task {tid}: TF={row['total_float']:.1f}, FF={row['free_float']:.1f}, "
+                f"Range=[{row['min_duration']:.1f}, {row['max_duration']:.1f}]\n"
+            )
+        lines.append("(* = on critical path)\n")
+        self.results_text.insert(tk.END, "".join(lines))
+
     # -------------------------- GANTT CHART -------------------------- #
     def draw_gantt_chart(self):
-        """Draw the Gantt chart in the bottom frame using matplotlib."""
-        for widget in self.gantt_frame.winfo_children():
-            widget.destroy()  # Clear old chart
+        """Draw the Gantt chart in the bottom frame using matplotlib.
 
+        One figure and canvas are created on the first solve and updated in
+        place afterwards, so repeated solves do not pile up figures.
+        """
         if not self.last_solution:
             return
-        
+        if self.gantt is None:
+            # matplotlib loads with the first chart, not before the window appears
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+
+            from scheduling.plotting import GanttChart
+
+            self.gantt = GanttChart(figsize=(12, 4), dpi=100)
+            self.gantt_canvas = FigureCanvasTkAgg(self.gantt.figure, master=self.gantt_frame)
+            self.gantt_canvas.get_tk_widget().pack(fill="both", expand=True)
+
         sol = self.last_solution
-        start_map = sol["start_times"]
-        end_map = sol["end_times"]
-        
-        # Sort tasks by ID or start time
-        tasks_sorted = sorted(start_map.keys())
-        
-        fig, ax = plt.subplots(figsize=(12,4), dpi=100)
-
-        # We'll reverse the order so the first is top
-        rev_tasks = list(reversed(tasks_sorted))
-        for i, t in enumerate(rev_tasks):
-            s = start_map[t]
-            e = end_map[t]
-            dur = e - s
-            ax.barh(i, dur, left=s, height=0.4, color="skyblue", edgecolor="black")
-            ax.text(s + dur/2, i, f"{t} ({dur:.1f}h)", va="center", ha="center", color="black")
-
-        ax.set_xlabel("Time (hours)")
-        ax.set_yticks(range(len(rev_tasks)))
-        ax.set_yticklabels(rev_tasks)
-        ax.set_title(f"Gantt Chart - {sol['scenario']} Scenario")
-
-        fig.tight_layout()
-        
-        canvas = FigureCanvasTkAgg(fig, master=self.gantt_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill="both", expand=True)
+        # Sort tasks by ID; the first is drawn at the top
+        self.gantt.update(sorted(sol["start_times"]), sol["start_times"], sol["end_times"],
+                          title=f"Gantt Chart - {sol['scenario']} Scenario")
+        self.gantt_canvas.draw_idle()
 
 # -------------------------- MAIN -------------------------- #
 if __name__ == "__main__":
@@ -0,0 +1,8 @@
+"""Headless batch runner; same as `python -m scheduling batch` (see scheduling/batch.py)."""
+
+import sys
+
+from scheduling.batch import main
+
+if __name__ == "__main__":
+    sys.exit(main(prog="batch.py"))
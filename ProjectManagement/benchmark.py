@@ -0,0 +1,162 @@
+"""Benchmark the scheduling stack on seeded synthetic task graphs.
+
+For every (shape, size, backend) this times the phases separately:
+
+* build:       backend.build() (graph -> model, no durations)
+* solve:       backend.solve() with the expected durations
+* extract:     turning the result into sorted (task, start, end) rows, as
+               solve_schedule and the DesktopApp do for display
+* sensitivity: the one-pass float/duration-range report (cpm only)
+* render:      one Gantt chart drawn with Agg (up to --render-limit tasks)
+
+"parallel-sgs" stands in for the staff-limited path (two people per role);
+its whole run counts as solve. Each record is one JSON line, and --baseline
+compares against an earlier results file to catch regressions.
+
+Example:
+    python benchmark.py --sizes 10 1000 100000 --backends cpm highs --output bench.jsonl
+    python benchmark.py --output new.jsonl --baseline bench.jsonl
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+from scheduling import sensitivity_report
+from scheduling.backends import get_backend
+from scheduling.plotting import GanttChart
+from scheduling.resources import ROLES, solve_rcpsp
+from scheduling.synthetic import GENERATORS, generate
+
+DEFAULT_SIZES = [10, 100, 1000, 10_000, 100_000]
+DEFAULT_LIMITS = {"cbc": 2000, "highs": 100_000, "cpm": 10**7, "parallel-sgs": 100_000}
+NOISE_FLOOR = 0.005  # seconds; smaller slowdowns are not reported
+
+
+def best_of(repeat, fn, *args):
+    """(result, fastest wall time) over `repeat` calls."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return out, best
+
+
+def extract_rows(ids, sol):
+    starts, ends = sol["start_times"], sol["completion_times"]
+    return [(t, starts[t], ends[t]) for t in sorted(ids)]
+
+
+def render(project, sol):
+    chart = GanttChart()
+    canvas = FigureCanvasAgg(chart.figure)
+    chart.update(sorted(project.ids), sol["start_times"], sol["completion_times"])
+    canvas.draw()
+
+
+def run_case(project, backend, repeat, render_limit):
+    times = {}
+    if backend == "parallel-sgs":
+        capacities = {role: 2 for role in ROLES}
+        demands = project.role_demands()
+        sol, times["solve"] = best_of(repeat, solve_rcpsp, project, None, "expected",
+                                      demands, capacities, "parallel-sgs")
+    else:
+        solver = get_backend(backend)
+        durations = project.duration_map("expected")
+        model, times["build"] = best_of(repeat, solver.build, project, None)
+        sol, times["solve"] = best_of(repeat, solver.solve, model, durations)
+    _, times["extract"] = best_of(repeat, extract_rows, project.ids, sol)
+    if backend == "cpm":
+        _, times["sensitivity"] = best_of(repeat, sensitivity_report, project, None, "expected", sol)
+    if len(project) <= render_limit:
+        _, times["render"] = best_of(1, render, project, sol)
+    return sol, times
+
+
+def compare(records, baseline_path, tolerance):
+    """Print phases slower than the baseline; returns how many regressed."""
+    baseline = {}
+    with open(baseline_path) as f:
+        for line in f:
+            rec = json.loads(line)
+            baseline[(rec["shape"], rec["n_tasks"], rec["backend"])] = rec["times"]
+    regressions = 0
+    for rec in records:
+        old = baseline.get((rec["shape"], rec["n_tasks"], rec["backend"]))
+        if old is None:
+            continue
+        for phase, new in rec["times"].items():
+            before = old.get(phase)
+            if before is not None and new > before * (1 + tolerance) and new - before > NOISE_FLOOR:
+                regressions += 1
+                print(f"REGRESSION {rec['shape']} n={rec['n_tasks']} {rec['backend']} {phase}: "
+                      f"{before * 1000:.1f} ms -> {new * 1000:.1f} ms")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES)
+    parser.add_argument("--shapes", nargs="+", default=list(GENERATORS), choices=list(GENERATORS))
+    parser.add_argument("--backends", nargs="+", default=["cpm", "highs", "cbc"],
+                        choices=sorted(DEFAULT_LIMITS))
+    parser.add_argument("--seed", type=int, default=460)
+    parser.add_argument("--repeat", type=int, default=3, help="report the fastest of N runs")
+    parser.add_argument("--render-limit", type=int, default=20_000)
+    parser.add_argument("--max-tasks", nargs="*", metavar="BACKEND=N", default=[],
+                        help=f"skip larger graphs for a backend (defaults: {DEFAULT_LIMITS})")
+    parser.add_argument("--output", default="benchmark_results.jsonl")
+    parser.add_argument("--baseline", default=None, help="earlier results file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed slowdown vs the baseline (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    limits = dict(DEFAULT_LIMITS)
+    for item in args.max_tasks:
+        name, _, value = item.partition("=")
+        limits[name] = int(value)
+
+    environment = {"python": platform.python_version(), "numpy": np.__version__,
+                   "machine": platform.machine()}
+    records = []
+    warmup = generate("layered", 10, args.seed)
+    render(warmup, get_backend("cpm").schedule(warmup, None, "expected"))  # font cache etc.
+    with open(args.output, "w") as out:
+        for shape in args.shapes:
+            for n in args.sizes:
+                t0 = time.perf_counter()
+                project = generate(shape, n, args.seed)
+                generate_time = time.perf_counter() - t0
+                for backend in args.backends:
+                    if n > limits[backend]:
+                        print(f"{shape:>15} n={n:<7} {backend:<12} skipped (limit {limits[backend]})")
+                        continue
+                    sol, times = run_case(project, backend, args.repeat, args.render_limit)
+                    record = {
+                        "shape": shape, "n_tasks": n, "n_edges": int(len(project.pred_idx)),
+                        "backend": backend, "seed": args.seed, "repeat": args.repeat,
+                        "status": sol["status"], "T_max": sol["T_max"],
+                        "generate": generate_time, "times": times, **environment,
+                    }
+                    records.append(record)
+                    out.write(json.dumps(record) + "\n")
+                    out.flush()
+                    phases = "  ".join(f"{k}={v * 1000:.1f}ms" for k, v in times.items())
+                    print(f"{shape:>15} n={n:<7} {backend:<12} T_max={sol['T_max']:<10.1f} {phases}")
+
+    if args.baseline:
+        regressions = compare(records, args.baseline, args.tolerance)
+        print(f"{regressions} regression(s) vs {args.baseline}")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,5 @@
-import pulp
-import matplotlib.pyplot as plt
+from scheduling.cpm import unpack_inputs
+from scheduling.dispatch import schedule
 
 
 TASKS = [
@@ -31,25 +31,29 @@ DURATIONS_WORST = {
     "E":18,"F":12,"G":12,"H":12
 }
 
-def solve_schedule(tasks, predecessors, durations, label):
-    model = pulp.LpProblem(f"LP_{label}", pulp.LpMinimize)
-    S = {t: pulp.LpVariable(f"S_{t}", lowBound=0) for t in tasks}
-    C = {t: pulp.LpVariable(f"C_{t}", lowBound=0) for t in tasks}
-    T_max = pulp.LpVariable("T_max", lowBound=0)
-    model += T_max, "MinimizeProjectFinish"
-    for t in tasks:
-        model += (C[t] == S[t] + durations[t]), f"Duration_{t}"
-        model += (C[t] <= T_max),               f"Bound_{t}"
-        for p in predecessors.get(t, []):
-            model += (S[t] >= C[p]),           f"Pred_{p}_to_{t}"
-    solver = pulp.PULP_CBC_CMD(msg=False)
-    model.solve(solver)
-    status = pulp.LpStatus[model.status]
-    finish_time = pulp.value(model.objective)
-    starts = {t: pulp.value(S[t]) for t in tasks}
-    ends   = {t: pulp.value(C[t]) for t in tasks}
+def solve_schedule(tasks, predecessors, durations, label, method="auto",
+                   demands=None, capacities=None, cache=None, verbose=True):
+    # Without resource limits "auto" takes the CPM fast path; "cbc", "highs"
+    # or "lp" (HiGHS if available, else CBC) solve the LP with that backend.
+    # Passing role `capacities` switches to the resource-constrained solvers
+    # ("auto", "milp", "sgs", "parallel-sgs"). Pass a SolutionCache to reuse
+    # solutions for unchanged inputs; verbose=False skips the printout.
+    sol = schedule(tasks, predecessors, durations, method, demands, capacities,
+                   cache=cache, label=label)
+    status, finish_time = sol["status"], sol["T_max"]
+    starts, ends = sol["start_times"], sol["completion_times"]
+    if not verbose:
+        return starts, ends, finish_time
+
+    tasks, predecessors, durations = unpack_inputs(tasks, predecessors, durations)
     print(f"----- {label} SCENARIO -----")
-    print(f"Status: {status}, Finish Time = {finish_time:.2f}\n")
+    print(f"Status: {status}, Finish Time = {finish_time:.2f}")
+    if sol.get("cached"):
+        print("Reused cached solution")
+    elif "backend" in sol:
+        print(f"Backend: {sol['backend']}, Build = {sol['build_time'] * 1000:.2f} ms, "
+              f"Solve = {sol['solve_time'] * 1000:.2f} ms")
+    print()
     for t in sorted(tasks):
         print(f" Task {t}: Start={starts[t]:.1f}, End={ends[t]:.1f}, Duration={durations[t]}")
     print()
@@ -57,23 +61,19 @@ def solve_schedule(tasks, predecessors, durations, label):
     return starts, ends, finish_time
 
 def plot_gantt(tasks, starts, ends, title="Gantt Chart"):
+    # One bar collection for all tasks; labels only where they fit (see
+    # scheduling.plotting). The figure is closed once the window is.
+    # matplotlib is imported here so solving alone does not pay for it.
+    import matplotlib.pyplot as plt
+
+    from scheduling.plotting import GanttChart
+
     fig, ax = plt.subplots(figsize=(8, 5))
-    ordered_tasks = list(reversed(sorted(tasks)))
-    
-    for i, t in enumerate(ordered_tasks):
-        s = starts[t]
-        e = ends[t]
-        dur = e - s
-        ax.barh(i, dur, left=s, color="skyblue", edgecolor="black", height=0.4)
-        ax.text(s + dur/2, i, f"{t} ({dur:.1f}h)", va="center", ha="center")
-    
-    ax.set_yticks(range(len(ordered_tasks)))
-    ax.set_yticklabels(ordered_tasks)
-    ax.set_xlabel("Time (hours)")
     ax.set_ylabel("Tasks")
-    ax.set_title(title)
-    plt.tight_layout()
+    chart = GanttChart(ax=ax)
+    chart.update(sorted(tasks), starts, ends, title=title)
     plt.show()
+    plt.close(fig)
 
 if __name__ == "__main__":
     best_starts, best_ends, best_finish = solve_schedule(TASKS, PREDECESSORS, DURATIONS_BEST, "BestCase")
@@ -0,0 +1,10 @@
+"""Shared scheduling helpers used by verbose.py, gantt.py and the DesktopApp.
+
+Importing the package only loads the pure-Python CPM code; PuLP, HiGHS and
+matplotlib are imported by the modules that need them. Command line use:
+`python -m scheduling {solve,simulate,gantt,crash,batch} ...` (see scheduling.cli).
+"""
+
+from .cpm import sensitivity_report, solve_cpm, topological_order
+
+__all__ = ["sensitivity_report", "solve_cpm", "topological_order"]
@@ -0,0 +1,208 @@
+"""Pluggable solver backends for the precedence scheduling model.
+
+Every backend splits a solve into two steps so callers can reuse the
+structure across scenarios and see where the time goes:
+
+* build(tasks, predecessors) compiles the task graph once (no durations);
+* solve(model, durations) fills in the durations (the right-hand side only)
+  and returns the usual result dict plus "backend" and "solve_time".
+
+schedule() does both and also reports "build_time". Every result also has
+"metrics" (scheduling.metrics): per-phase times (build, update, solver,
+extract) and model size counters. Available backends:
+
+* "cpm":   in-process critical path passes (exact without resource limits);
+* "highs": in-process HiGHS through scipy.optimize.linprog on a CSR model
+  assembled with NumPy (scheduling.sparse), no subprocess and no temp files;
+* "cbc":   the original PuLP model solved by the CBC command-line binary,
+  which writes the model to a temp file and forks CBC on every solve.
+
+Heavy dependencies (pulp, scipy) are imported on first use. A Project can be
+passed as `tasks`, with durations given as a scenario name.
+"""
+
+from .cpm import solve_cpm, topological_order, unpack_inputs
+from .metrics import SolveMetrics
+
+
+class Backend:
+    name = None
+
+    def build(self, tasks, predecessors):
+        raise NotImplementedError
+
+    def solve(self, model, durations, metrics=None):
+        raise NotImplementedError
+
+    def schedule(self, tasks, predecessors, durations):
+        if hasattr(tasks, "duration_map"):
+            durations = tasks.duration_map(durations)  # scenario name/array -> mapping
+        metrics = SolveMetrics(backend=self.name)
+        with metrics.phase("build"):
+            model = self.build(tasks, predecessors)
+        result = self.solve(model, durations, metrics)
+        result["build_time"] = metrics.phases["build"]
+        return result
+
+    def _finish(self, result, metrics):
+        result["backend"] = self.name
+        result["solve_time"] = sum(v for k, v in metrics.phases.items() if k != "build")
+        result["metrics"] = metrics.as_dict()
+        return result
+
+
+class CpmBackend(Backend):
+    name = "cpm"
+
+    def build(self, tasks, predecessors):
+        if hasattr(tasks, "solve_cpm"):
+            return tasks, None, None  # a Project carries its own order
+        tasks = list(tasks)
+        return tasks, predecessors, topological_order(tasks, predecessors)
+
+    def solve(self, model, durations, metrics=None):
+        tasks, predecessors, order = model
+        metrics = metrics or SolveMetrics(backend=self.name)
+        metrics.count(tasks=len(tasks))
+        with metrics.phase("solver"):
+            result = solve_cpm(tasks, predecessors, durations, order)
+        return self._finish(result, metrics)
+
+
+class CbcBackend(Backend):
+    """PuLP model + PULP_CBC_CMD. Only the CompletionDef constants change per solve.
+
+    warm_start passes the previous values as a CBC MIP start; it is off by
+    default since the precedence model is a pure LP, where a MIP start does
+    not help and only adds a file write per solve.
+    """
+
+    name = "cbc"
+
+    def __init__(self, warm_start=False, msg=False):
+        self.warm_start = warm_start
+        self.msg = msg
+
+    def build(self, tasks, predecessors):
+        import pulp
+
+        tasks, predecessors, _ = unpack_inputs(tasks, predecessors)
+        tasks = list(tasks)
+        known = set(tasks)
+        problem = pulp.LpProblem("ProjectPlan", pulp.LpMinimize)
+        S = {t: pulp.LpVariable(f"S_{t}", lowBound=0) for t in tasks}
+        C = {t: pulp.LpVariable(f"C_{t}", lowBound=0) for t in tasks}
+        T_max = pulp.LpVariable("T_max", lowBound=0)
+        problem += T_max, "MinimizeProjectFinish"
+        duration_cons = {}
+        for t in tasks:
+            # Durations start at 0; solve() only overwrites the constant
+            problem += (C[t] == S[t]), f"Duration_{t}"
+            duration_cons[t] = problem.constraints[f"Duration_{t}"]
+            problem += (C[t] <= T_max), f"Bound_{t}"
+            for p in predecessors.get(t, []):
+                if p in known:
+                    problem += (S[t] >= C[p]), f"Pred_{p}_to_{t}"
+        return tasks, problem, S, C, duration_cons
+
+    def solve(self, model, durations, metrics=None):
+        import pulp
+
+        tasks, problem, S, C, duration_cons = model
+        metrics = metrics or SolveMetrics(backend=self.name)
+        metrics.count(variables=problem.numVariables(), constraints=problem.numConstraints())
+        with metrics.phase("update"):
+            for t in tasks:
+                duration_cons[t].constant = -float(durations[t])  # C - S - d == 0
+        with metrics.phase("solver"):
+            problem.solve(pulp.PULP_CBC_CMD(msg=self.msg, warmStart=self.warm_start))
+        with metrics.phase("extract"):
+            result = {
+                "status": pulp.LpStatus[problem.status],
+                "T_max": pulp.value(problem.objective),
+                "start_times": {t: S[t].varValue for t in tasks},
+                "completion_times": {t: C[t].varValue for t in tasks},
+            }
+        return self._finish(result, metrics)
+
+    def milp_solver(self, time_limit=None):
+        import pulp
+
+        return pulp.PULP_CBC_CMD(msg=self.msg, timeLimit=time_limit)
+
+
+class HighsBackend(Backend):
+    """In-process HiGHS LP over the CSR model from scheduling.sparse."""
+
+    name = "highs"
+
+    def build(self, tasks, predecessors):
+        from .sparse import adjacency_arrays, precedence_matrix
+
+        _, pred_ptr, pred_idx = adjacency_arrays(tasks, predecessors)
+        tasks = list(tasks)
+        A, rhs_task = precedence_matrix(len(tasks), pred_ptr, pred_idx)
+        return tasks, A, rhs_task
+
+    def solve(self, model, durations, metrics=None):
+        import numpy as np
+
+        from .sparse import solve_precedence_lp
+
+        tasks, A, rhs_task = model
+        metrics = metrics or SolveMetrics(backend=self.name)
+        metrics.count(variables=A.shape[1], constraints=A.shape[0], nonzeros=int(A.nnz))
+        with metrics.phase("update"):
+            d = np.array([durations[t] for t in tasks], dtype=float)
+        with metrics.phase("solver"):
+            status, t_max, starts, ends = solve_precedence_lp(A, rhs_task, d)
+        with metrics.phase("extract"):
+            if starts is None:
+                starts = ends = [None] * len(tasks)
+            else:
+                starts, ends = starts.tolist(), ends.tolist()
+            result = {
+                "status": status,
+                "T_max": t_max,
+                "start_times": dict(zip(tasks, starts)),
+                "completion_times": dict(zip(tasks, ends)),
+            }
+        return self._finish(result, metrics)
+
+    def milp_solver(self, time_limit=None):
+        import pulp
+
+        return pulp.HiGHS(msg=False, timeLimit=time_limit)
+
+
+BACKENDS = {"cpm": CpmBackend, "cbc": CbcBackend, "highs": HighsBackend}
+
+
+def highs_available():
+    try:
+        import scipy.optimize  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def get_backend(name="auto"):
+    """Backend instance by name. "auto" is CPM; "lp" is HiGHS if scipy is
+    installed and CBC otherwise."""
+    if name == "auto":
+        name = "cpm"
+    elif name == "lp":
+        name = "highs" if highs_available() else "cbc"
+    try:
+        return BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown backend: {name} (expected one of {sorted(BACKENDS)})") from None
+
+
+def default_milp_solver(time_limit=None):
+    """PuLP solver for MILPs: in-process HiGHS (needs highspy) or CBC."""
+    import pulp
+
+    if pulp.HiGHS().available():
+        return HighsBackend().milp_solver(time_limit)
+    return CbcBackend().milp_solver(time_limit)
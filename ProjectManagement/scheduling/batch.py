@@ -0,0 +1,150 @@
+"""Headless batch runner: solve every (project file x scenario) on a process pool.
+
+Each *.json file in the input directory is a tasks.json-style project
+({"tasks": [...], "predecessors": {...}}). Results are written as they finish,
+one JSON line per solve (with start/completion times) and optionally one CSV
+row per solve (summary only). Gantt charts are rendered on the workers with
+the Agg backend, so no display is needed.
+
+Example:
+    python -m scheduling batch projects/ --output results.jsonl --csv results.csv \\
+        --gantt-dir charts --format svg --workers 8
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+
+from .dispatch import check_method, schedule
+from .project import SCENARIOS, Project
+from .resources import ROLES
+
+CSV_FIELDS = ["project", "file", "scenario", "method", "status", "T_max",
+              "n_tasks", "backend", "solve_time", "elapsed", "cached", "gantt", "error"]
+
+_cache = None
+
+
+def _init_worker(cache_dir):
+    global _cache
+    import matplotlib
+    matplotlib.use("Agg")
+    if cache_dir:
+        from .cache import SolutionCache
+        _cache = SolutionCache(path=cache_dir)
+
+
+@lru_cache(maxsize=4)
+def _load(path, mtime):
+    return Project.load(path)
+
+
+def solve_one(path, scenario, method="auto", capacities=None, gantt_dir=None, fmt="png"):
+    """Worker: load, solve and (optionally) draw one project scenario."""
+    name = os.path.splitext(os.path.basename(path))[0]
+    record = {"project": name, "file": path, "scenario": scenario, "method": method}
+    t0 = time.perf_counter()
+    try:
+        project = _load(path, os.path.getmtime(path))
+        sol = schedule(project, None, scenario, method, capacities=capacities, cache=_cache, label=scenario)
+
+        record.update({
+            "status": sol["status"],
+            "T_max": sol["T_max"],
+            "n_tasks": len(project),
+            "backend": sol.get("backend", method),
+            "solve_time": sol.get("solve_time"),
+            "cached": sol.get("cached", False),
+            "start_times": sol["start_times"],
+            "completion_times": sol["completion_times"],
+        })
+        if gantt_dir:
+            record["gantt"] = render_gantt(project, sol, name, scenario, gantt_dir, fmt)
+    except Exception as err:  # one bad file should not stop the batch
+        record["error"] = f"{type(err).__name__}: {err}"
+    record["elapsed"] = time.perf_counter() - t0
+    return record
+
+
+def render_gantt(project, sol, name, scenario, gantt_dir, fmt):
+    from .plotting import GanttChart
+
+    chart = GanttChart(figsize=(12, max(4, min(len(project) * 0.25, 40))))
+    chart.update(sorted(project.ids), sol["start_times"], sol["completion_times"],
+                 title=f"{name} - {scenario.capitalize()} Scenario")
+    out = os.path.join(gantt_dir, f"{name}_{scenario}.{fmt}")
+    chart.figure.savefig(out, format=fmt)
+    return out
+
+
+def parse_capacities(items):
+    capacities = {role: 1 for role in ROLES}
+    for item in items:
+        role, _, count = item.partition("=")
+        if role not in capacities or not count.isdigit():
+            raise argparse.ArgumentTypeError(f"Bad capacity '{item}' (expected ROLE=N, ROLE in {ROLES})")
+        capacities[role] = int(count)
+    return capacities
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description=__doc__.splitlines()[0])
+    parser.add_argument("input_dir", help="directory of tasks.json-style project files")
+    parser.add_argument("--scenarios", nargs="+", default=list(SCENARIOS), choices=SCENARIOS)
+    parser.add_argument("--method", default="auto",
+                        help="auto, cpm, lp, cbc, highs; with --staff: auto, milp, sgs, parallel-sgs")
+    parser.add_argument("--staff", nargs="*", metavar="ROLE=N",
+                        help="limit staff per role (unlisted roles get 1); enables resource-constrained solves")
+    parser.add_argument("--workers", type=int, default=None, help="process count (default: CPU count)")
+    parser.add_argument("--output", default="results.jsonl", help="JSONL output path")
+    parser.add_argument("--csv", default=None, help="optional CSV summary path")
+    parser.add_argument("--gantt-dir", default=None, help="write one Gantt chart per solve here")
+    parser.add_argument("--format", default="png", choices=("png", "svg"))
+    parser.add_argument("--cache-dir", default=None, help="on-disk solution cache shared by the workers")
+    args = parser.parse_args(argv)
+
+    paths = sorted(glob.glob(os.path.join(args.input_dir, "*.json")))
+    if not paths:
+        parser.error(f"no .json files in {args.input_dir}")
+    capacities = parse_capacities(args.staff) if args.staff is not None else None
+    try:
+        check_method(args.method, capacities)
+    except ValueError as exc:
+        parser.error(str(exc))
+    if args.gantt_dir:
+        os.makedirs(args.gantt_dir, exist_ok=True)
+
+    t0 = time.perf_counter()
+    failures = 0
+    csv_file = open(args.csv, "w", newline="") if args.csv else None
+    try:
+        writer = csv.DictWriter(csv_file, CSV_FIELDS, extrasaction="ignore") if csv_file else None
+        if writer:
+            writer.writeheader()
+        with open(args.output, "w") as out, ProcessPoolExecutor(
+                args.workers, initializer=_init_worker, initargs=(args.cache_dir,)) as pool:
+            futures = [
+                pool.submit(solve_one, path, scenario, args.method, capacities, args.gantt_dir, args.format)
+                for path in paths for scenario in args.scenarios
+            ]
+            for done, future in enumerate(as_completed(futures), 1):
+                record = future.result()
+                failures += "error" in record
+                out.write(json.dumps(record) + "\n")
+                if writer:
+                    writer.writerow(record)
+                status = record.get("error") or f"{record['status']}, T_max={record['T_max']:.2f}"
+                print(f"[{done}/{len(futures)}] {record['project']} {record['scenario']}: {status}")
+    finally:
+        if csv_file:
+            csv_file.close()
+
+    elapsed = time.perf_counter() - t0
+    print(f"{len(futures)} solves ({len(paths)} projects) in {elapsed:.2f} s, {failures} failed")
+    return 1 if failures else 0
+
@@ -0,0 +1,152 @@
+"""Content-addressed cache for schedule solutions.
+
+solution_key() hashes a canonical form of the inputs (tasks, predecessors,
+durations, scenario label and solver options), so the same plan gets the
+same key no matter how the dicts were ordered or whether hours were given as
+ints or floats. SolutionCache keeps recent solutions in an in-memory LRU and,
+when given a directory, also as one JSON file per key on disk. The disk tier
+is trimmed to `max_bytes` by dropping the least recently used files.
+
+Cached solutions are shared: treat them as read-only.
+"""
+
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+from .cpm import unpack_inputs
+
+
+def solution_key(tasks, predecessors, durations, scenario=None, options=None):
+    """SHA-256 hex digest of the solve inputs.
+
+    Unknown predecessors are dropped (as in the solvers) and predecessor
+    lists are sorted, since neither changes the schedule. A Project can be
+    passed as `tasks`, with `durations` as a scenario name.
+    """
+    tasks, predecessors, durations = unpack_inputs(tasks, predecessors, durations)
+    known = set(tasks)
+    canonical = {
+        "tasks": [
+            [t, float(durations[t]), sorted(p for p in predecessors.get(t, []) if p in known)]
+            for t in sorted(tasks)
+        ],
+        "scenario": scenario,
+        "options": options or {},
+    }
+    blob = json.dumps(canonical, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class SolutionCache:
+    """Two-tier (memory LRU + optional disk) cache of solution dicts."""
+
+    def __init__(self, max_entries=128, path=None, max_bytes=64 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.path = path
+        self.max_bytes = max_bytes
+        self._memory = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+
+    def _file(self, key):
+        return os.path.join(self.path, key + ".json")
+
+    def get(self, key):
+        """Return the cached solution for `key`, or None."""
+        solution = self._memory.get(key)
+        if solution is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return solution
+        if self.path is not None:
+            try:
+                with open(self._file(key), "r") as f:
+                    solution = json.load(f)
+            except (OSError, ValueError):
+                solution = None
+            if solution is not None:
+                try:
+                    os.utime(self._file(key))  # mark as recently used
+                except OSError:
+                    pass  # evicted meanwhile by another process
+                self._remember(key, solution)
+                self.hits += 1
+                self.disk_hits += 1
+                return solution
+        self.misses += 1
+        return None
+
+    def put(self, key, solution):
+        """Store a solution (a JSON-serialisable result dict)."""
+        self._remember(key, solution)
+        if self.path is None:
+            return
+        tmp = f"{self._file(key)}.{os.getpid()}.tmp"  # unique per process sharing the directory
+        with open(tmp, "w") as f:
+            json.dump(solution, f)
+        os.replace(tmp, self._file(key))
+        self._trim_disk()
+
+    def _remember(self, key, solution):
+        self._memory[key] = solution
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _trim_disk(self):
+        entries = []
+        total = 0
+        with os.scandir(self.path) as it:
+            for entry in it:
+                if entry.name.endswith(".json"):
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+                    total += st.st_size
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+    def get_or_solve(self, key, solve):
+        """Cached solution for `key`, else call solve() and cache its result.
+
+        The returned dict carries "cached": True/False.
+        """
+        solution = self.get(key)
+        if solution is not None:
+            return dict(solution, cached=True)
+        solution = solve()
+        self.put(key, solution)
+        return dict(solution, cached=False)
+
+    def clear(self):
+        """Drop every entry (both tiers); counters are kept."""
+        self._memory.clear()
+        if self.path is not None:
+            with os.scandir(self.path) as it:
+                for entry in it:
+                    if entry.name.endswith(".json"):
+                        os.remove(entry.path)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "memory_entries": len(self._memory),
+        }
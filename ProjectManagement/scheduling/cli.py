@@ -0,0 +1,239 @@
+"""Command line interface: python -m scheduling <command> ...
+
+Commands:
+    solve     schedule one tasks.json file for one or all scenarios
+    simulate  Monte Carlo PERT simulation of a tasks.json file
+    gantt     draw a Gantt chart (to a PNG/SVG file, or a window)
+    crash     time-cost curve for shortening the project (see scheduling.crashing)
+    batch     solve a directory of files on a process pool (see scheduling.batch)
+
+Each command imports only what it needs, so e.g. `solve` never loads
+matplotlib and `simulate` never loads PuLP. The repo has no packaging, so
+this module (via `python -m scheduling`) is the entry point; a
+console_scripts entry would point at scheduling.cli:main.
+"""
+
+import argparse
+import sys
+
+SCENARIO_CHOICES = ("best", "expected", "worst", "all")
+
+
+def _scenarios(choice):
+    return ["best", "expected", "worst"] if choice == "all" else [choice]
+
+
+def _solve(project, scenario, method, capacities):
+    from .dispatch import schedule
+
+    return schedule(project, None, scenario, method, capacities=capacities)
+
+
+def cmd_solve(args):
+    from .cpm import sensitivity_report
+    from .metrics import SolveMetrics, log_metrics, profiled
+    from .project import Project
+
+    project = Project.load(args.file)
+    capacities = _capacities(args)
+    for scenario in _scenarios(args.scenario):
+        metrics = SolveMetrics(scenario=scenario, method=args.method, file=args.file)
+        with profiled(metrics, cpu="cpu" in args.profile, memory="memory" in args.profile):
+            with metrics.phase("solve"):
+                sol = _solve(project, scenario, args.method, capacities)
+            metrics.add(sol.get("metrics", {}), prefix="solve.")
+            report = None
+            if capacities is None:
+                with metrics.phase("sensitivity"):
+                    report = sensitivity_report(project, None, scenario,
+                                                sol if "latest_start_times" in sol else None)
+
+        print(f"Scenario: {scenario}  Status: {sol['status']}  T_max = {sol['T_max']:.2f} hours")
+        phases = "  ".join(f"{name}={sec * 1000:.2f} ms" for name, sec in metrics.phases.items())
+        print(f"  {phases}")
+        if args.tasks:
+            for tid in sorted(sol["start_times"]):
+                line = f"  Task {tid}: Start={sol['start_times'][tid]:.2f}, End={sol['completion_times'][tid]:.2f}"
+                if report is not None:
+                    line += f", TotalFloat={report[tid]['total_float']:.2f}"
+                print(line)
+        if report is not None:
+            critical = sum(1 for row in report.values() if row["critical"])
+            print(f"  Critical tasks: {critical} of {len(report)}")
+        if metrics.profile:
+            print(metrics.profile)
+        if args.metrics_log:
+            log_metrics(args.metrics_log, metrics)
+    return 0
+
+
+def cmd_simulate(args):
+    from .montecarlo import simulate_pert
+    from .project import Project
+
+    project = Project.load(args.file)
+    sim = simulate_pert(project, None, n_samples=args.samples, distribution=args.distribution,
+                        deadline=args.deadline, seed=args.seed)
+    print(f"{sim['distribution']} simulation, {sim['n_samples']} samples: "
+          f"mean {sim['mean']:.2f} h, std {sim['std']:.2f} h")
+    for p, value in sim["percentiles"].items():
+        print(f"  P{p}: {value:.2f}")
+    if sim["p_on_time"] is not None:
+        print(f"  P(finish <= {sim['deadline']:.2f}) = {sim['p_on_time']:.3f}")
+    top = sorted(sim["criticality"].items(), key=lambda kv: -kv[1])[:args.top]
+    print("Most often critical:")
+    for tid, share in top:
+        print(f"  Task {tid}: {share:.3f}")
+    return 0
+
+
+def cmd_gantt(args):
+    import matplotlib
+
+    if args.output:
+        matplotlib.use("Agg")
+    from .plotting import GanttChart
+    from .project import Project
+
+    project = Project.load(args.file)
+    sol = _solve(project, args.scenario, args.method, _capacities(args))
+    title = f"Gantt Chart - {args.scenario.capitalize()} Scenario"
+    if args.output:
+        chart = GanttChart(figsize=(12, max(4, min(len(project) * 0.25, 40))))
+        chart.update(sorted(project.ids), sol["start_times"], sol["completion_times"], title=title)
+        chart.figure.savefig(args.output)
+        print(f"Wrote {args.output}")
+    else:
+        import matplotlib.pyplot as plt
+
+        fig, ax = plt.subplots(figsize=(12, 5))
+        GanttChart(ax=ax).update(sorted(project.ids), sol["start_times"], sol["completion_times"],
+                                 title=title)
+        plt.show()
+        plt.close(fig)
+    return 0
+
+
+def cmd_crash(args):
+    from .crashing import crash_costs, crash_curve, crash_schedule
+    from .project import Project
+
+    project = Project.load(args.file)
+    costs = crash_costs(project, args.scenario, _rates(args.rate or []))
+    curve = crash_curve(project, None, args.scenario, args.min_scenario, costs)
+    print(f"Crashing {args.scenario} -> {args.min_scenario} durations: {len(curve)} breakpoints")
+    for k, point in enumerate(curve):
+        slope = f"  (+{point['slope']:.2f} per hour saved)" if k else ""
+        print(f"  T_max = {point['T_max']:.2f} hours  cost = {point['cost']:.2f}{slope}")
+        if args.tasks:
+            _print_crashed(point, project.duration_map(args.scenario))
+    for deadline in args.deadline or []:
+        try:
+            plan = crash_schedule(project, None, curve, deadline)
+        except ValueError as exc:
+            print(f"Deadline {deadline:.2f}: {exc}")
+            continue
+        print(f"Deadline {deadline:.2f}: cost {plan['cost']:.2f}, T_max = {plan['T_max']:.2f} hours")
+        _print_crashed(plan, project.duration_map(args.scenario))
+    return 0
+
+
+def _print_crashed(point, normal):
+    for tid in sorted(point["durations"]):
+        d = point["durations"][tid]
+        crashed = f" (crashed {normal[tid] - d:.2f})" if d < normal[tid] - 1e-9 else ""
+        print(f"    Task {tid}: Start={point['start_times'][tid]:.2f}, "
+              f"End={point['completion_times'][tid]:.2f}{crashed}")
+
+
+def _rates(items):
+    from .resources import ROLES
+
+    rates = {}
+    for item in items:
+        role, _, rate = item.partition("=")
+        try:
+            value = float(rate)
+        except ValueError:
+            value = None
+        if role not in ROLES or value is None:
+            raise argparse.ArgumentTypeError(f"Bad rate '{item}' (expected ROLE=COST, ROLE in {ROLES})")
+        rates[role] = value
+    return rates
+
+
+def _capacities(args):
+    """Staff capacities from --staff (None without it), after checking --method fits."""
+    from .batch import parse_capacities
+    from .dispatch import check_method
+
+    capacities = None if args.staff is None else parse_capacities(args.staff)
+    try:
+        check_method(args.method, capacities)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc))
+    return capacities
+
+
+def _add_solver_options(parser):
+    parser.add_argument("--method", default="auto",
+                        help="auto, cpm, lp, cbc, highs; with --staff: auto, milp, sgs, parallel-sgs")
+    parser.add_argument("--staff", nargs="*", metavar="ROLE=N",
+                        help="limit staff per role (unlisted roles get 1)")
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] == "batch":
+        from .batch import main as batch_main
+
+        return batch_main(argv[1:], prog="python -m scheduling batch")
+
+    parser = argparse.ArgumentParser(prog="python -m scheduling", description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("solve", help="schedule one tasks.json file")
+    p.add_argument("file")
+    p.add_argument("--scenario", default="all", choices=SCENARIO_CHOICES)
+    _add_solver_options(p)
+    p.add_argument("--tasks", action="store_true", help="print one line per task")
+    p.add_argument("--metrics-log", default=None, help="append phase metrics as JSON lines")
+    p.add_argument("--profile", nargs="*", default=[], choices=("cpu", "memory"),
+                   help="profile with cProfile (cpu) and/or tracemalloc (memory)")
+    p.set_defaults(func=cmd_solve)
+
+    p = sub.add_parser("simulate", help="Monte Carlo PERT simulation")
+    p.add_argument("file")
+    p.add_argument("--samples", type=int, default=100_000)
+    p.add_argument("--distribution", default="pert", choices=("pert", "triangular"))
+    p.add_argument("--deadline", type=float, default=None)
+    p.add_argument("--seed", type=int, default=None)
+    p.add_argument("--top", type=int, default=10, help="show the N most often critical tasks")
+    p.set_defaults(func=cmd_simulate)
+
+    p = sub.add_parser("gantt", help="draw a Gantt chart")
+    p.add_argument("file")
+    p.add_argument("--scenario", default="expected", choices=SCENARIO_CHOICES[:3])
+    _add_solver_options(p)
+    p.add_argument("--output", default=None, help="PNG/SVG path (default: open a window)")
+    p.set_defaults(func=cmd_gantt)
+
+    p = sub.add_parser("crash", help="time-cost curve for crashing the project")
+    p.add_argument("file")
+    p.add_argument("--scenario", default="expected", choices=SCENARIO_CHOICES[:3],
+                   help="normal (uncrashed) durations")
+    p.add_argument("--min-scenario", default="best", choices=SCENARIO_CHOICES[:3],
+                   help="fully crashed durations")
+    p.add_argument("--rate", nargs="*", metavar="ROLE=COST",
+                   help="cost per staff hour of a role (unlisted roles cost 1)")
+    p.add_argument("--deadline", type=float, nargs="*", help="print the cheapest plan for these deadlines")
+    p.add_argument("--tasks", action="store_true", help="print the schedule at every breakpoint")
+    p.set_defaults(func=cmd_crash)
+
+    sub.add_parser("batch", help="solve a directory of files (see: batch --help)")
+
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args)
+    except argparse.ArgumentTypeError as exc:  # bad --method, --staff or --rate entry
+        parser.error(str(exc))
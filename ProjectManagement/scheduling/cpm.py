@@ -0,0 +1,210 @@
+"""Critical path method (CPM) engine.
+
+With unlimited resources, minimizing T_max over a precedence DAG is a
+longest-path problem, so one forward pass (earliest times) and one backward
+pass (latest times) in topological order give the same answer as the LP
+in O(V + E), without building a PuLP model or starting CBC.
+"""
+
+import heapq
+from collections import deque
+
+
+def unpack_inputs(tasks, predecessors=None, durations=None):
+    """Let a Project (see scheduling.project) stand in for the task list.
+
+    Anything with a solver_inputs() method is expanded into (task IDs,
+    predecessor mapping, duration mapping); plain inputs pass through.
+    """
+    solver_inputs = getattr(tasks, "solver_inputs", None)
+    if solver_inputs is not None:
+        return solver_inputs(durations)
+    return tasks, predecessors, durations
+
+
+def topological_order(tasks, predecessors):
+    """Return tasks in topological order (Kahn's algorithm).
+
+    Predecessors that are not in `tasks` are ignored, mirroring how the
+    DesktopApp only constrains known tasks. Raises ValueError on a cycle.
+    """
+    known = set(tasks)
+    indegree = {t: 0 for t in tasks}
+    successors = {t: [] for t in tasks}
+    for t in tasks:
+        for p in predecessors.get(t, []):
+            if p in known:
+                indegree[t] += 1
+                successors[p].append(t)
+
+    queue = deque(t for t in tasks if indegree[t] == 0)
+    order = []
+    while queue:
+        t = queue.popleft()
+        order.append(t)
+        for s in successors[t]:
+            indegree[s] -= 1
+            if indegree[s] == 0:
+                queue.append(s)
+
+    if len(order) != len(indegree):
+        stuck = sorted(t for t, n in indegree.items() if n > 0)
+        raise ValueError(f"Precedence graph has a cycle through: {stuck}")
+    return order
+
+
+def cpm_passes(order, preds, durations):
+    """Forward/backward passes over integer task indices.
+
+    `preds[i]` lists the predecessor indices of task i, `order` is a
+    topological order of the indices and `durations` a list. Returns lists
+    (earliest start, earliest finish, latest start) and T_max.
+    """
+    n = len(durations)
+    es = [0.0] * n
+    ef = [0.0] * n
+    for i in order:
+        s = 0.0
+        for p in preds[i]:
+            if ef[p] > s:
+                s = ef[p]
+        es[i] = s
+        ef[i] = s + durations[i]
+    t_max = max(ef, default=0.0)
+    lf = [t_max] * n
+    ls = [0.0] * n
+    for i in reversed(order):
+        ls[i] = lf[i] - durations[i]
+        for p in preds[i]:
+            if ls[i] < lf[p]:
+                lf[p] = ls[i]
+    return es, ef, ls, t_max
+
+
+def solve_cpm(tasks, predecessors, durations, order=None):
+    """Earliest/latest schedule for a precedence-only project.
+
+    Returns the same keys as verbose.solve_scenario ("status", "T_max",
+    "start_times", "completion_times") plus the backward-pass
+    "latest_start_times" and "latest_completion_times". Pass a precomputed
+    topological `order` to skip recomputing it across scenarios.
+
+    A Project may be passed as `tasks` (with `durations` a scenario name,
+    array or dict); it runs the same passes over its integer CSR arrays.
+    """
+    if hasattr(tasks, "solve_cpm"):
+        return tasks.solve_cpm(durations)
+    if order is None:
+        order = topological_order(tasks, predecessors)
+    known = set(tasks)
+    preds = {t: [p for p in predecessors.get(t, []) if p in known] for t in tasks}
+
+    # Forward pass: earliest start = max completion of predecessors
+    start = {}
+    finish = {}
+    for t in order:
+        s = 0.0
+        for p in preds[t]:
+            if finish[p] > s:
+                s = finish[p]
+        start[t] = s
+        finish[t] = s + durations[t]
+
+    t_max = max(finish.values(), default=0.0)
+
+    # Backward pass: latest finish = min latest start of successors
+    latest_finish = {t: t_max for t in tasks}
+    latest_start = {}
+    for t in reversed(order):
+        latest_start[t] = latest_finish[t] - durations[t]
+        for p in preds[t]:
+            if latest_start[t] < latest_finish[p]:
+                latest_finish[p] = latest_start[t]
+
+    return {
+        "status": "Optimal",
+        "T_max": t_max,
+        "start_times": start,
+        "completion_times": finish,
+        "latest_start_times": latest_start,
+        "latest_completion_times": latest_finish,
+    }
+
+
+def sensitivity_report(tasks, predecessors, durations, solution=None, tol=1e-9):
+    """Per-task float and duration ranges from one CPM forward/backward pass.
+
+    For each task returns earliest/latest start and finish, total float,
+    free float, critical-path membership and the duration range
+    [min_duration, max_duration] over which changing only that task leaves
+    T_max unchanged. `solution` may be a solve_cpm result for the same
+    inputs to skip recomputing it.
+
+    Raising a duration is absorbed up to its total float. Lowering a task
+    leaves T_max alone unless every longest path runs through it; the
+    longest path avoiding each task is found with one sweep over the edges
+    that jump over it in topological order.
+    """
+    if solution is None:
+        solution = solve_cpm(tasks, predecessors, durations)
+    tasks, predecessors, durations = unpack_inputs(tasks, predecessors, durations)
+    t_max = solution["T_max"]
+    es = solution["start_times"]
+    ef = solution["completion_times"]
+    ls = solution["latest_start_times"]
+    lf = solution["latest_completion_times"]
+
+    order = topological_order(tasks, predecessors)
+    pos = {t: i for i, t in enumerate(order)}
+    known = set(tasks)
+    successors = {t: [] for t in tasks}
+    edges = []
+    for t in tasks:
+        for p in predecessors.get(t, []):
+            if p in known:
+                successors[p].append(t)
+                edges.append((pos[p], pos[t], ef[p] + (t_max - ls[t])))
+
+    # Longest path avoiding order[i]: it lies wholly before i, wholly after i,
+    # or crosses i through an edge (u, w) with pos[u] < i < pos[w].
+    n = len(order)
+    before = [0.0] * n
+    for i in range(1, n):
+        before[i] = max(before[i - 1], ef[order[i - 1]])
+    after = [0.0] * n
+    for i in range(n - 2, -1, -1):
+        after[i] = max(after[i + 1], t_max - ls[order[i + 1]])
+    edges.sort()
+    spanning = []  # max-heap of (-path length, pos[w])
+    k = 0
+    avoid = {}
+    for i, t in enumerate(order):
+        while k < len(edges) and edges[k][0] < i:
+            heapq.heappush(spanning, (-edges[k][2], edges[k][1]))
+            k += 1
+        while spanning and spanning[0][1] <= i:
+            heapq.heappop(spanning)
+        across = -spanning[0][0] if spanning else 0.0
+        avoid[t] = max(before[i], after[i], across)
+
+    report = {}
+    for t in tasks:
+        total_float = ls[t] - es[t]
+        free_float = min((es[s] for s in successors[t]), default=t_max) - ef[t]
+        critical = total_float <= tol
+        d = durations[t]
+        # Any cut to a critical task moves T_max unless another path is as long
+        min_duration = d if critical and avoid[t] < t_max - tol else 0.0
+        report[t] = {
+            "duration": d,
+            "earliest_start": es[t],
+            "earliest_finish": ef[t],
+            "latest_start": ls[t],
+            "latest_finish": lf[t],
+            "total_float": total_float,
+            "free_float": free_float,
+            "critical": critical,
+            "min_duration": min_duration,
+            "max_duration": d + total_float,
+        }
+    return report
@@ -0,0 +1,317 @@
+"""Project time-cost tradeoff ("crashing") curve.
+
+Each task can be shortened from its normal duration down to a minimum
+duration at a constant cost per hour. The least cost of finishing by each
+deadline is a convex piecewise-linear function of the deadline, and
+crash_curve() traces the whole function in one parametric sweep instead of
+solving the LP once per deadline.
+
+Starting from the normal durations, every step finds the cheapest way to
+shorten all critical paths at once: a minimum cut of the critical network,
+found as a maximum flow whose arc bounds encode each task's state (tasks
+on the cut are shortened; already-crashed tasks crossing it backwards are
+lengthened again to get their cost back). The step runs until a task
+reaches a duration limit or another path becomes critical, and the sweep
+stops once some critical path cannot be shortened any further. Cut values
+are the slopes of the curve, so each point where the slope changes is a
+breakpoint.
+
+Costs default to the role-hour columns: shortening a task by an hour costs
+one more hour of the staff it already uses (crash_costs).
+"""
+
+from .cpm import cpm_passes, solve_cpm, topological_order, unpack_inputs
+
+INF = float("inf")
+
+
+class _FlowNetwork:
+    """Dinic max flow with float capacities; arc k's reverse is arc k ^ 1."""
+
+    def __init__(self, n_nodes, eps):
+        self.adj = [[] for _ in range(n_nodes)]
+        self.to = []
+        self.cap = []
+        self.eps = eps
+
+    def add(self, u, v, cap):
+        self.adj[u].append(len(self.to))
+        self.to.append(v)
+        self.cap.append(cap)
+        self.adj[v].append(len(self.to))
+        self.to.append(u)
+        self.cap.append(0.0)
+        return len(self.to) - 2
+
+    def reachable(self, s, infinite_only=False):
+        seen = [False] * len(self.adj)
+        seen[s] = True
+        queue = [s]
+        for u in queue:
+            for k in self.adj[u]:
+                v = self.to[k]
+                if not seen[v] and (self.cap[k] == INF if infinite_only else self.cap[k] > self.eps):
+                    seen[v] = True
+                    queue.append(v)
+        return seen
+
+    def max_flow(self, s, t):
+        total = 0.0
+        while True:
+            level = [-1] * len(self.adj)
+            level[s] = 0
+            queue = [s]
+            for u in queue:
+                for k in self.adj[u]:
+                    v = self.to[k]
+                    if level[v] < 0 and self.cap[k] > self.eps:
+                        level[v] = level[u] + 1
+                        queue.append(v)
+            if level[t] < 0:
+                return total
+            it = [0] * len(self.adj)
+            while True:
+                f = self._augment(s, t, level, it)
+                if f <= self.eps:
+                    break
+                total += f
+
+    def _augment(self, s, t, level, it):
+        """Push flow along one shortest path of the level graph (iterative DFS)."""
+        path = []
+        u = s
+        while u != t:
+            adj = self.adj[u]
+            while it[u] < len(adj):
+                k = adj[it[u]]
+                if self.cap[k] > self.eps and level[self.to[k]] == level[u] + 1:
+                    break
+                it[u] += 1
+            else:
+                if u == s:
+                    return 0.0
+                level[u] = -1  # dead end
+                u = self.to[path.pop() ^ 1]
+                it[u] += 1
+                continue
+            path.append(k)
+            u = self.to[k]
+        f = min(self.cap[k] for k in path)
+        for k in path:
+            self.cap[k] -= f
+            self.cap[k ^ 1] += f
+        return f
+
+
+def crash_costs(project, scenario="expected", rates=None):
+    """{task_id: cost per hour of shortening} from a Project's role hours.
+
+    A task's cost rate is its staff cost per hour of normal duration,
+    sum(rates[role] * role hours) / duration, with every role rate 1 by
+    default (so the unit is staff-hours per hour).
+    """
+    from .resources import ROLES
+
+    rates = rates or {}
+    weights = [float(rates.get(r, 1.0)) for r in ROLES]
+    duration = project.duration_array(scenario).tolist()
+    costs = {}
+    for i, tid in enumerate(project.ids):
+        labour = sum(w * h for w, h in zip(weights, project.role_hours[i].tolist()))
+        costs[tid] = labour / duration[i] if duration[i] > 0 else 0.0
+    return costs
+
+
+def _crossing(lines, tol):
+    """First delta > 0 where a line e - r * delta overtakes the max of `lines` at 0+."""
+    top = max(e for e, _ in lines)
+    rate = min(r for e, r in lines if e >= top - tol)
+    delta = INF
+    for e, r in lines:
+        if e < top - tol and r < rate:
+            delta = min(delta, (top - e) / (rate - r))
+    return top, rate, delta
+
+
+def crash_curve(tasks, predecessors=None, durations=None, min_durations=None, costs=None,
+                tol=1e-9, max_steps=None):
+    """Breakpoints of the least-cost duration curve, from normal to fully crashed.
+
+    `durations` are the normal durations, `min_durations` the crashed ones
+    (clipped to [0, normal]; default: no crashing) and `costs` the cost per
+    hour of shortening each task (default 1). With a Project as `tasks`,
+    durations may be scenario names; `min_durations` defaults to "best" and
+    `costs` to crash_costs(project, durations).
+
+    Returns one dict per breakpoint, longest first: "T_max", "cost" (total
+    crash cost), "slope" (cost per hour saved since the previous
+    breakpoint), "durations", "start_times" and "completion_times". The
+    least cost for a deadline in between is linear in the deadline (see
+    crash_schedule).
+    """
+    if hasattr(tasks, "duration_map"):
+        if durations is None:
+            durations = "expected"
+        if costs is None:
+            costs = crash_costs(tasks, durations if isinstance(durations, str) else "expected")
+        min_durations = tasks.duration_map("best" if min_durations is None else min_durations)
+    tasks, predecessors, durations = unpack_inputs(tasks, predecessors, durations)
+    ids = list(tasks)
+    index = {t: i for i, t in enumerate(ids)}
+    n = len(ids)
+    preds = [[index[p] for p in predecessors.get(t, []) if p in index] for t in ids]
+    has_succ = [False] * n
+    for ps in preds:
+        for p in ps:
+            has_succ[p] = True
+    order = [index[t] for t in topological_order(ids, predecessors)]
+
+    normal = [float(durations[t]) for t in ids]
+    if min_durations is None:
+        minimum = normal[:]
+    else:
+        minimum = [max(0.0, min(float(min_durations.get(t, d)), d)) for t, d in zip(ids, normal)]
+    cost = [1.0] * n if costs is None else [float(costs.get(t, 1.0)) for t in ids]
+    negative = [t for t, c in zip(ids, cost) if c < 0]
+    if negative:
+        raise ValueError(f"Crash costs must not be negative: {negative}")
+
+    d = normal[:]
+    points = []
+    steps = 0
+    while True:
+        es, ef, ls, t_max = cpm_passes(order, preds, d)
+        _add_point(points, {
+            "T_max": t_max,
+            "cost": sum(c * (dn - di) for c, dn, di in zip(cost, normal, d)),
+            "durations": dict(zip(ids, d)),
+            "start_times": dict(zip(ids, es)),
+            "completion_times": dict(zip(ids, ef)),
+        }, tol)
+        if max_steps is not None and steps >= max_steps:
+            break
+        change = _min_cut_step(n, preds, has_succ, d, normal, minimum, cost, es, ef, ls, t_max, tol)
+        if not change:
+            break  # some critical path is fully crashed
+        delta = min(d[i] - minimum[i] if c < 0 else normal[i] - d[i] for i, c in change.items())
+
+        # Stop where another path (or subpath) would overtake the critical ones
+        ef_line = [None] * n
+        for i in order:
+            lines = [ef_line[p] for p in preds[i]] or [(0.0, 0.0)]
+            e, r, cross = _crossing(lines, tol)
+            delta = min(delta, cross)
+            ef_line[i] = (e + d[i], r - change.get(i, 0))
+        if n:
+            delta = min(delta, _crossing(ef_line, tol)[2])
+
+        for i, c in change.items():
+            d[i] = min(normal[i], max(minimum[i], d[i] + c * delta))
+        steps += 1
+    return points
+
+
+def _add_point(points, point, tol):
+    """Append a breakpoint, dropping the previous one if the slope did not change."""
+    if points:
+        prev = points[-1]
+        saved = prev["T_max"] - point["T_max"]
+        point["slope"] = (point["cost"] - prev["cost"]) / saved if saved > tol else INF
+        if len(points) > 1 and abs(point["slope"] - prev["slope"]) <= tol * max(1.0, abs(prev["slope"])):
+            points[-1] = point
+            return
+    else:
+        point["slope"] = 0.0
+    points.append(point)
+
+
+def _min_cut_step(n, preds, has_succ, d, normal, minimum, cost, es, ef, ls, t_max, tol):
+    """{task index: -1 (shorten) or +1 (lengthen)} for the cheapest cut, or None.
+
+    Critical task i is the arc 2 + 2i -> 3 + 2i; nodes 0 and 1 are the
+    project start and end. Its flow bounds say what a cut may do with it:
+    [0, c] while it can be shortened, [c, inf) once fully crashed (crossing
+    the cut backwards lengthens it and saves c), [c, c] in between and
+    [0, inf) if it cannot change.
+    """
+    eps = tol * max(1.0, t_max)
+    critical = [ls[i] - es[i] <= eps for i in range(n)]
+    net = _FlowNetwork(2 * n + 4, tol)
+    source, sink, super_source, super_sink = 0, 1, 2 * n + 2, 2 * n + 3
+    excess = [0.0] * (2 * n + 4)
+    for i in range(n):
+        if not critical[i]:
+            continue
+        u, v = 2 + 2 * i, 3 + 2 * i
+        lower = cost[i] if d[i] < normal[i] - tol else 0.0
+        upper = cost[i] if d[i] > minimum[i] + tol else INF
+        net.add(u, v, upper - lower)
+        excess[v] += lower
+        excess[u] -= lower
+        if not preds[i]:
+            net.add(source, u, INF)
+        if not has_succ[i] and ef[i] >= t_max - eps:
+            net.add(v, sink, INF)
+        for p in preds[i]:
+            if critical[p] and abs(ef[p] - es[i]) <= eps:
+                net.add(3 + 2 * p, u, INF)
+    if net.reachable(source, infinite_only=True)[sink]:
+        return None
+
+    # Feasible flow within the lower bounds (a circulation through end -> start) ...
+    back = net.add(sink, source, INF)
+    extra = []
+    need = 0.0
+    for node, x in enumerate(excess):
+        if x > tol:
+            extra.append(net.add(super_source, node, x))
+            need += x
+        elif x < -tol:
+            extra.append(net.add(node, super_sink, -x))
+    if net.max_flow(super_source, super_sink) < need - tol * max(1.0, need):
+        raise RuntimeError("No feasible flow for the crash step; the schedule is not cost-optimal")
+    for k in [back] + extra:
+        net.cap[k] = net.cap[k ^ 1] = 0.0
+    # ... then the maximum start -> end flow; its minimum cut is the cheapest step
+    net.max_flow(source, sink)
+    side = net.reachable(source)
+
+    change = {}
+    for i in range(n):
+        if critical[i]:
+            u, v = side[2 + 2 * i], side[3 + 2 * i]
+            if u and not v:
+                change[i] = -1
+            elif v and not u and d[i] < normal[i] - tol:
+                change[i] = 1
+    return change
+
+
+def crash_schedule(tasks, predecessors, curve, deadline):
+    """Least-cost plan for `deadline`, interpolated between two breakpoints.
+
+    Durations between adjacent breakpoints of `curve` mix linearly, which
+    keeps them optimal, so any deadline is answered with one CPM pass
+    instead of another solve. Raises ValueError if the deadline is shorter
+    than the fully crashed project.
+    """
+    hi = lo = curve[0]
+    w = 0.0
+    if deadline < curve[0]["T_max"]:
+        for hi, lo in zip(curve, curve[1:]):
+            if lo["T_max"] <= deadline:
+                w = (hi["T_max"] - deadline) / (hi["T_max"] - lo["T_max"])
+                break
+        else:
+            raise ValueError(f"Deadline {deadline} is shorter than the fully crashed "
+                             f"project ({curve[-1]['T_max']})")
+    durations = {t: (1 - w) * hi["durations"][t] + w * lo["durations"][t] for t in hi["durations"]}
+    sol = solve_cpm(tasks, predecessors, durations)
+    return {
+        "T_max": sol["T_max"],
+        "cost": (1 - w) * hi["cost"] + w * lo["cost"],
+        "slope": lo["slope"],
+        "durations": durations,
+        "start_times": sol["start_times"],
+        "completion_times": sol["completion_times"],
+    }
@@ -0,0 +1,59 @@
+"""One solve entry point for the scripts, the CLI, batch and the DesktopApp.
+
+schedule() checks the method, picks the solver (solve_rcpsp when role
+`capacities` are given, else the get_backend(method) LP/CPM backend) and
+keys the SolutionCache, so every front end validates and caches the same
+way.
+"""
+
+from .backends import get_backend
+from .cache import solution_key
+
+METHODS = ("auto", "cpm", "lp", "cbc", "highs")
+STAFFED_METHODS = ("auto", "milp", "sgs", "parallel-sgs")
+
+
+def check_method(method, capacities=None):
+    """Raise ValueError unless `method` fits the solve (staff-limited or not)."""
+    allowed = METHODS if capacities is None else STAFFED_METHODS
+    if method not in allowed:
+        raise ValueError(f"Unknown method: {method} (expected one of {allowed})")
+
+
+def solve_options(method, demands=None, capacities=None):
+    """The solution_key options of a solve."""
+    if capacities is None:
+        return {"method": method}
+    return {"method": method, "demands": demands, "capacities": capacities}
+
+
+def solve(tasks, predecessors, durations, method="auto", demands=None, capacities=None):
+    """Run the solver for `method` without checks or caching."""
+    if capacities is not None:
+        from .resources import solve_rcpsp
+
+        return solve_rcpsp(tasks, predecessors, durations, demands, capacities, method)
+    return get_backend(method).schedule(tasks, predecessors, durations)
+
+
+def schedule(tasks, predecessors=None, durations=None, method="auto", demands=None,
+             capacities=None, cache=None, label=None, runner=None):
+    """Validated, optionally cached solve; returns the solver's result dict.
+
+    With a Project as `tasks` the staff `demands` default to its role
+    demands. `label` (usually the scenario) is part of the cache key.
+    `runner(fn, *args)` runs the solve itself, e.g. in a child process;
+    by default it is called directly.
+    """
+    check_method(method, capacities)
+    if capacities is not None and demands is None and hasattr(tasks, "role_demands"):
+        demands = tasks.role_demands()
+    args = (tasks, predecessors, durations, method, demands, capacities)
+
+    def run():
+        return solve(*args) if runner is None else runner(solve, *args)
+
+    if cache is None:
+        return run()
+    key = solution_key(tasks, predecessors, durations, label, solve_options(method, demands, capacities))
+    return cache.get_or_solve(key, run)
@@ -0,0 +1,100 @@
+"""CPM times that follow single-task duration edits.
+
+IncrementalCPM keeps, per task, the earliest finish (head) and the longest
+path from its start to the end of the project (tail). Changing one task's
+duration can only move the heads of its downstream cone and the tails of its
+upstream cone, so set_duration() re-evaluates just those tasks in topological
+order and stops wherever a value does not change. Latest times follow as
+T_max - tail, which is what the full backward pass in cpm.solve_cpm gives.
+"""
+
+import heapq
+
+
+class IncrementalCPM:
+    def __init__(self, project, durations):
+        self.project = project
+        self.ids = project.ids
+        self.index = project.index
+        self.durations = project.duration_array(durations).tolist()
+        self._pp, self._pi = project.pred_ptr.tolist(), project.pred_idx.tolist()
+        self._sp, self._si = project.succ_ptr.tolist(), project.succ_idx.tolist()
+        order = project.order.tolist()
+        self._rank = [0] * len(order)
+        for r, i in enumerate(order):
+            self._rank[i] = r
+
+        n = len(order)
+        self.finish = [0.0] * n
+        self.tail = [0.0] * n
+        for i in order:
+            self.finish[i] = self._head(i)
+        for i in reversed(order):
+            self.tail[i] = self._tail(i)
+
+    def _head(self, i):
+        start = 0.0
+        for p in self._pi[self._pp[i]:self._pp[i + 1]]:
+            if self.finish[p] > start:
+                start = self.finish[p]
+        return start + self.durations[i]
+
+    def _tail(self, i):
+        rest = 0.0
+        for s in self._si[self._sp[i]:self._sp[i + 1]]:
+            if self.tail[s] > rest:
+                rest = self.tail[s]
+        return self.durations[i] + rest
+
+    def set_duration(self, task_id, hours):
+        """Change one duration; returns how many tasks were re-evaluated."""
+        i = self.index[task_id]
+        self.durations[i] = float(hours)
+        rank = self._rank
+        touched = 0
+
+        # heads: downstream cone, lowest topological rank first
+        heap, queued = [(rank[i], i)], {i}
+        while heap:
+            _, j = heapq.heappop(heap)
+            touched += 1
+            value = self._head(j)
+            if value == self.finish[j] and j != i:
+                continue
+            self.finish[j] = value
+            for s in self._si[self._sp[j]:self._sp[j + 1]]:
+                if s not in queued:
+                    queued.add(s)
+                    heapq.heappush(heap, (rank[s], s))
+
+        # tails: upstream cone, highest rank first
+        heap, queued = [(-rank[i], i)], {i}
+        while heap:
+            _, j = heapq.heappop(heap)
+            touched += 1
+            value = self._tail(j)
+            if value == self.tail[j] and j != i:
+                continue
+            self.tail[j] = value
+            for p in self._pi[self._pp[j]:self._pp[j + 1]]:
+                if p not in queued:
+                    queued.add(p)
+                    heapq.heappush(heap, (-rank[p], p))
+        return touched
+
+    def solution(self):
+        """Current schedule in the solve_cpm result shape."""
+        ids, d = self.ids, self.durations
+        t_max = max(self.finish, default=0.0)
+        ls = [t_max - q for q in self.tail]
+        return {
+            "status": "Optimal",
+            "T_max": t_max,
+            "start_times": {t: f - dur for t, f, dur in zip(ids, self.finish, d)},
+            "completion_times": dict(zip(ids, self.finish)),
+            "latest_start_times": dict(zip(ids, ls)),
+            "latest_completion_times": {t: s + dur for t, s, dur in zip(ids, ls, d)},
+        }
+
+    def duration_map(self):
+        return dict(zip(self.ids, self.durations))
@@ -0,0 +1,106 @@
+"""Incremental JSON reader for large tasks.json-style files.
+
+Walks the top-level containers token by token and decodes only one element
+at a time with json.JSONDecoder.raw_decode, so a 100k-task file never turns
+into one big dict/list tree in memory.
+
+_DineWise/py_scripts/json_stream.py carries the same buffering and
+raw_decode logic for the Yelp files (the two subprojects do not share
+code); keep the two in step.
+"""
+
+import json
+import re
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITERS = " \t\n\r,:]}"
+
+
+class JsonStream:
+    def __init__(self, fp, chunk_size=1 << 16):
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self):
+        chunk = self.fp.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Next non-whitespace character without consuming it ('' at EOF)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, ch):
+        found = self.peek()
+        if found != ch:
+            raise ValueError(f"Expected {ch!r} in JSON stream, found {found!r}")
+        self.pos += 1
+
+    def value(self):
+        """Decode and consume the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                if self.eof or not self._fill():
+                    raise
+                continue
+            # A number cut off at the buffer edge still decodes ("2" of "2.5",
+            # even "2" of "2e5" once "2e" is read); read on to be sure
+            if not self.eof and (end == len(self.buf) or self.buf[end] not in _DELIMITERS) \
+                    and self._fill():
+                continue
+            self.pos = end
+            return obj
+
+    def _separator(self, close):
+        ch = self.peek()
+        if ch == ",":
+            self.pos += 1
+            return True
+        if ch == close:
+            self.pos += 1
+            return False
+        raise ValueError(f"Expected ',' or {close!r} in JSON stream, found {ch!r}")
+
+    def iter_array(self):
+        """Yield each element of the array at the cursor."""
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            if not self._separator("]"):
+                return
+
+    def iter_object(self):
+        """Yield each key of the object at the cursor.
+
+        The caller must consume the key's value (value(), iter_array(), ...)
+        before asking for the next key.
+        """
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if not self._separator("}"):
+                return
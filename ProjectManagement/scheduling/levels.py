@@ -0,0 +1,91 @@
+"""Level-structured precedence arrays for vectorized CPM passes.
+
+Tasks are grouped into topological levels and each level's predecessor and
+successor lists are stored CSR-style: one flat neighbour index array plus
+segment offsets. A forward or backward pass then costs one NumPy gather and
+one np.maximum/np.minimum.reduceat per level for any number of duration rows
+(samples or scenarios) at once, and the gather is only as wide as the
+level's edge count (no padding to the largest in-degree).
+"""
+
+import numpy as np
+
+from .cpm import topological_order, unpack_inputs
+
+
+def topological_levels(tasks, predecessors):
+    """Group tasks into levels; every predecessor sits in an earlier level."""
+    tasks, predecessors, _ = unpack_inputs(tasks, predecessors)
+    known = set(tasks)
+    level = {}
+    for t in topological_order(tasks, predecessors):
+        preds = [p for p in predecessors.get(t, []) if p in known]
+        level[t] = 1 + max((level[p] for p in preds), default=-1)
+    levels = [[] for _ in range(max(level.values(), default=-1) + 1)]
+    for t in tasks:
+        levels[level[t]].append(t)
+    return levels
+
+
+def _segments(idx, neighbours):
+    """(idx, tasks of idx that have neighbours, flat neighbour indices, segment starts)."""
+    linked = [i for i in idx.tolist() if neighbours[i]]
+    flat = [j for i in linked for j in neighbours[i]]
+    starts = np.cumsum([0] + [len(neighbours[i]) for i in linked[:-1]]) if linked else []
+    return (idx, np.array(linked, dtype=np.int64), np.array(flat, dtype=np.int64),
+            np.asarray(starts, dtype=np.int64))
+
+
+class LevelGraph:
+    """Precedence structure of a task list, built once and reused per pass.
+
+    Duration matrices passed to the pass methods have shape (rows, n_tasks)
+    with columns in `self.tasks` order. `max_gather` is the widest
+    per-level neighbour gather, for sizing chunks of rows.
+    """
+
+    def __init__(self, tasks, predecessors):
+        tasks, predecessors, _ = unpack_inputs(tasks, predecessors)
+        self.tasks = list(tasks)
+        self.index = {t: i for i, t in enumerate(self.tasks)}
+
+        preds = [[self.index[p] for p in predecessors.get(t, []) if p in self.index]
+                 for t in self.tasks]
+        succs = [[] for _ in self.tasks]
+        for i, ps in enumerate(preds):
+            for p in ps:
+                succs[p].append(i)
+
+        levels = topological_levels(self.tasks, predecessors)
+        self.level_idx = [np.array([self.index[t] for t in lvl], dtype=np.int64)
+                          for lvl in levels]
+        self.level_preds = [_segments(idx, preds) for idx in self.level_idx]
+        self.level_succs = [_segments(idx, succs) for idx in self.level_idx]
+        self.max_gather = max((len(seg[2]) for seg in self.level_preds + self.level_succs), default=0)
+
+    def durations_matrix(self, duration_dicts):
+        """Stack duration dicts into a (len(duration_dicts), n_tasks) array."""
+        return np.array([[d[t] for t in self.tasks] for d in duration_dicts], dtype=float)
+
+    def forward(self, dur):
+        """Earliest finish times (rows, n_tasks) and T_max (rows,)."""
+        n = len(self.tasks)
+        ef = np.empty((dur.shape[0], n))
+        for idx, linked, flat, starts in self.level_preds:
+            ef[:, idx] = dur[:, idx]
+            if len(linked):
+                ef[:, linked] += np.maximum.reduceat(ef[:, flat], starts, axis=1)
+        t_max = ef.max(axis=1) if n else np.zeros(dur.shape[0])
+        return ef, t_max
+
+    def backward(self, dur, t_max):
+        """Latest start times (rows, n_tasks) for the given finish targets."""
+        n = len(self.tasks)
+        ls = np.empty((dur.shape[0], n))
+        t_max = t_max[:, None]
+        for idx, linked, flat, starts in reversed(self.level_succs):
+            ls[:, idx] = t_max - dur[:, idx]
+            if len(linked):
+                lf = np.minimum(np.minimum.reduceat(ls[:, flat], starts, axis=1), t_max)
+                ls[:, linked] = lf - dur[:, linked]
+        return ls
@@ -0,0 +1,101 @@
+"""Phase timings and counters for schedule solves.
+
+A SolveMetrics collects wall time per named phase (e.g. build, update,
+solver, extract) and counters such as the number of variables and
+constraints. The backends and solve_rcpsp attach one to every result as
+result["metrics"] (a plain dict, see as_dict()), so callers can log it
+without printing anything. log_metrics() appends such a dict to a JSON
+lines file, and profiled() is an opt-in cProfile/tracemalloc wrapper.
+"""
+
+import json
+import time
+from contextlib import contextmanager
+
+
+class SolveMetrics:
+    def __init__(self, **labels):
+        self.labels = labels
+        self.phases = {}
+        self.counters = {}
+        self.profile = None
+
+    @contextmanager
+    def phase(self, name):
+        """Time a block; repeated phases accumulate."""
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + time.perf_counter() - t0
+
+    def count(self, **counters):
+        self.counters.update(counters)
+
+    def add(self, other, prefix=""):
+        """Fold in another metrics dict (e.g. a backend's) under `prefix`.
+
+        Use a dotted prefix ("solve.") for phases nested inside one of this
+        object's own phases; total() leaves dotted phases out.
+        """
+        for name, seconds in other.get("phases", {}).items():
+            key = prefix + name
+            self.phases[key] = self.phases.get(key, 0.0) + seconds
+        self.counters.update(other.get("counters", {}))
+
+    def total(self):
+        return sum(v for k, v in self.phases.items() if "." not in k)
+
+    def as_dict(self):
+        out = dict(self.labels)
+        out["phases"] = dict(self.phases)
+        out["counters"] = dict(self.counters)
+        out["total"] = self.total()
+        if self.profile is not None:
+            out["profile"] = self.profile
+        return out
+
+
+def log_metrics(path, metrics, **extra):
+    """Append one metrics dict (or SolveMetrics) as a JSON line."""
+    if isinstance(metrics, SolveMetrics):
+        metrics = metrics.as_dict()
+    record = dict(metrics, timestamp=time.time(), **extra)
+    with open(path, "a") as f:
+        f.write(json.dumps(record, default=str) + "\n")
+
+
+@contextmanager
+def profiled(metrics, cpu=False, memory=False, top=20):
+    """Optionally run a block under cProfile and/or tracemalloc.
+
+    cpu=True stores the `top` functions by cumulative time as text in
+    metrics.profile; memory=True records the peak traced allocation in
+    metrics.counters["peak_memory_bytes"]. Both are off by default since
+    they slow the solve down.
+    """
+    import cProfile
+    import io
+    import pstats
+    import tracemalloc
+
+    profiler = cProfile.Profile() if cpu else None
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    if memory:
+        tracemalloc.reset_peak()
+    if profiler:
+        profiler.enable()
+    try:
+        yield metrics
+    finally:
+        if profiler:
+            profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(top)
+            metrics.profile = out.getvalue()
+        if memory:
+            metrics.count(peak_memory_bytes=tracemalloc.get_traced_memory()[1])
+            if started_tracing:
+                tracemalloc.stop()
@@ -0,0 +1,97 @@
+"""Parametric schedule model for solving many duration scenarios.
+
+Only the right-hand side (task durations) changes between what-if scenarios,
+so the task graph is compiled once and every scenario reuses it:
+
+* method="cpm" (default) compiles the precedence levels once and solves all
+  scenarios in one vectorized forward pass.
+* method="cbc"/"highs"/"lp" builds the solver backend's model once and, per
+  scenario, only replaces the duration right-hand side before re-solving.
+  This saves rebuilding the model, not solver time: each scenario is still
+  a fresh LP solve (a CBC call per scenario), so "cpm" is far faster.
+"""
+
+import numpy as np
+
+from .backends import get_backend
+from .cpm import unpack_inputs
+from .levels import LevelGraph
+
+
+class ParametricModel:
+    def __init__(self, tasks, predecessors, method="cpm", name="Parametric"):
+        """`method` is "cpm" or a solver backend name ("lp", "cbc", "highs")."""
+        if method not in ("cpm", "lp", "cbc", "highs"):
+            raise ValueError(f"Unknown method: {method}")
+        self.method = method
+        self.name = name
+        self.project = tasks if hasattr(tasks, "duration_array") else None
+        self.graph = LevelGraph(tasks, predecessors)
+        self.predecessors = unpack_inputs(tasks, predecessors)[1]
+        self.tasks = self.graph.tasks
+        self.backend = None if method == "cpm" else get_backend(method)
+        self._lp = None  # backend model, built on first LP solve
+
+    def durations_matrix(self, scenarios):
+        """Accept a list of duration dicts or an (n_scenarios, n_tasks) array.
+
+        Built from a Project, list items may also be scenario names or arrays.
+        """
+        if isinstance(scenarios, np.ndarray):
+            dur = scenarios.astype(float, copy=False)
+        elif self.project is not None:
+            dur = np.array([self.project.duration_array(s) for s in scenarios], dtype=float)
+        else:
+            dur = self.graph.durations_matrix(scenarios)
+        if dur.ndim != 2 or dur.shape[1] != len(self.tasks):
+            raise ValueError(f"Expected (n_scenarios, {len(self.tasks)}) durations, got {dur.shape}")
+        return dur
+
+    def solve_batch(self, scenarios):
+        """Solve every scenario against the same compiled model.
+
+        Returns {"status": [...], "T_max": (k,), "start_times": (k, n),
+        "completion_times": (k, n)} with one row per scenario and columns in
+        `self.tasks` order.
+        """
+        dur = self.durations_matrix(scenarios)
+        if self.method == "cpm":
+            ef, t_max = self.graph.forward(dur)
+            return {
+                "status": ["Optimal"] * dur.shape[0],
+                "T_max": t_max,
+                "start_times": ef - dur,
+                "completion_times": ef,
+            }
+
+        k, n = dur.shape
+        status = []
+        t_max = np.empty(k)
+        starts = np.empty((k, n))
+        ends = np.empty((k, n))
+        for row in range(k):
+            status_row, t_max[row], starts[row], ends[row] = self._solve_lp_row(dur[row])
+            status.append(status_row)
+        return {"status": status, "T_max": t_max, "start_times": starts, "completion_times": ends}
+
+    def solve(self, durations):
+        """Solve one duration dict; returns the solve_scenario-style dict."""
+        batch = self.solve_batch([durations])
+        return {
+            "status": batch["status"][0],
+            "T_max": float(batch["T_max"][0]),
+            "start_times": dict(zip(self.tasks, batch["start_times"][0].tolist())),
+            "completion_times": dict(zip(self.tasks, batch["completion_times"][0].tolist())),
+        }
+
+    # -------------------------- LP PATH -------------------------- #
+    def _solve_lp_row(self, dur_row):
+        if self._lp is None:
+            self._lp = self.backend.build(self.tasks, self.predecessors)
+        sol = self.backend.solve(self._lp, dict(zip(self.tasks, dur_row.tolist())))
+        return (
+            sol["status"],
+            sol["T_max"],
+            [sol["start_times"][t] for t in self.tasks],
+            [sol["completion_times"][t] for t in self.tasks],
+        )
@@ -0,0 +1,116 @@
+"""Gantt chart renderer shared by gantt.py and the DesktopApp.
+
+All bars are one PolyCollection, so drawing cost barely depends on the
+number of tasks. Bar labels are only placed on bars that are inside the
+view and wide enough (in pixels) to hold their text, and they are redone
+whenever the x/y limits change, so zooming in reveals more labels. A
+GanttChart can be updated in place with a new schedule, which lets a GUI
+keep one figure and canvas for its whole session.
+
+The figure is a plain matplotlib Figure (not registered with pyplot) unless
+an existing Axes is passed in, so dropping the chart frees it.
+"""
+
+import numpy as np
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+from matplotlib.ticker import FixedLocator, FuncFormatter, MaxNLocator
+
+TICK_LABEL_LIMIT = 50  # label every row up to this many tasks
+
+
+class GanttChart:
+    def __init__(self, ax=None, figsize=(12, 4), dpi=100, bar_height=0.4,
+                 color="skyblue", edgecolor="black", max_labels=300, fontsize=8):
+        if ax is None:
+            ax = Figure(figsize=figsize, dpi=dpi).add_subplot()
+        self.ax = ax
+        self.figure = ax.figure
+        self.bar_height = bar_height
+        self.max_labels = max_labels
+        self.fontsize = fontsize
+        self.tasks = []
+        self.starts = np.zeros(0)
+        self.ends = np.zeros(0)
+        self._labels = []
+        self._relabelling = False
+
+        self.bars = PolyCollection([], facecolors=color, edgecolors=edgecolor, linewidths=0.5)
+        ax.add_collection(self.bars)
+        ax.set_xlabel("Time (hours)")
+        ax.yaxis.set_major_formatter(FuncFormatter(self._tick_label))
+        ax.callbacks.connect("xlim_changed", self._on_limits)
+        ax.callbacks.connect("ylim_changed", self._on_limits)
+        self.figure.canvas.mpl_connect("resize_event", lambda event: self.relabel())
+
+    def update(self, tasks, starts, ends, title=None, tight_layout=True):
+        """Show a new schedule; the first task is drawn at the top."""
+        self.tasks = list(reversed(list(tasks)))
+        self.starts = np.array([starts[t] for t in self.tasks], dtype=float)
+        self.ends = np.array([ends[t] for t in self.tasks], dtype=float)
+        n = len(self.tasks)
+
+        y = np.arange(n, dtype=float)
+        lo, hi = y - self.bar_height / 2, y + self.bar_height / 2
+        verts = np.empty((n, 4, 2))
+        verts[:, 0] = np.column_stack([self.starts, lo])
+        verts[:, 1] = np.column_stack([self.starts, hi])
+        verts[:, 2] = np.column_stack([self.ends, hi])
+        verts[:, 3] = np.column_stack([self.ends, lo])
+        self.bars.set_verts(verts)
+
+        if n <= TICK_LABEL_LIMIT:
+            self.ax.yaxis.set_major_locator(FixedLocator(range(n)))
+        else:
+            self.ax.yaxis.set_major_locator(MaxNLocator(nbins=TICK_LABEL_LIMIT, integer=True))
+        if title is not None:
+            self.ax.set_title(title)
+
+        finish = float(self.ends.max()) if n else 1.0
+        self._relabelling = True  # set both limits before placing labels
+        self.ax.set_xlim(0, finish * 1.02 or 1.0)
+        self.ax.set_ylim(-0.5, max(n, 1) - 0.5)
+        self._relabelling = False
+        if tight_layout:
+            self.figure.tight_layout()  # before labelling: it changes the axes width
+        self.relabel()
+
+    def _tick_label(self, y, pos=None):
+        i = int(round(y))
+        return self.tasks[i] if 0 <= i < len(self.tasks) and abs(y - i) < 1e-6 else ""
+
+    def _on_limits(self, ax):
+        if not self._relabelling:
+            self.relabel()
+
+    def relabel(self):
+        """Label the visible bars that are wide enough for their text."""
+        for text in self._labels:
+            text.remove()
+        self._labels = []
+        if not self.tasks:
+            return
+
+        x0, x1 = self.ax.get_xlim()
+        y0, y1 = sorted(self.ax.get_ylim())
+        px_per_hour = self.ax.bbox.width / (x1 - x0) if x1 > x0 else 0.0
+        char_px = self.fontsize * 0.5 * self.figure.dpi / 72  # rough average glyph width
+
+        lo = max(int(np.ceil(y0)), 0)
+        hi = min(int(np.floor(y1)), len(self.tasks) - 1)
+        rows = np.arange(lo, hi + 1)
+        width = self.ends[rows] - self.starts[rows]
+        visible = (self.ends[rows] > x0) & (self.starts[rows] < x1)
+        rows, width = rows[visible], width[visible]
+        # labels read "<id> (<hours>h)"; skip bars that cannot hold theirs
+        chars = [len(self.tasks[i]) + len(f"{w:.1f}") + 4 for i, w in zip(rows.tolist(), width.tolist())]
+        wide = width * px_per_hour >= np.array(chars, dtype=float) * char_px
+        rows, width = rows[wide], width[wide]
+        if len(rows) > self.max_labels:
+            return  # too many to read at this zoom
+
+        for i, w in zip(rows.tolist(), width.tolist()):
+            self._labels.append(self.ax.text(
+                self.starts[i] + w / 2, i, f"{self.tasks[i]} ({w:.1f}h)",
+                va="center", ha="center", fontsize=self.fontsize, clip_on=True,
+            ))
@@ -0,0 +1,280 @@
+"""Compact, array-backed project representation.
+
+A Project interns task IDs to integers once and keeps everything else in
+NumPy arrays: durations per scenario, role hours (n_tasks x len(ROLES)) and
+predecessors as CSR offsets/indices (predecessors of task i are
+pred_idx[pred_ptr[i]:pred_ptr[i + 1]]). Cycles and dangling predecessors are
+rejected once, at construction.
+
+Solvers and plotters accept a Project wherever they take a task list (see
+cpm.unpack_inputs); durations can then be given as a scenario name. CPM and
+the sparse LP builder work on the integer arrays directly, and read-only
+mapping views keep the dict-based solvers working without materialising
+per-task dicts.
+"""
+
+from array import array
+from collections.abc import Mapping
+
+import numpy as np
+
+from .jsonstream import JsonStream
+from .resources import ROLES
+
+SCENARIOS = ("best", "expected", "worst")
+
+
+class _PredecessorView(Mapping):
+    """predecessors[task_id] -> list of predecessor IDs, read from the CSR arrays."""
+
+    def __init__(self, project):
+        self._p = project
+
+    def __getitem__(self, tid):
+        p = self._p
+        i = p.index[tid]
+        return [p.ids[j] for j in p.pred_idx[p.pred_ptr[i]:p.pred_ptr[i + 1]].tolist()]
+
+    def __iter__(self):
+        return iter(self._p.ids)
+
+    def __len__(self):
+        return len(self._p.ids)
+
+
+class _ArrayView(Mapping):
+    """values[task_id] -> float, backed by one array in task-index order."""
+
+    def __init__(self, project, values):
+        self._index = project.index
+        self._values = values
+
+    def __getitem__(self, tid):
+        return float(self._values[self._index[tid]])
+
+    def __iter__(self):
+        return iter(self._index)
+
+    def __len__(self):
+        return len(self._index)
+
+
+class Project:
+    def __init__(self, ids, durations, role_hours, pred_ptr, pred_idx, descriptions=None):
+        self.ids = list(ids)
+        self.index = {t: i for i, t in enumerate(self.ids)}
+        if len(self.index) != len(self.ids):
+            seen = set()
+            dupes = sorted({t for t in self.ids if t in seen or seen.add(t)})
+            raise ValueError(f"Duplicate task IDs: {dupes}")
+        self.durations = {k: np.asarray(v, dtype=float) for k, v in durations.items()}
+        self.role_hours = np.asarray(role_hours, dtype=float).reshape(len(self.ids), len(ROLES))
+        self.pred_ptr = np.asarray(pred_ptr, dtype=np.int64)
+        self.pred_idx = np.asarray(pred_idx, dtype=np.int64)
+        self.descriptions = descriptions if descriptions is not None else [""] * len(self.ids)
+        self.order = self._topological_order()
+        self.predecessors = _PredecessorView(self)
+
+    # -------------------------- CONSTRUCTION -------------------------- #
+    @classmethod
+    def from_dicts(cls, task_rows, predecessors):
+        """Build from the in-memory tasks.json shape (list of task dicts + map)."""
+        builder = _Builder()
+        for row in task_rows:
+            builder.add_task(row)
+        for tid, preds in predecessors.items():
+            builder.add_predecessors(tid, preds)
+        return builder.build()
+
+    @classmethod
+    def load(cls, path, chunk_size=1 << 16):
+        """Stream a tasks.json file one task at a time into a Project."""
+        builder = _Builder()
+        with open(path, "r", encoding="utf-8") as f:
+            stream = JsonStream(f, chunk_size)
+            for key in stream.iter_object():
+                if key == "tasks":
+                    for row in stream.iter_array():
+                        builder.add_task(row)
+                elif key == "predecessors":
+                    for tid in stream.iter_object():
+                        builder.add_predecessors(tid, stream.value())
+                else:
+                    stream.value()
+        return builder.build()
+
+    def _topological_order(self):
+        """Kahn's algorithm over the CSR arrays; also builds the successor CSR."""
+        n = len(self.ids)
+        dst = np.repeat(np.arange(n, dtype=np.int64), np.diff(self.pred_ptr))
+        perm = np.argsort(self.pred_idx, kind="stable")
+        self.succ_idx = dst[perm]
+        self.succ_ptr = np.concatenate(
+            [[0], np.cumsum(np.bincount(self.pred_idx, minlength=n))]
+        ).astype(np.int64)
+
+        indegree = np.diff(self.pred_ptr).tolist()
+        sp, si = self.succ_ptr.tolist(), self.succ_idx.tolist()
+        order = [i for i in range(n) if indegree[i] == 0]
+        for i in order:  # grows while iterating (Kahn's algorithm)
+            for s in si[sp[i]:sp[i + 1]]:
+                indegree[s] -= 1
+                if indegree[s] == 0:
+                    order.append(s)
+        if len(order) != n:
+            stuck = sorted(self.ids[i] for i in range(n) if indegree[i] > 0)
+            raise ValueError(f"Precedence graph has a cycle through: {stuck}")
+        return np.asarray(order, dtype=np.int64)
+
+    # -------------------------- VIEWS -------------------------- #
+    def __len__(self):
+        return len(self.ids)
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def duration_array(self, durations):
+        """Scenario name, dict or array -> float array in task-index order."""
+        if isinstance(durations, str):
+            return self.durations[durations]
+        if isinstance(durations, np.ndarray):
+            return durations.astype(float, copy=False)
+        return np.array([durations[t] for t in self.ids], dtype=float)
+
+    def duration_map(self, durations):
+        """Scenario name or array -> read-only {task_id: hours} mapping."""
+        if isinstance(durations, Mapping):
+            return durations
+        return _ArrayView(self, self.duration_array(durations))
+
+    def solver_inputs(self, durations=None):
+        """(task IDs, predecessor mapping, duration mapping) for dict-based solvers."""
+        if durations is not None:
+            durations = self.duration_map(durations)
+        return self.ids, self.predecessors, durations
+
+    def solve_cpm(self, durations):
+        """CPM forward/backward passes over the integer arrays (see cpm.solve_cpm)."""
+        d = self.duration_array(durations).tolist()
+        n = len(self.ids)
+        pp, pi = self.pred_ptr.tolist(), self.pred_idx.tolist()
+        order = self.order.tolist()
+
+        es = [0.0] * n
+        ef = [0.0] * n
+        for i in order:
+            s = 0.0
+            for p in pi[pp[i]:pp[i + 1]]:
+                if ef[p] > s:
+                    s = ef[p]
+            es[i] = s
+            ef[i] = s + d[i]
+        t_max = max(ef, default=0.0)
+
+        lf = [t_max] * n
+        ls = [0.0] * n
+        for i in reversed(order):
+            ls[i] = lf[i] - d[i]
+            for p in pi[pp[i]:pp[i + 1]]:
+                if ls[i] < lf[p]:
+                    lf[p] = ls[i]
+
+        ids = self.ids
+        return {
+            "status": "Optimal",
+            "T_max": t_max,
+            "start_times": dict(zip(ids, es)),
+            "completion_times": dict(zip(ids, ef)),
+            "latest_start_times": dict(zip(ids, ls)),
+            "latest_completion_times": dict(zip(ids, lf)),
+        }
+
+    def role_demands(self):
+        """{task_id: {role: 1}} for the RCPSP solvers (see resources.role_demands)."""
+        rows, cols = np.nonzero(self.role_hours > 0)
+        demands = {t: {} for t in self.ids}
+        for i, j in zip(rows.tolist(), cols.tolist()):
+            demands[self.ids[i]][ROLES[j]] = 1
+        return demands
+
+    def task_rows(self):
+        """Yield tasks.json-style dicts (e.g. to fill the DesktopApp table)."""
+        for i, tid in enumerate(self.ids):
+            row = {"id": tid, "description": self.descriptions[i]}
+            for s in SCENARIOS:
+                row[s] = float(self.durations[s][i])
+            row.update(zip(ROLES, self.role_hours[i].tolist()))
+            yield row
+
+
+class _Builder:
+    """Accumulates tasks into flat typed arrays while streaming.
+
+    Predecessor edges are resolved to integer (src, dst) pairs as soon as
+    both ends are known; only edges seen before their tasks are kept as
+    strings until build().
+    """
+
+    def __init__(self):
+        self.ids = []
+        self.index = {}
+        self.descriptions = []
+        self.durations = {s: array("d") for s in SCENARIOS}
+        self.role_hours = array("d")
+        self.edge_src = array("q")
+        self.edge_dst = array("q")
+        self.deferred = []
+
+    def add_task(self, row):
+        tid = row["id"]
+        if tid not in self.index:
+            self.index[tid] = len(self.ids)
+        self.ids.append(tid)
+        self.descriptions.append(row.get("description", ""))
+        for s in SCENARIOS:
+            self.durations[s].append(float(row.get(s, 0) or 0))
+        for r in ROLES:
+            self.role_hours.append(float(row.get(r, 0) or 0))
+
+    def add_predecessors(self, tid, preds):
+        index = self.index
+        dst = index.get(tid)
+        for p in preds:
+            src = index.get(p)
+            if dst is None or src is None:
+                self.deferred.append((tid, p))
+            else:
+                self.edge_src.append(src)
+                self.edge_dst.append(dst)
+
+    def build(self):
+        index = self.index
+        unknown_tasks, dangling = set(), []
+        for tid, p in self.deferred:
+            if tid not in index:
+                unknown_tasks.add(tid)
+            elif p not in index:
+                dangling.append(f"{p} -> {tid}")
+            else:
+                self.edge_src.append(index[p])
+                self.edge_dst.append(index[tid])
+        if unknown_tasks:
+            raise ValueError(f"Predecessors listed for unknown tasks: {sorted(unknown_tasks)}")
+        if dangling:
+            raise ValueError(f"Dangling predecessors: {dangling}")
+
+        def as_array(buf, dtype):
+            return np.frombuffer(buf, dtype=dtype) if len(buf) else np.zeros(0, dtype=dtype)
+
+        src = as_array(self.edge_src, np.int64)
+        dst = as_array(self.edge_dst, np.int64)
+        perm = np.argsort(dst, kind="stable")  # keep file order within each task
+        pred_ptr = np.concatenate([[0], np.cumsum(np.bincount(dst, minlength=len(self.ids)))])
+        return Project(
+            self.ids,
+            {s: as_array(a, float) for s, a in self.durations.items()},
+            as_array(self.role_hours, float),
+            pred_ptr,
+            src[perm],
+            self.descriptions,
+        )
@@ -0,0 +1,489 @@
+"""Resource-constrained scheduling (RCPSP) over the tasks.json role columns.
+
+Every row in tasks.json carries hours for five roles. The roles are named
+people (fullStackDev1 and fullStackDev2 are different developers), so a task
+holds one unit of each role it has hours on for its whole duration, and
+`capacities` says how many units of each role exist (default 1).
+
+Two solvers share the solve_cpm result shape:
+
+* solve_sgs: priority-rule list scheduling (serial or parallel schedule
+  generation scheme) using latest-finish-time priorities, over integer task
+  indices with blocked resource profiles (about 0.6 s for 20,000 tasks and
+  under 2 s for 50,000 on one core).
+* solve_time_indexed: exact time-indexed MILP in PuLP for small projects,
+  bounded by the SGS makespan (solved in-process by HiGHS when highspy is
+  installed, otherwise by CBC).
+"""
+
+import heapq
+import math
+from bisect import bisect_right
+
+from .backends import default_milp_solver
+from .cpm import cpm_passes, solve_cpm, topological_order, unpack_inputs
+from .metrics import SolveMetrics
+
+ROLES = ("projectManager", "fullStackDev1", "fullStackDev2", "cloudDevops", "dataEngineer")
+
+# "auto" uses the MILP only up to this many tasks and start-slot binaries
+# (tasks x their time windows); above either it keeps the SGS schedule.
+# The 15-task worst case (~1,460 binaries) hits the 20 s time limit.
+MILP_TASK_LIMIT = 30
+MILP_BINARY_LIMIT = 500
+
+
+def role_demands(task_rows, roles=ROLES):
+    """{task_id: {role: 1}} for every role with hours on that task."""
+    return {
+        row["id"]: {r: 1 for r in roles if float(row.get(r, 0) or 0) > 0}
+        for row in task_rows
+    }
+
+
+def _project_demands(tasks, demands):
+    """Default a Project's demands to its own role-hour columns."""
+    if demands is None:
+        return tasks.role_demands() if hasattr(tasks, "role_demands") else {}
+    return demands
+
+
+def _check_capacities(demands, capacities):
+    for t, need in demands.items():
+        for r, q in need.items():
+            if q > capacities.get(r, 0):
+                raise ValueError(f"Task {t} needs {q} x {r} but capacity is {capacities.get(r, 0)}")
+
+
+class _Profile:
+    """Step function of resource usage, kept in blocks of at most 2 * BLOCK segments.
+
+    Segment k of block b holds usage[b][k] from times[b][k] until the next
+    segment starts; the last segment is always empty and lasts forever. Each
+    block caches, per usage limit, a summary of its runs of segments within
+    that limit, so earliest_fit skips every block without a long enough gap
+    instead of walking its segments.
+    """
+
+    BLOCK = 32
+
+    def __init__(self, cap):
+        self.cap = cap
+        self.times = [[0.0]]
+        self.usage = [[0]]
+        self.heads = [0.0]  # first time of each block
+        self.summaries = [{}]
+
+    def _locate(self, t):
+        b = bisect_right(self.heads, t) - 1
+        return b, bisect_right(self.times[b], t) - 1
+
+    def _summary(self, b, limit):
+        """(first segment fits, end of the leading run or None if all fit, longest inner run, trailing run start)."""
+        cached = self.summaries[b].get(limit)
+        if cached is None:
+            times, usage = self.times[b], self.usage[b]
+            lead_end = None
+            best = -math.inf  # no inner run
+            run = None
+            for k, u in enumerate(usage):
+                if u > limit:
+                    if lead_end is None:
+                        lead_end = times[k]
+                    elif run is not None and times[k] - run > best:
+                        best = times[k] - run
+                    run = None
+                elif run is None:
+                    run = times[k]
+            cached = self.summaries[b][limit] = (usage[0] <= limit, lead_end, best, run)
+        return cached
+
+    def _scan(self, b, k, t, run, duration, limit):
+        """Walk block b from segment k; returns (run start, True) once a run is long enough."""
+        times, usage = self.times[b], self.usage[b]
+        last = len(times) - 1
+        for k in range(k, last + 1):
+            if usage[k] > limit:
+                run = None
+            else:
+                if run is None:
+                    run = max(times[k], t)
+                if k < last and times[k + 1] - run >= duration:
+                    return run, True
+        return run, False
+
+    def earliest_fit(self, t, duration, q):
+        """Earliest start >= t with usage + q <= cap throughout [start, start+duration)."""
+        limit = self.cap - q
+        b, k = self._locate(t)
+        run, found = self._scan(b, k, t, None, duration, limit)
+        if found:
+            return run
+        heads, summaries = self.heads, self.summaries
+        for b in range(b + 1, len(heads)):
+            head = heads[b]
+            if run is not None and head - run >= duration:
+                return run
+            lead_ok, lead_end, best, tail = summaries[b].get(limit) or self._summary(b, limit)
+            if lead_end is None:  # the whole block fits
+                if run is None:
+                    run = head
+                continue
+            if run is None and lead_ok:
+                run = head
+            if run is not None and lead_end - run >= duration:
+                return run
+            if best >= duration:
+                run, found = self._scan(b, 0, head, run, duration, limit)
+                if found:
+                    return run
+                continue
+            run = tail
+        return run  # the open-ended empty segment at the end
+
+    def _split(self, t):
+        b, k = self._locate(t)
+        times = self.times[b]
+        if times[k] != t:
+            times.insert(k + 1, t)
+            self.usage[b].insert(k + 1, self.usage[b][k])
+            self.summaries[b] = {}
+            if len(times) > 2 * self.BLOCK:
+                half = len(times) // 2
+                for blocks in (self.times, self.usage):
+                    block = blocks[b]
+                    blocks[b:b + 1] = [block[:half], block[half:]]
+                self.heads.insert(b + 1, self.times[b + 1][0])
+                self.summaries[b:b + 1] = [{}, {}]
+
+    def _merge(self, t):
+        """Drop the segment starting at t if it repeats the usage before it."""
+        b, k = self._locate(t)
+        if k > 0:
+            before = self.usage[b][k - 1]
+        elif b > 0:
+            before = self.usage[b - 1][-1]
+        else:
+            return
+        if self.times[b][k] != t or self.usage[b][k] != before:
+            return
+        del self.times[b][k], self.usage[b][k]
+        self.summaries[b] = {}
+        if not self.times[b]:
+            del self.times[b], self.usage[b], self.heads[b], self.summaries[b]
+        elif k == 0:
+            self.heads[b] = self.times[b][0]
+
+    def add(self, start, end, q):
+        if end <= start:
+            return
+        self._split(start)
+        self._split(end)
+        b, k = self._locate(start)
+        while True:
+            times, usage = self.times[b], self.usage[b]
+            while k < len(times) and times[k] < end:
+                usage[k] += q
+                k += 1
+            self.summaries[b] = {}
+            if k < len(times):
+                break
+            b, k = b + 1, 0
+        # Merge equal neighbours at both edges to keep the profile short
+        self._merge(end)
+        self._merge(start)
+
+
+def _indexed(tasks, predecessors, durations, demands):
+    """(ids, preds, succs, order, durations, needs) over integer task indices.
+
+    A Project hands over its CSR arrays, topological order and role-hour
+    columns as they are; other inputs are indexed once. needs[i] is the
+    sorted ((role, units), ...) tuple of task i.
+    """
+    if hasattr(tasks, "pred_ptr"):
+        ids = tasks.ids
+        n = len(ids)
+        pp, pi = tasks.pred_ptr.tolist(), tasks.pred_idx.tolist()
+        sp, si = tasks.succ_ptr.tolist(), tasks.succ_idx.tolist()
+        preds = [pi[pp[i]:pp[i + 1]] for i in range(n)]
+        succs = [si[sp[i]:sp[i + 1]] for i in range(n)]
+        order = tasks.order.tolist()
+        d = tasks.duration_array(durations).tolist()
+        if demands is None:
+            needs = [tuple(sorted((r, 1) for r, h in zip(ROLES, row) if h > 0))
+                     for row in tasks.role_hours.tolist()]
+            return ids, preds, succs, order, d, needs
+    else:
+        ids = list(tasks)
+        index = {t: i for i, t in enumerate(ids)}
+        preds = [[index[p] for p in predecessors.get(t, []) if p in index] for t in ids]
+        succs = [[] for _ in ids]
+        for i, ps in enumerate(preds):
+            for p in ps:
+                succs[p].append(i)
+        order = [index[t] for t in topological_order(ids, predecessors)]
+        d = [float(durations[t]) for t in ids]
+    demands = demands or {}
+    needs = [tuple(sorted(demands.get(t, {}).items())) for t in ids]
+    return ids, preds, succs, order, d, needs
+
+
+def solve_sgs(tasks, predecessors, durations, demands, capacities, scheme="serial"):
+    """Heuristic resource-feasible schedule via a schedule generation scheme.
+
+    Tasks are prioritised by CPM latest finish time (ties by earliest start).
+    The serial scheme places one task at a time at its earliest
+    precedence- and resource-feasible start; the parallel scheme advances a
+    clock over finish events and starts every eligible task that fits.
+    Both run over integer task indices (a Project's CSR arrays as they are).
+    """
+    if scheme not in ("serial", "parallel"):
+        raise ValueError(f"Unknown SGS scheme: {scheme}")
+    ids, preds, succs, order, d, needs = _indexed(tasks, predecessors, durations, demands)
+    for i, need in enumerate(needs):
+        for r, q in need:
+            if q > capacities.get(r, 0):
+                raise ValueError(f"Task {ids[i]} needs {q} x {r} but capacity is {capacities.get(r, 0)}")
+    # A zero-duration task holds no staff, so it starts as soon as its predecessors finish
+    needs = [need if di > 0 else () for need, di in zip(needs, d)]
+    n = len(ids)
+    es, _, ls, _ = cpm_passes(order, preds, d)
+    rank = [None] * n
+    for pos, i in enumerate(order):
+        rank[i] = (ls[i] + d[i], es[i], pos)
+    waiting = [len(ps) for ps in preds]
+
+    def released(i):
+        for s in succs[i]:
+            waiting[s] -= 1
+            if waiting[s] == 0:
+                yield rank[s], s
+
+    start = [0.0] * n
+    finish = [0.0] * n
+
+    if scheme == "serial":
+        profiles = {r: _Profile(cap) for r, cap in capacities.items()}
+        eligible = [(rank[i], i) for i in range(n) if waiting[i] == 0]
+        heapq.heapify(eligible)
+        while eligible:
+            _, i = heapq.heappop(eligible)
+            di = d[i]
+            s = max((finish[p] for p in preds[i]), default=0.0)
+            need = needs[i]
+            # Cycle through the roles until all of them in a row accept the same start
+            agreed = k = 0
+            while agreed < len(need):
+                r, q = need[k % len(need)]
+                moved = profiles[r].earliest_fit(s, di, q)
+                agreed = agreed + 1 if moved == s else 1
+                s = moved
+                k += 1
+            for r, q in need:
+                profiles[r].add(s, s + di, q)
+            start[i], finish[i] = s, s + di
+            for item in released(i):
+                heapq.heappush(eligible, item)
+    else:
+        # Eligible tasks are bucketed by their exact role demand. At each
+        # decision time the best task across buckets is started if it fits;
+        # a bucket whose best task does not fit is skipped until the next
+        # finish event, since none of its other tasks can fit either.
+        free = dict(capacities)
+        buckets = {}
+
+        def make_ready(items):
+            for key, i in items:
+                heapq.heappush(buckets.setdefault(needs[i], []), (key, i))
+
+        make_ready((rank[i], i) for i in range(n) if waiting[i] == 0)
+        running = []  # heap of (finish, task index)
+        now = 0.0
+        while True:
+            # free only shrinks until the next event, so skip buckets that cannot fit now
+            heads = [(bucket[0], sig) for sig, bucket in buckets.items()
+                     if bucket and all(free[r] >= q for r, q in sig)]
+            heapq.heapify(heads)
+            while heads:
+                (_, i), sig = heapq.heappop(heads)
+                if all(free[r] >= q for r, q in sig):
+                    for r, q in sig:
+                        free[r] -= q
+                    start[i], finish[i] = now, now + d[i]
+                    heapq.heappush(running, (finish[i], i))
+                    bucket = buckets[sig]
+                    heapq.heappop(bucket)
+                    if bucket:
+                        heapq.heappush(heads, (bucket[0], sig))
+            if not running:
+                break
+            # Advance to the next finish event and release everything ending then
+            now = running[0][0]
+            while running and running[0][0] <= now:
+                _, i = heapq.heappop(running)
+                for r, q in needs[i]:
+                    free[r] += q
+                make_ready(released(i))
+
+    return {
+        "status": "Heuristic",
+        "T_max": max(finish, default=0.0),
+        "start_times": dict(zip(ids, start)),
+        "completion_times": dict(zip(ids, finish)),
+    }
+
+
+def _default_time_step(durations):
+    """Largest slot length that keeps whole-hour durations exact (their GCD)."""
+    step = 0
+    for d in durations.values():
+        if abs(d - round(d)) > 1e-9:
+            return 1.0
+        step = math.gcd(step, int(round(d)))
+    return float(step or 1)
+
+
+def solve_time_indexed(tasks, predecessors, durations, demands, capacities,
+                       time_step=None, time_limit=20, solver=None, metrics=None,
+                       max_binaries=None):
+    """Exact RCPSP as a time-indexed MILP (x[t, k] = 1 if t starts at slot k).
+
+    Durations are rounded up to whole `time_step` slots; by default the slot
+    is the GCD of the durations, so the model stays exact while the number of
+    slots (and binaries) shrinks by that factor. The horizon is the
+    best SGS makespan and each task's window starts at its CPM earliest
+    start, which keeps the number of binaries down; this is still meant for
+    small projects (see MILP_TASK_LIMIT). If `time_limit` seconds pass before
+    optimality is proven, the best schedule found is returned as "Feasible"
+    (or the SGS schedule, as "Heuristic", if that is still better). With
+    `max_binaries`, a model needing more start-slot binaries than that is not
+    built and the SGS schedule is returned as "Heuristic". Phase times and
+    model size go into `metrics` (a SolveMetrics) when given.
+    """
+    import pulp
+
+    metrics = metrics or SolveMetrics(method="milp")
+    demands = _project_demands(tasks, demands)
+    tasks, predecessors, durations = unpack_inputs(tasks, predecessors, durations)
+    _check_capacities(demands, capacities)
+    if time_step is None:
+        time_step = _default_time_step(durations)
+    slots = {t: int(math.ceil(durations[t] / time_step - 1e-9)) for t in tasks}
+    slot_durations = {t: slots[t] * time_step for t in tasks}
+    with metrics.phase("heuristic"):
+        heuristic = min(
+            (solve_sgs(tasks, predecessors, slot_durations, demands, capacities, scheme)
+             for scheme in ("serial", "parallel")),
+            key=lambda sol: sol["T_max"],
+        )
+        horizon = int(round(heuristic["T_max"] / time_step))
+        cpm = solve_cpm(tasks, predecessors, slot_durations)
+    earliest = {t: int(round(cpm["start_times"][t] / time_step)) for t in tasks}
+    # Latest start that still lets every successor chain finish by the horizon
+    tail = {t: int(round((cpm["T_max"] - cpm["latest_start_times"][t]) / time_step)) for t in tasks}
+    binaries = sum(max(0, horizon - tail[t] - earliest[t] + 1) for t in tasks)
+    if max_binaries is not None and binaries > max_binaries:
+        metrics.count(binaries=binaries, time_step=time_step, horizon=horizon)
+        return dict(heuristic, status="Heuristic")
+
+    with metrics.phase("build"):
+        model, x, windows = _time_indexed_model(tasks, predecessors, demands, capacities,
+                                                slots, earliest, tail, horizon)
+    metrics.count(variables=model.numVariables(), constraints=model.numConstraints(),
+                  time_step=time_step, horizon=horizon)
+
+    with metrics.phase("solver"):
+        model.solve(solver or default_milp_solver(time_limit))
+    with metrics.phase("extract"):
+        status = pulp.LpStatus[model.status]
+        if status != "Optimal" or model.sol_status != pulp.LpSolutionOptimal:
+            # Time limit hit (or no solution): fall back to the better incumbent
+            if model.sol_status not in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible) \
+                    or pulp.value(model.objective) * time_step >= heuristic["T_max"]:
+                return dict(heuristic, status="Heuristic")
+            status = "Feasible"
+        starts = {t: sum(k for k in windows[t] if x[t, k].varValue > 0.5) * time_step for t in tasks}
+        return {
+            "status": status,
+            "T_max": pulp.value(model.objective) * time_step,
+            "start_times": starts,
+            "completion_times": {t: starts[t] + slot_durations[t] for t in tasks},
+        }
+
+
+def _time_indexed_model(tasks, predecessors, demands, capacities, slots, earliest, tail, horizon):
+    """PuLP model for solve_time_indexed; returns (model, x, windows)."""
+    import pulp
+
+    model = pulp.LpProblem("RCPSP_TimeIndexed", pulp.LpMinimize)
+    windows = {t: range(earliest[t], horizon - tail[t] + 1) for t in tasks}
+    x = {
+        (t, k): pulp.LpVariable(f"x_{t}_{k}", cat=pulp.LpBinary)
+        for t in tasks for k in windows[t]
+    }
+    S = {t: pulp.lpSum(k * x[t, k] for k in windows[t]) for t in tasks}
+    T_max = pulp.LpVariable("T_max", lowBound=0)
+    model += T_max, "MinimizeProjectFinish"
+
+    known = set(tasks)
+    for t in tasks:
+        model += pulp.lpSum(x[t, k] for k in windows[t]) == 1, f"Start_{t}"
+        model += S[t] + slots[t] <= T_max, f"Bound_{t}"
+        for p in predecessors.get(t, []):
+            if p not in known:
+                continue
+            # Disaggregated precedence (much tighter LP relaxation than
+            # S[t] >= S[p] + d[p]): t can only have started by slot k if p
+            # had started by slot k - d[p].
+            for k in windows[t]:
+                model += (
+                    pulp.lpSum(x[t, j] for j in windows[t] if j <= k)
+                    <= pulp.lpSum(x[p, j] for j in windows[p] if j <= k - slots[p])
+                ), f"Pred_{p}_to_{t}_{k}"
+
+    for r, cap in capacities.items():
+        users = [t for t in tasks if demands.get(t, {}).get(r, 0) > 0 and slots[t] > 0]
+        # Energy bound: a role cannot do more than `cap` units of work per slot
+        energy = sum(demands[t][r] * slots[t] for t in users)
+        if energy:
+            model += T_max >= math.ceil(energy / cap - 1e-9), f"Energy_{r}"
+        for tau in range(horizon):
+            # Task t occupies slot tau if it started in (tau - d, tau]
+            load = [
+                demands[t][r] * x[t, k]
+                for t in users
+                for k in range(max(tau - slots[t] + 1, earliest[t]), tau + 1)
+                if (t, k) in x
+            ]
+            if load:
+                model += pulp.lpSum(load) <= cap, f"Cap_{r}_{tau}"
+    return model, x, windows
+
+
+def solve_rcpsp(tasks, predecessors, durations, demands, capacities, method="auto"):
+    """Dispatch to the exact MILP ("milp") or a heuristic ("sgs"/"parallel-sgs").
+
+    "auto" uses the MILP up to MILP_TASK_LIMIT tasks and MILP_BINARY_LIMIT
+    start-slot binaries, and the best SGS schedule otherwise (parallel SGS
+    alone above the task limit).
+    With a Project as `tasks`, `demands=None` uses its role-hour columns.
+    The result carries "metrics" (see scheduling.metrics).
+    """
+    max_binaries = None
+    if method == "auto":
+        method = "milp" if len(tasks) <= MILP_TASK_LIMIT else "parallel-sgs"
+        max_binaries = MILP_BINARY_LIMIT
+    metrics = SolveMetrics(method=method)
+    if method == "milp":
+        result = solve_time_indexed(tasks, predecessors, durations, demands, capacities,
+                                    metrics=metrics, max_binaries=max_binaries)
+    elif method in ("sgs", "parallel-sgs"):
+        with metrics.phase("solver"):
+            result = solve_sgs(tasks, predecessors, durations, demands, capacities,
+                               scheme="serial" if method == "sgs" else "parallel")
+    else:
+        raise ValueError(f"Unknown RCPSP method: {method}")
+    metrics.count(tasks=len(tasks))
+    result["metrics"] = metrics.as_dict()
+    return result
@@ -0,0 +1,84 @@
+"""Sparse (CSR) construction of the precedence LP.
+
+The task graph is interned to integer indices and stored as CSR adjacency
+arrays: the predecessors of task i are pred_idx[pred_ptr[i]:pred_ptr[i + 1]].
+The LP constraint matrix is assembled from those arrays with NumPy in one
+shot instead of one PuLP expression per constraint.
+
+With C = S + d substituted, the variables are x = [S_0 .. S_{n-1}, T_max]
+and every row has exactly two non-zeros:
+
+    S[p] - S[t]     <= -d[p]   for each edge p -> t
+    S[t] - T_max    <= -d[t]   for each task t
+
+so the matrix depends only on the graph, and durations only enter through
+the right-hand side b = -d[rhs_task].
+"""
+
+import numpy as np
+
+
+def adjacency_arrays(tasks, predecessors):
+    """Intern task IDs and return (index, pred_ptr, pred_idx).
+
+    Predecessors that are not in `tasks` are dropped, as in the solvers. A
+    Project already stores these arrays and is returned as-is.
+    """
+    if hasattr(tasks, "pred_ptr"):
+        return tasks.index, tasks.pred_ptr, tasks.pred_idx
+    index = {t: i for i, t in enumerate(tasks)}
+    counts = np.zeros(len(index) + 1, dtype=np.int64)
+    flat = []
+    for i, t in enumerate(tasks):
+        preds = [index[p] for p in predecessors.get(t, []) if p in index]
+        counts[i + 1] = len(preds)
+        flat.extend(preds)
+    pred_ptr = np.cumsum(counts)
+    pred_idx = np.asarray(flat, dtype=np.int64)
+    return index, pred_ptr, pred_idx
+
+
+def precedence_matrix(n_tasks, pred_ptr, pred_idx):
+    """CSR constraint matrix (A_ub) and per-row duration index for b_ub."""
+    from scipy.sparse import csr_matrix
+
+    n_edges = len(pred_idx)
+    dst = np.repeat(np.arange(n_tasks, dtype=np.int64), np.diff(pred_ptr))
+    task = np.arange(n_tasks, dtype=np.int64)
+
+    # Column pairs per row: (+1 column, -1 column)
+    plus = np.concatenate([pred_idx, task])
+    minus = np.concatenate([dst, np.full(n_tasks, n_tasks, dtype=np.int64)])
+    n_rows = n_edges + n_tasks
+    indices = np.empty(2 * n_rows, dtype=np.int64)
+    data = np.empty(2 * n_rows)
+    # Keep column indices sorted within each row
+    first_plus = plus < minus
+    indices[0::2] = np.where(first_plus, plus, minus)
+    indices[1::2] = np.where(first_plus, minus, plus)
+    data[0::2] = np.where(first_plus, 1.0, -1.0)
+    data[1::2] = -data[0::2]
+    indptr = np.arange(0, 2 * n_rows + 1, 2, dtype=np.int64)
+
+    A = csr_matrix((data, indices, indptr), shape=(n_rows, n_tasks + 1))
+    rhs_task = np.concatenate([pred_idx, task])
+    return A, rhs_task
+
+
+def solve_precedence_lp(A, rhs_task, durations):
+    """Solve min T_max over the CSR model with in-process HiGHS.
+
+    `durations` is an array in task-index order. Returns (status, T_max,
+    starts, completions) with NumPy arrays indexed like the tasks.
+    """
+    from scipy.optimize import linprog
+
+    n = A.shape[1] - 1
+    c = np.zeros(n + 1)
+    c[n] = 1.0
+    res = linprog(c, A_ub=A, b_ub=-durations[rhs_task], bounds=(0, None), method="highs")
+    status = {0: "Optimal", 2: "Infeasible", 3: "Unbounded"}.get(res.status, "Not Solved")
+    if res.x is None:
+        return status, None, None, None
+    starts = res.x[:n]
+    return status, float(res.x[n]), starts, starts + durations
@@ -0,0 +1,116 @@
+"""Seeded synthetic task graphs for benchmarks.
+
+Every generator returns a Project with best/expected/worst durations and
+role hours drawn from the same seed, so a (shape, n_tasks, seed) triple
+always gives the same plan:
+
+* "layered": tasks in layers of about sqrt(n); each task depends on 1-3
+  tasks of the previous layer (typical phase-by-phase plans);
+* "random": each task depends on up to 2 * avg_preds uniformly chosen
+  earlier tasks (long, irregular chains);
+* "series-parallel": nested fork/join blocks, where each block is either a
+  chain of two sub-blocks or a fork task, 2-4 parallel sub-blocks and a
+  join task.
+"""
+
+import numpy as np
+
+from .project import Project
+from .resources import ROLES
+
+
+def _project(n, src, dst, rng):
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    perm = np.lexsort((src, dst))
+    pred_ptr = np.concatenate([[0], np.cumsum(np.bincount(dst, minlength=n))])
+
+    expected = rng.integers(2, 25, n).astype(float)
+    durations = {
+        "best": np.maximum(1.0, np.floor(expected * rng.uniform(0.4, 0.9, n))),
+        "expected": expected,
+        "worst": np.ceil(expected * rng.uniform(1.2, 2.0, n)),
+    }
+    # each task needs one or two roles
+    role_hours = np.zeros((n, len(ROLES)))
+    role_hours[np.arange(n), rng.integers(0, len(ROLES), n)] = expected
+    extra = rng.random(n) < 0.3
+    role_hours[np.flatnonzero(extra), rng.integers(0, len(ROLES), extra.sum())] += 2
+    ids = [f"T{i}" for i in range(n)]
+    return Project(ids, durations, role_hours, pred_ptr, src[perm])
+
+
+def layered_dag(n, seed=0, width=None, max_preds=3):
+    rng = np.random.default_rng(seed)
+    width = width or max(1, int(round(np.sqrt(n))))
+    # every layer but the last is full, so task t's previous layer starts at
+    # (t // width - 1) * width
+    tasks = np.arange(width, n, dtype=np.int64)
+    dst = np.repeat(tasks, rng.integers(1, max_preds + 1, len(tasks)))
+    src = (dst // width - 1) * width + rng.integers(0, width, len(dst))
+    edges = np.unique(dst * n + src)  # drop repeated picks
+    return _project(n, edges % n, edges // n, rng)
+
+
+def random_dag(n, seed=0, avg_preds=2):
+    rng = np.random.default_rng(seed)
+    counts = np.minimum(rng.integers(0, 2 * avg_preds + 1, n), np.arange(n))
+    dst = np.repeat(np.arange(n, dtype=np.int64), counts)
+    src = np.floor(rng.random(len(dst)) * dst).astype(np.int64)
+    edges = np.unique(dst * n + src)  # drop repeated picks
+    return _project(n, edges % n, edges // n, rng)
+
+
+def series_parallel_dag(n, seed=0, p_series=0.5):
+    rng = np.random.default_rng(seed)
+    src, dst = [], []
+    next_id = [0]
+
+    def new_task():
+        next_id[0] += 1
+        return next_id[0] - 1
+
+    def block(m):
+        """Build m tasks as one block; returns its (entry, exit) task."""
+        if m <= 2:
+            first = last = new_task()
+            if m == 2:
+                last = new_task()
+                src.append(first)
+                dst.append(last)
+            return first, last
+        if m < 5 or rng.random() < p_series:
+            a = max(1, int(rng.integers(m // 4, 3 * m // 4 + 1)))
+            entry, mid = block(a)
+            mid2, exit_ = block(m - a)
+            src.append(mid)
+            dst.append(mid2)
+            return entry, exit_
+        fork, join = new_task(), new_task()
+        k = int(min(rng.integers(2, 5), m - 2))
+        sizes = np.full(k, (m - 2) // k)
+        sizes[: (m - 2) % k] += 1
+        for size in sizes.tolist():
+            entry, exit_ = block(size)
+            src.extend([fork, exit_])
+            dst.extend([entry, join])
+        return fork, join
+
+    block(n)
+    return _project(n, src, dst, rng)
+
+
+GENERATORS = {
+    "layered": layered_dag,
+    "random": random_dag,
+    "series-parallel": series_parallel_dag,
+}
+
+
+def generate(shape, n, seed=0):
+    """Project of `n` tasks with the given shape (see GENERATORS)."""
+    try:
+        generator = GENERATORS[shape]
+    except KeyError:
+        raise ValueError(f"Unknown shape: {shape} (expected one of {sorted(GENERATORS)})")
+    return generator(n, seed)
@@ -0,0 +1,36 @@
+import random
+
+import pytest
+
+from scheduling.resources import ROLES, solve_sgs
+
+
+def random_plan(seed, n=1500):
+    """Random precedence plan with many zero durations and demands equal to the capacity."""
+    rnd = random.Random(seed)
+    tasks = [f"T{i}" for i in range(n)]
+    preds = {t: rnd.sample(tasks[:i], min(i, rnd.randint(0, 3))) for i, t in enumerate(tasks)}
+    durations = {t: rnd.choice([0, 1, 2, 3, 5, 8, 13]) for t in tasks}
+    caps = {r: rnd.randint(1, 4) for r in ROLES}
+    demands = {t: {r: rnd.choice([caps[r], rnd.randint(1, caps[r])]) for r in rnd.sample(ROLES, rnd.randint(0, 3))}
+               for t in tasks}
+    return tasks, preds, durations, demands, caps
+
+
+@pytest.mark.parametrize("scheme", ["serial", "parallel"])
+@pytest.mark.parametrize("seed", range(6))
+def test_sgs_zero_durations_at_full_demand(seed, scheme):
+    tasks, preds, durations, demands, caps = random_plan(seed)
+    sol = solve_sgs(tasks, preds, durations, demands, caps, scheme)
+    start, finish = sol["start_times"], sol["completion_times"]
+    for t in tasks:
+        ready = max((finish[p] for p in preds[t]), default=0.0)
+        assert start[t] >= ready
+        assert finish[t] == start[t] + durations[t]
+        if durations[t] == 0:
+            assert start[t] == ready
+    events = sorted({start[t] for t in tasks})
+    for time in events:
+        for r, cap in caps.items():
+            used = sum(demands[t].get(r, 0) for t in tasks if start[t] <= time < finish[t])
+            assert used <= cap
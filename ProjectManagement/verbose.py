@@ -1,4 +1,10 @@
-import pulp 
+import os
+
+from scheduling import sensitivity_report
+from scheduling.cache import SolutionCache
+from scheduling.cpm import unpack_inputs
+from scheduling.dispatch import check_method, schedule
+from scheduling.metrics import SolveMetrics, log_metrics, profiled
 
 
 all_tasks = [
@@ -61,114 +67,204 @@ durations_worst = {
     "F": 12, "G":  12, "H":  12
 }
 
-def solve_scenario(task_list, pred_map, durations_dict, scenario_label):
-    print("====================================================")
-    print(f"BUILDING LINEAR PROGRAM FOR SCENARIO: {scenario_label}")
-    print("====================================================\n")
-    
-    lp_problem = pulp.LpProblem(f"Project_{scenario_label}", pulp.LpMinimize)
-    
-    S = {} 
-    C = {}  
-    
-    for task_id in task_list:
-        S[task_id] = pulp.LpVariable(
-            f"S_{task_id}",  
-            lowBound=0,      
-            cat=pulp.LpContinuous 
-        )
-        
-        C[task_id] = pulp.LpVariable(
-            f"C_{task_id}",
-            lowBound=0,
-            cat=pulp.LpContinuous
-        )
-    
-    T_max = pulp.LpVariable("T_max", lowBound=0, cat=pulp.LpContinuous)
-
-    lp_problem += T_max, "Minimize_Overall_Project_Time"
-    
-    for task_id in task_list:
-        task_duration = durations_dict[task_id] 
-        lp_problem += (
-            C[task_id] == S[task_id] + task_duration,
-            f"CompletionDef_{task_id}"
-        )
+def solve_scenario(task_list, pred_map, durations_dict, scenario_label, method="auto",
+                   demands=None, capacities=None, cache=None, verbose=True, show_tasks=True,
+                   metrics_log=None, profile_cpu=False, profile_memory=False):
+    # Without resource limits the LP optimum is the critical path, so "auto"
+    # uses the in-process CPM passes. "cbc" and "highs" solve the LP with that
+    # backend; "lp" picks in-process HiGHS when scipy is installed, else CBC.
+    # With role `capacities` (and per-task `demands`) "auto" switches to the
+    # resource-constrained solvers: "milp" (exact) or "sgs"/"parallel-sgs".
+    # An optional SolutionCache skips the solve when the inputs are unchanged.
+    #
+    # The returned dict has "metrics": phase times (solve, with the backend's
+    # build/update/solver/extract as "solve.*", sensitivity, report) and model
+    # counters. verbose=False prints nothing and show_tasks=False skips the
+    # per-task lines, which dominate on large plans. metrics_log appends the
+    # metrics to a JSON lines file; profile_cpu/profile_memory turn on
+    # cProfile/tracemalloc for the whole call.
+    constrained = capacities is not None
+    check_method(method, capacities)
+    use_lp = method in ("lp", "cbc", "highs")
 
-        lp_problem += (
-            C[task_id] <= T_max,
-            f"UpperBound_{task_id}"
-        )
-        
-        
-        if task_id in pred_map:
-            for p in pred_map[task_id]:
-                lp_problem += (
-                    S[task_id] >= C[p],
-                    f"Pred_{p}_to_{task_id}"
+    metrics = SolveMetrics(scenario=scenario_label, method=method)
+    with profiled(metrics, cpu=profile_cpu, memory=profile_memory):
+        if verbose:
+            print("====================================================")
+            if constrained:
+                print(f"RESOURCE-CONSTRAINED SCHEDULE FOR SCENARIO: {scenario_label}")
+            elif use_lp:
+                print(f"BUILDING LINEAR PROGRAM FOR SCENARIO: {scenario_label}")
+            else:
+                print(f"CRITICAL PATH (CPM) FOR SCENARIO: {scenario_label}")
+            print("====================================================\n")
+
+        with metrics.phase("solve"):
+            solution = schedule(task_list, pred_map, durations_dict, method, demands, capacities,
+                                cache=cache, label=scenario_label)
+        metrics.count(cached=bool(solution.get("cached")))
+        if not solution.get("cached"):
+            metrics.add(solution.get("metrics", {}), prefix="solve.")
+        # A Project solves on its arrays; the report below works on plain mappings
+        task_list, pred_map, durations_dict = unpack_inputs(task_list, pred_map, durations_dict)
+
+        report = None
+        if not constrained:
+            # Floats and duration ranges come from one CPM pass, not N+1 re-solves.
+            # (CPM floats assume unlimited staff, so they are skipped when constrained.)
+            with metrics.phase("sensitivity"):
+                report = sensitivity_report(
+                    task_list, pred_map, durations_dict,
+                    solution=None if use_lp else solution
                 )
 
-    solver = pulp.PULP_CBC_CMD(msg=False)  
-    lp_problem.solve(solver)
-    
-    solve_status = pulp.LpStatus[lp_problem.status]
-    objective_value = pulp.value(lp_problem.objective) 
-    solution_start_times = {}
-    solution_completion_times = {}
-    
-    for task_id in task_list:
-        solution_start_times[task_id] = pulp.value(S[task_id])
-        solution_completion_times[task_id] = pulp.value(C[task_id])
+        if verbose:
+            with metrics.phase("report"):
+                print_solution(scenario_label, solution, durations_dict, show_tasks)
+                if report is not None:
+                    print_sensitivity(report, show_tasks)
+
+    results = {
+        "status": solution["status"],
+        "T_max": solution["T_max"],
+        "start_times": solution["start_times"],
+        "completion_times": solution["completion_times"],
+        "metrics": metrics.as_dict(),
+    }
+    if report is not None:
+        results["sensitivity"] = report
+    if metrics_log:
+        log_metrics(metrics_log, results["metrics"])
+    return results
+
+
+def print_solution(scenario_label, solution, durations_dict, show_tasks=True):
     print(f"Scenario: {scenario_label}")
-    print(f"Solver Status: {solve_status}")
-    print(f"Minimum Project Finish Time (T_max) = {objective_value:.2f} hours\n")
+    print(f"Solver Status: {solution['status']}")
+    print(f"Minimum Project Finish Time (T_max) = {solution['T_max']:.2f} hours")
+    if solution.get("cached"):
+        print("Solution reused from cache")
+    elif "backend" in solution:
+        print(
+            f"Backend: {solution['backend']}  Build Time={solution['build_time'] * 1000:.2f} ms  "
+            f"Solve Time={solution['solve_time'] * 1000:.2f} ms"
+        )
+    print("")
+    if not show_tasks:
+        return
     print("Detailed Task Schedule:")
-    for t_id in sorted(task_list):
-        s_val = solution_start_times[t_id]
-        c_val = solution_completion_times[t_id]
+    for t_id in sorted(solution["start_times"]):
+        s_val = solution["start_times"][t_id]
+        c_val = solution["completion_times"][t_id]
         dur_used = durations_dict[t_id]
         print(
             f"  Task {t_id}: Duration={dur_used}  "
             f"Start={s_val:.2f},  Completion={c_val:.2f}"
         )
     print("")
-    return {
-        "status": solve_status,
-        "T_max": objective_value,
-        "start_times": solution_start_times,
-        "completion_times": solution_completion_times
-    }
 
 
+def print_sensitivity(report, show_tasks=True):
+    if not show_tasks:
+        critical = sum(1 for row in report.values() if row["critical"])
+        print(f"Critical Tasks: {critical} of {len(report)}")
+        print("")
+        return
+    print("Sensitivity Report (duration range keeps T_max unchanged):")
+    for t_id in sorted(report):
+        row = report[t_id]
+        print(
+            f"  Task {t_id}: TotalFloat={row['total_float']:.2f}  "
+            f"FreeFloat={row['free_float']:.2f}  "
+            f"Critical={'Yes' if row['critical'] else 'No'}  "
+            f"Range=[{row['min_duration']:.2f}, {row['max_duration']:.2f}]"
+        )
+    print("")
+
 
-best_results = solve_scenario(all_tasks, predecessors_map, durations_best, "BestCase")
-expected_results = solve_scenario(all_tasks, predecessors_map, durations_expected, "ExpectedCase")
-worst_results = solve_scenario(all_tasks, predecessors_map, durations_worst, "WorstCase")
+def print_simulation(sim):
+    print("====================================================")
+    print(f"MONTE CARLO PERT SIMULATION ({sim['distribution']}, {sim['n_samples']} samples)")
+    print("====================================================\n")
+    print(f"Mean Project Finish Time = {sim['mean']:.2f} hours (std {sim['std']:.2f})")
+    for p, value in sim["percentiles"].items():
+        print(f"  P{p}: {value:.2f}")
+    if sim["p_on_time"] is not None:
+        print(f"P(finish <= {sim['deadline']:.2f}) = {sim['p_on_time']:.3f}")
+    print("Criticality Index (share of samples on the critical path):")
+    for t_id in sorted(sim["criticality"]):
+        print(f"  Task {t_id}: {sim['criticality'][t_id]:.3f}")
+    print("")
 
 
 ###############################################################################
 # STEP 4 (OPTIONAL): FURTHER SENSITIVITY ANALYSIS
 ###############################################################################
 
-# If you want to explore how small changes to any one task's duration might
-# alter the schedule or critical path, you can:
-#
-# 1) Copy one of the durations dicts. For example, let's tweak the best case
-#    to see what happens if "D4" (Coding) is 20 hours instead of 16.
+# Every scenario above already prints a one-pass Sensitivity Report: total and
+# free float per task, critical-path membership, and the duration range over
+# which that task alone can move without changing T_max.
 #
-#    Example:
-#       alt_best_durations = durations_best.copy()
-#       alt_best_durations["D4"] = 20
+# To explore larger what-if changes to one task's duration, build a
+# ParametricModel once for the task graph and hand it every duration variant.
+# Only the durations (the right-hand side) change between variants, so the
+# default method="cpm" solves them all in one vectorized CPM pass.
+# method="lp" instead builds one LP with the backend that get_backend("lp")
+# picks (in-process HiGHS via scipy when available, else CBC through PuLP)
+# and re-solves it per variant with only the duration constants replaced.
 #
-# 2) Then call solve_scenario() again with alt_best_durations:
-#       alt_results = solve_scenario(all_tasks, predecessors_map, alt_best_durations, "AltBestCase")
-#
-# 3) Compare alt_results["T_max"] with best_results["T_max"] to see if the
-#    minimal finishing time changed significantly. If "D4" was on the critical
-#    path already, you might see a direct increase in T_max. If it wasn't,
-#    T_max might remain the same, indicating concurrency or slack in that task.
-#
-# This is how you can manually exercise sensitivity analysis within the same
-# framework, purely by adjusting the input data for the tasks.
+# Here "D4" (Coding) is swept from 16 to 24 hours on top of the best case.
+# If "D4" is on the critical path, T_max grows hour for hour; if it were not,
+# T_max would stay flat until its slack was used up.
+
+def sensitivity_sweep(base_durations, base_t_max, task="D4", hours_list=range(16, 25, 2)):
+    from scheduling.parametric import ParametricModel  # NumPy; only needed here
+
+    sweep_model = ParametricModel(all_tasks, predecessors_map)
+    variants = list(hours_list)
+    sweep_durations = [dict(base_durations, **{task: hours}) for hours in variants]
+    sweep_results = sweep_model.solve_batch(sweep_durations)
+
+    print("====================================================")
+    print(f"SENSITIVITY SWEEP: {task} duration (BestCase)")
+    print("====================================================\n")
+    for hours, finish in zip(variants, sweep_results["T_max"]):
+        print(f"  {task}={hours}:  T_max={finish:.2f}  (change {finish - base_t_max:+.2f})")
+    print("")
+    return sweep_results
+
+
+def main():
+    from scheduling.montecarlo import simulate_pert  # NumPy; only needed here
+
+    # Set SCHEDULE_CACHE_DIR to keep solutions on disk between runs, and
+    # SCHEDULE_METRICS_LOG to append each scenario's phase timings as JSON lines
+    solution_cache = SolutionCache(path=os.environ.get("SCHEDULE_CACHE_DIR"))
+    metrics_log = os.environ.get("SCHEDULE_METRICS_LOG")
+    best_results = solve_scenario(all_tasks, predecessors_map, durations_best, "BestCase",
+                                  cache=solution_cache, metrics_log=metrics_log)
+    expected_results = solve_scenario(all_tasks, predecessors_map, durations_expected, "ExpectedCase",
+                                      cache=solution_cache, metrics_log=metrics_log)
+    worst_results = solve_scenario(all_tasks, predecessors_map, durations_worst, "WorstCase",
+                                   cache=solution_cache, metrics_log=metrics_log)
+
+    # Treat each task's best/expected/worst hours as a PERT-beta distribution and
+    # ask how likely the deterministic expected-case finish actually is.
+    simulation_results = simulate_pert(
+        all_tasks, predecessors_map,
+        durations_best, durations_expected, durations_worst,
+        n_samples=100_000, deadline=expected_results["T_max"], seed=460
+    )
+    print_simulation(simulation_results)
+
+    # STEP 4: sweep "D4" on top of the best case (see the notes above)
+    sensitivity_sweep(durations_best, best_results["T_max"])
+    return best_results, expected_results, worst_results
+
+
+# Importing this module only defines the data and functions; the scenarios
+# run when it is executed as a script.
+if __name__ == "__main__":
+    main()
 #
 # End of script.
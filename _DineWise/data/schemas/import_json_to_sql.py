@@ -1,40 +1,135 @@
+"""Load yelp-data.json into the yelp_restaurants table.
+
+Rows go into a staging table in batches (execute_values on Postgres,
+executemany on SQLite) and are then merged into yelp_restaurants with one
+INSERT ... SELECT, all inside a single transaction. The input is read one
+record at a time (a JSON array or a .jsonl checkpoint), so memory stays
+bounded by the batch size. Existing restaurants are
+kept unless --upsert is given. The SQLite backend creates the table from
+yelp_data.sql, so the loader can be tried without a Postgres server:
+
+    python import_json_to_sql.py --file ../yelp-data.json --sqlite yelp.db --upsert
+"""
+
+import argparse
 import json
-import psycopg2
+import os
+import sqlite3
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "py_scripts"))
+from json_stream import iter_batches, iter_records  # noqa: E402
 
 DB_HOST = "localhost"
 DB_NAME = "your_database"
 DB_USER = "your_user"
 DB_PASS = "your_password"
 
-JSON_FILE = "yelp-data.json" 
-
-def main():
-    with open(JSON_FILE, "r", encoding="utf-8") as f:
-        data = json.load(f)  # This should be a list of objects
-    conn = psycopg2.connect(
-        host=DB_HOST,
-        dbname=DB_NAME,
-        user=DB_USER,
-        password=DB_PASS
-    )
-    conn.autocommit = True
-    with conn.cursor() as cur:
-        for entry in data:
-            restaurant_id    = entry["restaurant_id"]
-            company          = entry["company"]
-            yelp_business_id = entry["yelp_business_id"]
-            yelp_data        = json.dumps(entry["yelp_data"])
-            reviews          = json.dumps(entry["reviews"])
-            sql = """
-                INSERT INTO yelp_restaurants
-                  (restaurant_id, company, yelp_business_id, yelp_data, reviews)
-                VALUES (%s, %s, %s, %s, %s)
-                ON CONFLICT (restaurant_id) DO NOTHING;
-            """
-            cur.execute(sql, (restaurant_id, company, yelp_business_id, yelp_data, reviews))
-
-    conn.close()
-    print("Import complete.")
+JSON_FILE = "yelp-data.json"
+SCHEMA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "yelp_data.sql")
+
+COLUMNS = ["restaurant_id", "company", "yelp_business_id", "yelp_data", "reviews"]
+UPDATE_SET = ", ".join(f"{c} = EXCLUDED.{c}" for c in COLUMNS[1:])
+
+
+def entry_rows(data):
+    """(seq, restaurant_id, company, yelp_business_id, yelp_data, reviews) per entry."""
+    for seq, entry in enumerate(data):
+        yield (seq, entry["restaurant_id"], entry["company"], entry["yelp_business_id"],
+               json.dumps(entry["yelp_data"]), json.dumps(entry["reviews"]))
+
+
+def merge_sql(latest, upsert):
+    """Copy the newest staged row per restaurant_id into yelp_restaurants."""
+    conflict = f"DO UPDATE SET {UPDATE_SET}" if upsert else "DO NOTHING"
+    return (f"INSERT INTO yelp_restaurants ({', '.join(COLUMNS)}) {latest} "
+            f"ON CONFLICT (restaurant_id) {conflict}")
+
+
+def import_postgres(data, batch_size=1000, upsert=False):
+    import psycopg2
+    from psycopg2.extras import execute_values
+
+    conn = psycopg2.connect(host=DB_HOST, dbname=DB_NAME, user=DB_USER, password=DB_PASS)
+    staged = 0
+    try:
+        with conn, conn.cursor() as cur:  # one transaction, rolled back on error
+            cur.execute("""
+                CREATE TEMP TABLE yelp_restaurants_staging (
+                    seq BIGINT, restaurant_id INT, company TEXT, yelp_business_id TEXT,
+                    yelp_data JSONB, reviews JSONB
+                ) ON COMMIT DROP
+            """)
+            for batch in iter_batches(entry_rows(data), batch_size):
+                execute_values(cur, "INSERT INTO yelp_restaurants_staging VALUES %s", batch,
+                               template="(%s, %s, %s, %s, %s::jsonb, %s::jsonb)",
+                               page_size=batch_size)
+                staged += len(batch)
+            cur.execute(merge_sql(
+                f"SELECT DISTINCT ON (restaurant_id) {', '.join(COLUMNS)} "
+                f"FROM yelp_restaurants_staging ORDER BY restaurant_id, seq DESC", upsert))
+            merged = cur.rowcount
+    finally:
+        conn.close()
+    return staged, merged
+
+
+def import_sqlite(db_path, data, batch_size=1000, upsert=False, schema_file=SCHEMA_FILE):
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    staged = 0
+    try:
+        with open(schema_file, "r") as f:
+            conn.executescript(f.read())
+        conn.execute("BEGIN")
+        conn.execute("""
+            CREATE TEMP TABLE yelp_restaurants_staging (
+                seq INTEGER, restaurant_id INTEGER, company TEXT, yelp_business_id TEXT,
+                yelp_data TEXT, reviews TEXT
+            )
+        """)
+        for batch in iter_batches(entry_rows(data), batch_size):
+            conn.executemany("INSERT INTO yelp_restaurants_staging VALUES (?, ?, ?, ?, ?, ?)", batch)
+            staged += len(batch)
+        before = conn.total_changes
+        conn.execute(merge_sql(
+            f"SELECT {', '.join(COLUMNS)} FROM yelp_restaurants_staging "
+            f"WHERE seq IN (SELECT MAX(seq) FROM yelp_restaurants_staging GROUP BY restaurant_id)",
+            upsert))
+        merged = conn.total_changes - before
+        conn.execute("DROP TABLE yelp_restaurants_staging")
+        conn.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.close()
+    return staged, merged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load yelp-data.json into yelp_restaurants.")
+    parser.add_argument("--file", default=JSON_FILE)
+    parser.add_argument("--sqlite", metavar="DB", default=None,
+                        help="load into this SQLite file instead of Postgres")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--upsert", action="store_true",
+                        help="update restaurants that are already in the table")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    data = iter_records(args.file)  # a list of objects, or one object per line for .jsonl
+    if args.sqlite:
+        staged, merged = import_sqlite(args.sqlite, data, args.batch_size, args.upsert)
+    else:
+        staged, merged = import_postgres(data, args.batch_size, args.upsert)
+    elapsed = time.perf_counter() - start
+
+    action = "inserted or updated" if args.upsert else "inserted"
+    print(f"Import complete: {staged} rows read, {merged} {action} "
+          f"in {elapsed:.2f}s ({staged / elapsed:.0f} rows/s)")
+
 
 if __name__ == "__main__":
     main()
@@ -3,6 +3,7 @@ package main
 import (
 	"bytes"
 	"encoding/json"
+	"errors"
 	"fmt"
 	"io"
 	"log"
@@ -57,6 +58,30 @@ func getRestaurants(w http.ResponseWriter, r *http.Request) {
 	json.NewEncoder(w).Encode(response)
 }
 
+// yelpStatusError keeps Yelp's status code (and Retry-After) so the handlers
+// can pass rate limiting (429) through to the client instead of a plain 500.
+type yelpStatusError struct {
+	StatusCode int
+	RetryAfter string
+	Body       string
+}
+
+func (e *yelpStatusError) Error() string {
+	return fmt.Sprintf("Yelp GraphQL error %d: %s", e.StatusCode, e.Body)
+}
+
+func writeYelpError(w http.ResponseWriter, message string, err error) {
+	var statusErr *yelpStatusError
+	if errors.As(err, &statusErr) && statusErr.StatusCode == http.StatusTooManyRequests {
+		if statusErr.RetryAfter != "" {
+			w.Header().Set("Retry-After", statusErr.RetryAfter)
+		}
+		http.Error(w, fmt.Sprintf("%s: %v", message, err), http.StatusTooManyRequests)
+		return
+	}
+	http.Error(w, fmt.Sprintf("%s: %v", message, err), http.StatusInternalServerError)
+}
+
 func postYelpGraphQLQuery(query string) (io.ReadCloser, error) {
 	apiKey := os.Getenv("YELP_API_KEY")
 	if apiKey == "" {
@@ -95,7 +120,7 @@ func postYelpGraphQLQuery(query string) (io.ReadCloser, error) {
 		body, _ := io.ReadAll(resp.Body)
 		resp.Body.Close()
 		log.Printf("Yelp API error response: %s\n", string(body))
-		return nil, fmt.Errorf("Yelp GraphQL error %d: %s", resp.StatusCode, string(body))
+		return nil, &yelpStatusError{resp.StatusCode, resp.Header.Get("Retry-After"), string(body)}
 	}
 
 	return resp.Body, nil
@@ -124,6 +149,10 @@ func yelpGraphQLSearchHandler(w http.ResponseWriter, r *http.Request) {
                 phone
                 url
                 photos
+                coordinates {
+                    latitude
+                    longitude
+                }
             }
         }
     }`, escapeString(term), escapeString(location))
@@ -131,7 +160,7 @@ func yelpGraphQLSearchHandler(w http.ResponseWriter, r *http.Request) {
 	body, err := postYelpGraphQLQuery(graphqlQuery)
 	if err != nil {
 		log.Printf("Search handler error: %v\n", err)
-		http.Error(w, fmt.Sprintf("Failed to fetch from Yelp: %v", err), http.StatusInternalServerError)
+		writeYelpError(w, "Failed to fetch from Yelp", err)
 		return
 	}
 	defer body.Close()
@@ -173,7 +202,101 @@ func yelpGraphQLReviewsHandler(w http.ResponseWriter, r *http.Request) {
 	body, err := postYelpGraphQLQuery(graphqlQuery)
 	if err != nil {
 		log.Printf("Reviews handler error: %v\n", err)
-		http.Error(w, fmt.Sprintf("Failed to fetch reviews from Yelp: %v", err), http.StatusInternalServerError)
+		writeYelpError(w, "Failed to fetch reviews from Yelp", err)
+		return
+	}
+	defer body.Close()
+
+	w.Header().Set("Content-Type", "application/json")
+	io.Copy(w, body)
+}
+
+// maxBatchSearches caps one batch request, so a client cannot spend a
+// large slice of the API quota in a single call.
+const maxBatchSearches = 50
+
+// batchSearchFields are the fields of /api/yelp-graphql-search plus the
+// reviews of /api/yelp-graphql-reviews, nested so one alias covers both.
+const batchSearchFields = `{
+            total
+            business {
+                id
+                name
+                rating
+                review_count
+                price
+                phone
+                url
+                photos
+                coordinates {
+                    latitude
+                    longitude
+                }
+                reviews(limit: 3) {
+                    id
+                    rating
+                    text
+                    time_created
+                    user {
+                        name
+                    }
+                }
+            }
+        }`
+
+type batchSearch struct {
+	Term     string `json:"term"`
+	Location string `json:"location"`
+}
+
+// buildBatchQuery aliases one search per entry (r0, r1, ...), with the same
+// location default as yelpGraphQLSearchHandler.
+func buildBatchQuery(searches []batchSearch) string {
+	var query strings.Builder
+	query.WriteString("query {\n")
+	for i, search := range searches {
+		location := search.Location
+		if location == "" {
+			location = "Marlborough, MA"
+		}
+		fmt.Fprintf(&query, "    r%d: search(term: \"%s\", location: \"%s\", limit: 1) %s\n",
+			i, escapeString(search.Term), escapeString(location), batchSearchFields)
+	}
+	query.WriteString("}")
+	return query.String()
+}
+
+// yelpGraphQLBatchHandler takes {"searches": [{"term": ..., "location": ...}]}
+// and runs them as one aliased GraphQL query built here, so clients never
+// send their own queries on the server's API key.
+func yelpGraphQLBatchHandler(w http.ResponseWriter, r *http.Request) {
+	if r.Method != http.MethodPost {
+		http.Error(w, "Use POST with a JSON body {\"searches\": [{\"term\": ..., \"location\": ...}]}",
+			http.StatusMethodNotAllowed)
+		return
+	}
+	var request struct {
+		Searches []batchSearch `json:"searches"`
+	}
+	if err := json.NewDecoder(r.Body).Decode(&request); err != nil || len(request.Searches) == 0 {
+		http.Error(w, "Missing 'searches' in request body", http.StatusBadRequest)
+		return
+	}
+	if len(request.Searches) > maxBatchSearches {
+		http.Error(w, fmt.Sprintf("At most %d searches per request", maxBatchSearches), http.StatusBadRequest)
+		return
+	}
+	for _, search := range request.Searches {
+		if search.Term == "" {
+			http.Error(w, "Every search needs a 'term'", http.StatusBadRequest)
+			return
+		}
+	}
+
+	body, err := postYelpGraphQLQuery(buildBatchQuery(request.Searches))
+	if err != nil {
+		log.Printf("Batch handler error: %v\n", err)
+		writeYelpError(w, "Failed to fetch from Yelp", err)
 		return
 	}
 	defer body.Close()
@@ -201,8 +324,10 @@ func main() {
 	http.HandleFunc("/api/restaurants", getRestaurants)
 	http.HandleFunc("/api/yelp-graphql-search", yelpGraphQLSearchHandler)
 	http.HandleFunc("/api/yelp-graphql-reviews", yelpGraphQLReviewsHandler)
+	http.HandleFunc("/api/yelp-graphql", yelpGraphQLBatchHandler)
 	http.Handle("/data/", http.StripPrefix("/data/", http.FileServer(http.Dir("data"))))
 
 	fmt.Println("Server running on http://localhost:8081/")
-	log.Fatal(http.ListenAndServe(":8081", nil))
+	// localhost only: the proxy spends the server's YELP_API_KEY on every request
+	log.Fatal(http.ListenAndServe("localhost:8081", nil))
 }
@@ -1,41 +1,227 @@
+import argparse
 import json
-import requests
+import os
+import random
+import threading
 import time
-from urllib.parse import quote
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from http_cache import CachedResponse, ResponseCache
+from json_stream import iter_batches, iter_records, open_writer
+from review_index import ReviewIndex
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+def search_params(restaurant):
+    """The term/location of a restaurant's search (the Go proxy fills in a missing location)."""
+    return {
+        'term': restaurant['company'],
+        'location': restaurant['address']
+    }
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` requests per second, bursts of up to `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def retry_after_seconds(response):
+    """Seconds asked for by a Retry-After header (delta or HTTP date), or None."""
+    value = response.headers.get('Retry-After')
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
 
 class YelpDataFetcher:
-    def __init__(self, base_url="http://localhost:8081"):
+    def __init__(self, base_url="http://localhost:8081", workers=4, rate=5.0, burst=5,
+                 max_retries=4, backoff=1.0, timeout=30, session=None, cache=None,
+                 refresh_cache=False, review_index_file=None):
         self.base_url = base_url
         self.restaurants_file = "./data/restaurants-v001.json"
         self.yelp_data_file = "./data/yelp-data.json"
         self.failed_searches_file = "./data/failed_searches.json"
+        self.checkpoint_file = "./data/yelp-data.jsonl"
         self.failed_searches = []
+        self.workers = workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.bucket = TokenBucket(rate, burst)
+        self.cache = cache  # a ResponseCache, or None to always hit the API
+        self.refresh_cache = refresh_cache  # fetch again but store the new responses
+        self.review_index_file = review_index_file  # keep this review search index up to date
+        self.review_index = None
+        self.lock = threading.Lock()
+        if session is None:
+            # keep-alive connections, one per worker
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max(workers, 1))
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+        self.session = session
 
-    def load_restaurants(self):
+    def get(self, url, params):
+        """Rate-limited GET that retries 429/5xx and connection errors.
+
+        Waits Retry-After when the server sends it, else backoff * 2**attempt
+        (with jitter). The last response is returned once retries run out;
+        the last network error is raised. Successful responses are stored in
+        (and, unless refreshing, served from) self.cache.
+        """
+        if self.cache is not None and not self.refresh_cache:
+            cached = self.cache.get(url, params)
+            if cached is not None:
+                return cached
+        response = self._send("GET", url, params=params)
+        if self.cache is not None:
+            self.cache.put(url, params, response)
+        return response
+
+    def _send(self, method, url, **kwargs):
+        for attempt in range(self.max_retries + 1):
+            self.bucket.acquire()
+            try:
+                response = self.session.request(method, url, timeout=self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout):
+                if attempt == self.max_retries:
+                    raise
+                wait = None
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.max_retries:
+                    return response
+                wait = retry_after_seconds(response)
+            if wait is None:
+                wait = self.backoff * 2 ** attempt * random.uniform(0.5, 1.0)
+            time.sleep(wait)
+
+    def record_failure(self, failure):
+        with self.lock:
+            self.failed_searches.append(failure)
+
+    def iter_json_records(self, path):
+        """Stream the records of a JSON array (or .jsonl) file, reporting a missing or bad file."""
         try:
-            with open(self.restaurants_file, 'r') as file:
-                return json.load(file)
+            yield from iter_records(path)
         except FileNotFoundError:
-            print(f"Error: Could not find file: {self.restaurants_file}")
-            return []
-        except json.JSONDecodeError:
-            print(f"Error: Invalid JSON in file: {self.restaurants_file}")
-            return []
+            print(f"Error: Could not find file: {path}")
+        except ValueError:
+            print(f"Error: Invalid JSON in file: {path}")
+
+    def load_restaurants(self):
+        return self.iter_json_records(self.restaurants_file)
+
+    def load_failed_restaurants(self):
+        return (failure['restaurant'] for failure in self.iter_json_records(self.failed_searches_file))
+
+    def read_checkpoint(self):
+        """Records in the JSONL checkpoint; a torn last line (from a crash) is skipped."""
+        if not os.path.exists(self.checkpoint_file):
+            return
+        with open(self.checkpoint_file, 'r') as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+    def repair_checkpoint(self):
+        """Cut the checkpoint back to its last complete line so appends start on a new one.
+
+        A crash mid-write leaves a torn last line; its restaurant is not in
+        stored_ids(), so it is fetched again. Returns the bytes removed.
+        """
+        if not os.path.exists(self.checkpoint_file):
+            return 0
+        with open(self.checkpoint_file, 'rb+') as file:
+            size = end = file.seek(0, os.SEEK_END)
+            while end > 0:
+                start = max(0, end - 65536)
+                file.seek(start)
+                newline = file.read(end - start).rfind(b"\n")
+                if newline >= 0:
+                    end = start + newline + 1
+                    break
+                end = start
+            file.truncate(end)
+        return size - end
+
+    def stored_ids(self):
+        """restaurant_ids already in yelp-data.json or the checkpoint."""
+        ids = {entry['restaurant_id'] for entry in self.read_checkpoint()}
+        if os.path.exists(self.yelp_data_file):
+            ids.update(entry['restaurant_id'] for entry in self.iter_json_records(self.yelp_data_file))
+        return ids
+
+    def merged_entries(self, keep_previous):
+        """Checkpoint records, after the yelp-data.json entries they don't replace."""
+        new_ids = {entry['restaurant_id'] for entry in self.read_checkpoint()}
+        if keep_previous and os.path.exists(self.yelp_data_file):
+            for entry in self.iter_json_records(self.yelp_data_file):
+                if entry['restaurant_id'] not in new_ids:
+                    yield entry
+        seen = set()
+        for entry in self.read_checkpoint():
+            if entry['restaurant_id'] not in seen:
+                seen.add(entry['restaurant_id'])
+                yield entry
+
+    def catch_up_review_index(self):
+        """Index stored entries the review index is missing (e.g. after a crash)."""
+        categories = None
+        for entry in self.merged_entries(keep_previous=True):
+            if entry['restaurant_id'] not in self.review_index.restaurant_docs and entry.get('reviews'):
+                if categories is None:
+                    categories = {r.get('id'): r.get('category')
+                                  for r in self.iter_json_records(self.restaurants_file)}
+                self.review_index.add_entry(entry, categories.get(entry['restaurant_id']))
+
+    def append_checkpoint(self, yelp_entry):
+        with self.lock:
+            self.checkpoint.write(json.dumps(yelp_entry) + "\n")
+            self.checkpoint.flush()
 
     def save_yelp_data(self, yelp_data):
-        with open(self.yelp_data_file, 'w') as file:
-            json.dump(yelp_data, file, indent=4)
+        """Write records one at a time; returns how many were written."""
+        with open_writer(self.yelp_data_file, indent=4) as writer:
+            writer.write_all(yelp_data)
+        return writer.count
 
     def save_failed_searches(self):
         with open(self.failed_searches_file, 'w') as file:
             json.dump(self.failed_searches, file, indent=4)
 
     def fetch_yelp_data(self, restaurant):
-    \
-        params = {
-            'term': restaurant['company'],
-            'location': restaurant['address']
-        }
+        params = search_params(restaurant)
         
         search_url = f"{self.base_url}/api/yelp-graphql-search"
         
@@ -43,11 +229,11 @@ class YelpDataFetcher:
             print(f"\nSearching for: {restaurant['company']}")
             print(f"Using location: {restaurant['address']}")
             
-            response = requests.get(search_url, params=params)
+            response = self.get(search_url, params)
             if not response.ok:
                 print(f"Search request failed: {response.status_code}")
                 print(f"Response: {response.text}")
-                self.failed_searches.append({
+                self.record_failure({
                     'restaurant': restaurant,
                     'error': f'HTTP {response.status_code}',
                     'response': response.text
@@ -58,7 +244,7 @@ class YelpDataFetcher:
             
             if 'errors' in business_data:
                 print(f"Yelp API Error: {json.dumps(business_data['errors'], indent=2)}")
-                self.failed_searches.append({
+                self.record_failure({
                     'restaurant': restaurant,
                     'error': 'Yelp API Error',
                     'details': business_data['errors']
@@ -70,7 +256,7 @@ class YelpDataFetcher:
                 business = business_data['data']['search']['business'][0]
             else:
                 print(f"No business data found for: {restaurant['company']}")
-                self.failed_searches.append({
+                self.record_failure({
                     'restaurant': restaurant,
                     'error': 'No Business Found'
                 })
@@ -81,7 +267,7 @@ class YelpDataFetcher:
                 reviews_url = f"{self.base_url}/api/yelp-graphql-reviews"
                 reviews_params = {'businessId': business['id']}
                 
-                reviews_response = requests.get(reviews_url, params=reviews_params)
+                reviews_response = self.get(reviews_url, reviews_params)
                 if reviews_response.ok:
                     reviews_data = reviews_response.json()
                     if 'data' in reviews_data and 'business' in reviews_data['data']:
@@ -101,7 +287,7 @@ class YelpDataFetcher:
 
         except requests.RequestException as e:
             print(f"Network error for {restaurant['company']}: {str(e)}")
-            self.failed_searches.append({
+            self.record_failure({
                 'restaurant': restaurant,
                 'error': 'Network Error',
                 'details': str(e)
@@ -109,45 +295,232 @@ class YelpDataFetcher:
             return None
         except Exception as e:
             print(f"Unexpected error for {restaurant['company']}: {str(e)}")
-            self.failed_searches.append({
+            self.record_failure({
                 'restaurant': restaurant,
                 'error': 'Unexpected Error',
                 'details': str(e)
             })
             return None
 
-    def process_all_restaurants(self):
-        restaurants = self.load_restaurants()
-        if not restaurants:
-            print("No restaurants to process")
-            return
+    def fetch_yelp_batch(self, restaurants):
+        """Search several restaurants (reviews included) in one GraphQL request.
 
-        yelp_data = []
-        total = len(restaurants)
-        
-        for i, restaurant in enumerate(restaurants, 1):
-            print(f"\nProcessing {i}/{total}: {restaurant['company']}")
-            
-            yelp_entry = self.fetch_yelp_data(restaurant)
+        Returns a yelp_entry or None per restaurant, in order; failures are
+        recorded one per restaurant, as fetch_yelp_data does. Each
+        restaurant's result is cached on its own (keyed like its search), so
+        only the restaurants without a cached result are sent.
+        """
+        url = f"{self.base_url}/api/yelp-graphql"
+        entries = [None] * len(restaurants)
+        todo = []
+        for i, restaurant in enumerate(restaurants):
+            cached = None
+            if self.cache is not None and not self.refresh_cache:
+                cached = self.cache.get(url, search_params(restaurant))
+            if cached is None:
+                todo.append(i)
+            else:
+                entries[i] = self.split_batch_entry(restaurant, 'search', cached.json())
+        if not todo:
+            return entries
+        restaurants = [restaurants[i] for i in todo]
+        print(f"\nSearching for {len(restaurants)} restaurants: "
+              f"{', '.join(r['company'] for r in restaurants)}")
+        try:
+            response = self._send("POST", url, json={'searches': [search_params(r) for r in restaurants]})
+            if not response.ok:
+                print(f"Batch request failed: {response.status_code}")
+                print(f"Response: {response.text}")
+                for restaurant in restaurants:
+                    self.record_failure({
+                        'restaurant': restaurant,
+                        'error': f'HTTP {response.status_code}',
+                        'response': response.text
+                    })
+                return entries
+            payload = response.json()
+        except requests.RequestException as e:
+            print(f"Network error for batch: {str(e)}")
+            error, details = 'Network Error', str(e)
+        except ValueError as e:
+            print(f"Unexpected error for batch: {str(e)}")
+            error, details = 'Unexpected Error', str(e)
+        else:
+            for j, (i, restaurant) in enumerate(zip(todo, restaurants)):
+                entries[i] = self.split_batch_entry(restaurant, f"r{j}", payload)
+                if entries[i] and self.cache is not None:
+                    # stored as the response of a single search, reviews nested
+                    body = json.dumps({'data': {'search': payload['data'][f"r{j}"]}})
+                    self.cache.put(url, search_params(restaurant), CachedResponse(response.status_code, body))
+            return entries
+        for restaurant in restaurants:
+            self.record_failure({'restaurant': restaurant, 'error': error, 'details': details})
+        return entries
+
+    def split_batch_entry(self, restaurant, alias, payload):
+        """The yelp_entry for one alias of a batched response, or None."""
+        errors = [e for e in payload.get('errors') or []
+                  if not e.get('path') or e['path'][0] == alias]
+        result = (payload.get('data') or {}).get(alias) or {}
+        if errors:
+            print(f"Yelp API Error for {restaurant['company']}: {json.dumps(errors, indent=2)}")
+            self.record_failure({
+                'restaurant': restaurant,
+                'error': 'Yelp API Error',
+                'details': errors
+            })
+            return None
+        if not result.get('business'):
+            print(f"No business data found for: {restaurant['company']}")
+            self.record_failure({
+                'restaurant': restaurant,
+                'error': 'No Business Found'
+            })
+            return None
+
+        business = dict(result['business'][0])
+        reviews = business.pop('reviews', None) or []
+        return {
+            'restaurant_id': restaurant.get('id'),
+            'company': restaurant['company'],
+            'yelp_business_id': business.get('id'),
+            'yelp_data': business,
+            'reviews': reviews
+        }
+
+    def process_all_restaurants(self, resume=False, retry_failed=False, batch_size=None):
+        """Fetch every restaurant, appending each result to the JSONL checkpoint.
+
+        resume=True skips restaurant_ids already in yelp-data.json or the
+        checkpoint; retry_failed=True only fetches the restaurants listed in
+        failed_searches.json (and implies resume), skipping cached responses
+        so every retry reaches the API. With batch_size, each request covers
+        that many restaurants (see fetch_yelp_batch).
+        """
+        resume = resume or retry_failed
+        if retry_failed:
+            self.refresh_cache = True
+        if resume and self.repair_checkpoint():
+            print(f"Dropped a partial last record from {self.checkpoint_file}")
+        restaurants = self.load_failed_restaurants() if retry_failed else self.load_restaurants()
+        stored = self.stored_ids() if resume else set()
+        skipped = 0
+
+        def pending():
+            nonlocal skipped
+            for restaurant in restaurants:
+                if restaurant.get('id') in stored:
+                    skipped += 1
+                else:
+                    yield restaurant
+
+        if self.review_index_file:
+            # a fresh run rebuilds yelp-data.json, so it starts a fresh index too
+            self.review_index = ReviewIndex.open(self.review_index_file) if resume else ReviewIndex()
+            if resume:
+                self.catch_up_review_index()
+
+        print(f"Processing restaurants with {self.workers} workers "
+              f"at up to {self.bucket.rate:g} requests/s")
+
+        def finish(restaurant, yelp_entry):
             if yelp_entry:
-                yelp_data.append(yelp_entry)
+                self.append_checkpoint(yelp_entry)
+                if self.review_index is not None:
+                    with self.lock:
+                        self.review_index.add_entry(yelp_entry, restaurant.get('category'))
                 print(f"Successfully processed {restaurant['company']}")
             else:
                 print(f"Failed to process {restaurant['company']}")
-            
-            time.sleep(1)
+            return 1 if yelp_entry else 0
 
-        if yelp_data:
-            self.save_yelp_data(yelp_data)
-            print(f"\nProcessed {len(yelp_data)} restaurants successfully")
-            print(f"Data saved to: {self.yelp_data_file}")
+        def process(restaurant):
+            return 1, finish(restaurant, self.fetch_yelp_data(restaurant))
+
+        def process_batch(batch):
+            entries = self.fetch_yelp_batch(batch)
+            return len(batch), sum(finish(r, entry) for r, entry in zip(batch, entries))
+
+        if batch_size:
+            jobs, work = iter_batches(pending(), batch_size), process_batch
+        else:
+            jobs, work = pending(), process
+
+        start = time.perf_counter()
+        total = succeeded = 0
+        with open(self.checkpoint_file, 'a' if resume else 'w') as self.checkpoint:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                # keep a few jobs per worker in flight and submit the next one as
+                # each finishes, so the input is read as it is processed and a
+                # slow request (or a Retry-After wait) never idles the others
+                in_flight = set()
+                for job in jobs:
+                    if len(in_flight) >= self.workers * 4:
+                        finished, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            done, ok = future.result()
+                            total += done
+                            succeeded += ok
+                    in_flight.add(executor.submit(work, job))
+                for future in wait(in_flight).done:
+                    done, ok = future.result()
+                    total += done
+                    succeeded += ok
+        elapsed = time.perf_counter() - start
+        if skipped:
+            print(f"\nSkipped {skipped} restaurants already stored")
+        if not total:
+            print("No restaurants to process")
+            return
+        print(f"\nFetched {total} restaurants in {elapsed:.1f}s ({total / elapsed:.2f}/s)")
+        if self.cache is not None:
+            stats = self.cache.stats()
+            print(f"Response cache: {stats['hits']} hits, {stats['misses']} misses "
+                  f"({stats['hit_rate']:.0%}), {stats['entries']} entries, {stats['bytes'] / 1024:.0f} KiB")
+
+        if succeeded:
+            saved = self.save_yelp_data(self.merged_entries(keep_previous=resume))
+            print(f"\nProcessed {succeeded} restaurants successfully")
+            print(f"Data saved to: {self.yelp_data_file} ({saved} restaurants in total)")
+            if self.review_index is not None:
+                self.review_index.save(self.review_index_file)
+                print(f"Review index saved to: {self.review_index_file} ({len(self.review_index)} reviews)")
         else:
             print("\nNo data was collected successfully")
-        if self.failed_searches:
+        if retry_failed and not self.failed_searches:
+            self.save_failed_searches()  # clear the list we just retried
+            print(f"\nAll failed searches succeeded; cleared {self.failed_searches_file}")
+        elif self.failed_searches:
             self.save_failed_searches()
             print(f"\nFailed searches: {len(self.failed_searches)}")
             print(f"Failed searches saved to: {self.failed_searches_file}")
 
 if __name__ == "__main__":
-    fetcher = YelpDataFetcher()
-    fetcher.process_all_restaurants()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Fetch Yelp data for every restaurant.")
+    parser.add_argument("--base-url", default="http://localhost:8081")
+    parser.add_argument("--workers", type=int, default=4, help="concurrent requests")
+    parser.add_argument("--rate", type=float, default=5.0, help="requests per second")
+    parser.add_argument("--burst", type=int, default=5, help="requests allowed back to back")
+    parser.add_argument("--max-retries", type=int, default=4)
+    parser.add_argument("--resume", action="store_true",
+                        help="skip restaurants already in yelp-data.json or the .jsonl checkpoint")
+    parser.add_argument("--retry-failed", action="store_true",
+                        help="only re-fetch the restaurants in failed_searches.json")
+    parser.add_argument("--batch-size", type=int, default=0,
+                        help="restaurants per GraphQL request via /api/yelp-graphql (0: one search "
+                             "and one reviews request per restaurant)")
+    parser.add_argument("--cache", default="./data/http-cache.sqlite",
+                        help="SQLite response cache file")
+    parser.add_argument("--no-cache", action="store_true", help="bypass the response cache")
+    parser.add_argument("--refresh-cache", action="store_true",
+                        help="ignore cached responses but store the fresh ones")
+    parser.add_argument("--review-index", default=None, metavar="PATH",
+                        help="add fetched reviews to this full-text index (see review_index.py)")
+    args = parser.parse_args()
+
+    cache = None if args.no_cache else ResponseCache(args.cache)
+    fetcher = YelpDataFetcher(args.base_url, workers=args.workers, rate=args.rate,
+                              burst=args.burst, max_retries=args.max_retries, cache=cache,
+                              refresh_cache=args.refresh_cache, review_index_file=args.review_index)
+    fetcher.process_all_restaurants(resume=args.resume, retry_failed=args.retry_failed,
+                                    batch_size=args.batch_size)
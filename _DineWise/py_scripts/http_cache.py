@@ -0,0 +1,182 @@
+"""SQLite cache for the Yelp proxy's GET responses.
+
+Entries are keyed by endpoint path and parameters, sorted, with whitespace
+collapsed and case folded in the free-text ones (term, location), so
+"110 Grill" and "110  grill" share one entry; ids such as businessId are
+kept exactly, since Yelp's are case-sensitive. Each endpoint has its own TTL; expired rows count as misses. When
+the stored bodies grow past `max_bytes`, the least recently used rows are
+dropped. Only successful (2xx) responses with a result are stored: GraphQL
+errors (which Yelp returns with HTTP 200) and searches that found no
+business are fetched again next time instead of being replayed for the
+whole TTL. A business with no reviews is a result and is cached.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit
+
+DAY = 24 * 60 * 60
+DEFAULT_TTLS = {
+    "/api/yelp-graphql-search": 30 * DAY,
+    "/api/yelp-graphql-reviews": 7 * DAY,
+    "/api/yelp-graphql": 7 * DAY,  # one batched search per entry, reviews nested
+}
+
+
+class CachedResponse:
+    """The parts of requests.Response the fetcher uses."""
+
+    def __init__(self, status_code, text):
+        self.status_code = status_code
+        self.text = text
+        self.ok = 200 <= status_code < 400
+        self.headers = {}
+        self.from_cache = True
+
+    def json(self):
+        return json.loads(self.text)
+
+
+def has_result(body):
+    """True for a GraphQL body without "errors" that found something.
+
+    Each top-level field under "data" (search, business) must be an object,
+    and a search must have found a business; other lists, such as an empty
+    business.reviews, are valid answers.
+    """
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return False
+    if not isinstance(payload, dict) or "errors" in payload:
+        return False
+    data = payload.get("data")
+    if not isinstance(data, dict) or not data:
+        return False
+    if not all(isinstance(field, dict) for field in data.values()):
+        return False
+    search = data.get("search")
+    return search is None or bool(search.get("business"))
+
+
+FREE_TEXT_PARAMS = ("term", "location")
+
+
+def normalize_params(params):
+    return {str(k): " ".join(str(v).split()).casefold() if k in FREE_TEXT_PARAMS else str(v)
+            for k, v in (params or {}).items()}
+
+
+def cache_key(endpoint, params):
+    blob = json.dumps([endpoint, normalize_params(params)], sort_keys=True)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    def __init__(self, path, ttls=None, default_ttl=DAY, max_bytes=256 * 1024 * 1024):
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stores = 0
+        self.lock = threading.Lock()
+        # shared by the fetcher's worker threads, guarded by self.lock
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " key TEXT PRIMARY KEY, endpoint TEXT, params TEXT, status INTEGER, body TEXT,"
+            " size INTEGER, stored_at REAL, used_at REAL)"
+        )
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_used ON responses (used_at)")
+        self.db.commit()
+
+    def ttl(self, endpoint):
+        return self.ttls.get(endpoint, self.default_ttl)
+
+    def get(self, url, params):
+        """Cached response for a GET, or None if missing or expired."""
+        endpoint = urlsplit(url).path
+        key = cache_key(endpoint, params)
+        now = time.time()
+        with self.lock:
+            row = self.db.execute(
+                "SELECT status, body, stored_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and now - row[2] > self.ttl(endpoint):
+                self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.db.commit()
+                self.expired += 1
+                row = None
+            elif row is not None and not has_result(row[1]):  # stored before has_result existed
+                self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self.db.commit()
+                row = None
+            if row is None:
+                self.misses += 1
+                return None
+            self.db.execute("UPDATE responses SET used_at = ? WHERE key = ?", (now, key))
+            self.db.commit()
+            self.hits += 1
+        return CachedResponse(row[0], row[1])
+
+    def put(self, url, params, response):
+        if not response.ok or not has_result(response.text):
+            return
+        endpoint = urlsplit(url).path
+        body = response.text
+        size = len(body.encode("utf-8"))
+        now = time.time()
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (cache_key(endpoint, params), endpoint, json.dumps(normalize_params(params)),
+                 response.status_code, body, size, now, now),
+            )
+            self.stores += 1
+            self._evict()
+            self.db.commit()
+
+    def _evict(self):
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self.db.execute("SELECT key, size FROM responses ORDER BY used_at").fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self.db.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def clear(self):
+        """Drop every entry; counters are kept."""
+        with self.lock:
+            self.db.execute("DELETE FROM responses")
+            self.db.commit()
+
+    def stats(self):
+        with self.lock:
+            entries, size = self.db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "stores": self.stores,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def close(self):
+        self.db.close()
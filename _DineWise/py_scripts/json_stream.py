@@ -0,0 +1,149 @@
+"""Streaming readers and writers for the restaurant and Yelp data files.
+
+iter_records() yields the elements of a top-level JSON array (or the lines of
+a .jsonl file) one at a time, decoding a single element at a time with
+json.JSONDecoder.raw_decode, so a large file never has to fit in memory as a
+whole. open_writer() is the other half: it writes records one by one to a
+temporary file and moves it over the target on close, which also makes it
+safe to rewrite a file that is still being read.
+
+ProjectManagement/scheduling/jsonstream.py carries the same buffering and
+raw_decode logic for tasks.json files (the two subprojects do not share
+code); keep the two in step.
+"""
+
+import json
+import os
+import re
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DELIMITERS = " \t\n\r,:]}"
+
+
+def _iter_array(fp, chunk_size):
+    decoder = json.JSONDecoder()
+    buf, pos, eof = "", 0, False
+
+    def fill():
+        nonlocal buf, pos, eof
+        chunk = fp.read(chunk_size)
+        if not chunk:
+            eof = True
+            return False
+        buf, pos = buf[pos:] + chunk, 0
+        return True
+
+    def peek():
+        nonlocal pos
+        while True:
+            pos = _WHITESPACE.match(buf, pos).end()
+            if pos < len(buf):
+                return buf[pos]
+            if not fill():
+                return ""
+
+    if peek() != "[":
+        raise ValueError("Expected a JSON array")
+    pos += 1
+    if peek() == "]":
+        return
+    while True:
+        peek()
+        try:
+            obj, end = decoder.raw_decode(buf, pos)
+        except json.JSONDecodeError:
+            if eof or not fill():
+                raise
+            continue
+        # a number cut off at the buffer edge still decodes ("2" of "2.5",
+        # even "2" of "2e5" once "2e" is read); read on to be sure
+        if not eof and (end == len(buf) or buf[end] not in _DELIMITERS) and fill():
+            continue
+        pos = end
+        yield obj
+        ch = peek()
+        if ch == "]":
+            return
+        if ch != ",":
+            raise ValueError(f"Expected ',' or ']' in JSON array, found {ch!r}")
+        pos += 1
+
+
+def iter_records(path, chunk_size=1 << 16):
+    """Yield each record of a JSON array file, or of a .jsonl file (one per line)."""
+    with open(path, "r", encoding="utf-8") as fp:
+        if path.endswith(".jsonl"):
+            for line in fp:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from _iter_array(fp, chunk_size)
+
+
+def iter_batches(records, size):
+    """Group an iterable of records into lists of at most `size`."""
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class _Writer:
+    def __init__(self, path, indent):
+        self.path = path
+        self.indent = indent
+        self.count = 0
+        self.tmp = f"{path}.{os.getpid()}.tmp"
+        self.fp = open(self.tmp, "w", encoding="utf-8")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:  # leave the original file alone
+            self.fp.close()
+            os.remove(self.tmp)
+
+    def write_all(self, records):
+        for record in records:
+            self.write(record)
+
+
+class JsonArrayWriter(_Writer):
+    """Writes a JSON array like json.dump(records, fp, indent=4), one record at a time."""
+
+    def write(self, record):
+        text = json.dumps(record, indent=self.indent)
+        if self.indent is not None:
+            pad = " " * self.indent
+            text = pad + text.replace("\n", "\n" + pad)
+        self.fp.write(("[\n" if self.count == 0 else ",\n") + text)
+        self.count += 1
+
+    def close(self):
+        self.fp.write("\n]" if self.count else "[]")
+        self.fp.close()
+        os.replace(self.tmp, self.path)
+
+
+class JsonlWriter(_Writer):
+    def write(self, record):
+        self.fp.write(json.dumps(record) + "\n")
+        self.count += 1
+
+    def close(self):
+        self.fp.close()
+        os.replace(self.tmp, self.path)
+
+
+def open_writer(path, indent=4):
+    """JsonlWriter for .jsonl paths, else a JsonArrayWriter; use as a context manager."""
+    if path.endswith(".jsonl"):
+        return JsonlWriter(path, None)
+    return JsonArrayWriter(path, indent)
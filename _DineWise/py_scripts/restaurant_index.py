@@ -0,0 +1,315 @@
+"""In-memory query engine over restaurants-v001.json joined with yelp-data.json.
+
+RestaurantIndex keeps one flat row per restaurant plus:
+
+* hash indexes: id -> row, category -> rows, price -> rows;
+* a sorted rating index (rows ordered by rating, with the ratings alongside
+  for bisect), which also serves "best rated first" without sorting;
+* a geo grid of GRID_DEGREES cells for nearest-N and radius lookups. Rows
+  use the restaurant's latitude/longitude, or Yelp's coordinates when the
+  restaurant has none; rows without either are left out of geo queries.
+
+query() filters, sorts and paginates using those indexes. open() loads the
+pickled indexes from disk, rebuilding them when a source file has changed:
+
+    python py_scripts/restaurant_index.py --category Italian --min-rating 4 --sort=-rating
+"""
+
+import argparse
+import bisect
+import itertools
+import math
+import os
+import pickle
+
+from json_stream import iter_records
+
+GRID_DEGREES = 0.01  # about 1.1 km north-south
+EARTH_KM = 6371.0
+SORT_KEYS = ("rating", "review_count", "company", "distance")
+INDEX_VERSION = 1  # bump when the persisted layout changes
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp, dl = p2 - p1, math.radians(lon2 - lon1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * EARTH_KM * math.asin(math.sqrt(a))
+
+
+def _cell(lat, lon):
+    return (math.floor(lat / GRID_DEGREES), math.floor(lon / GRID_DEGREES))
+
+
+def _ring(cx, cy, r):
+    """Grid cells at Chebyshev distance r from (cx, cy)."""
+    if r == 0:
+        yield cx, cy
+        return
+    for x in range(cx - r, cx + r + 1):
+        yield x, cy - r
+        yield x, cy + r
+    for y in range(cy - r + 1, cy + r):
+        yield cx - r, y
+        yield cx + r, y
+
+
+class RestaurantIndex:
+    def __init__(self, restaurants, yelp_entries=()):
+        yelp = {entry['restaurant_id']: entry for entry in yelp_entries}
+        self.rows = []
+        for restaurant in restaurants:
+            entry = yelp.get(restaurant.get('id'), {})
+            data = entry.get('yelp_data') or {}
+            coords = data.get('coordinates') or {}
+            lat = _float(restaurant.get('latitude'))
+            lon = _float(restaurant.get('longitude'))
+            if lat is None or lon is None:
+                lat, lon = _float(coords.get('latitude')), _float(coords.get('longitude'))
+            self.rows.append({
+                'id': restaurant.get('id'),
+                'company': restaurant.get('company'),
+                'category': restaurant.get('category'),
+                'address': restaurant.get('address'),
+                'url': restaurant.get('url'),
+                'latitude': lat,
+                'longitude': lon,
+                'yelp_business_id': entry.get('yelp_business_id'),
+                'rating': _float(data.get('rating')),
+                'review_count': data.get('review_count') or 0,
+                'price': data.get('price'),
+            })
+        self._build()
+
+    def _build(self):
+        self.by_id = {}
+        self.by_category = {}
+        self.by_price = {}
+        self.grid = {}
+        for i, row in enumerate(self.rows):
+            self.by_id[row['id']] = i
+            self.by_category.setdefault(row['category'], set()).add(i)
+            self.by_price.setdefault(row['price'], set()).add(i)
+            if row['latitude'] is not None:
+                self.grid.setdefault(_cell(row['latitude'], row['longitude']), []).append(i)
+        rated = sorted((row['rating'], i) for i, row in enumerate(self.rows) if row['rating'] is not None)
+        self.rating_values = [rating for rating, _ in rated]
+        self.rating_order = [i for _, i in rated]  # ascending rating
+        self.unrated = [i for i, row in enumerate(self.rows) if row['rating'] is None]
+
+    @classmethod
+    def from_files(cls, restaurants_file, yelp_file=None):
+        yelp = iter_records(yelp_file) if yelp_file and os.path.exists(yelp_file) else ()
+        return cls(iter_records(restaurants_file), yelp)
+
+    @classmethod
+    def open(cls, restaurants_file, yelp_file=None, index_file=None):
+        """Load the persisted index, or build (and save) it if a source file changed."""
+        sources = [f for f in (restaurants_file, yelp_file) if f and os.path.exists(f)]
+        fingerprint = [INDEX_VERSION] + [(f, os.stat(f).st_mtime_ns, os.stat(f).st_size) for f in sources]
+        if index_file and os.path.exists(index_file):
+            try:
+                with open(index_file, 'rb') as f:
+                    saved_fingerprint, state = pickle.load(f)
+                if saved_fingerprint == fingerprint:
+                    index = cls.__new__(cls)
+                    index.__dict__.update(state)
+                    return index
+            except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+                pass  # rebuild below
+        index = cls.from_files(restaurants_file, yelp_file)
+        if index_file:
+            index.save(index_file, fingerprint)
+        return index
+
+    def save(self, path, fingerprint=None):
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, 'wb') as f:
+            # plain state, so the file loads whether this module ran as a script or not
+            pickle.dump((fingerprint, self.__dict__), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, path)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def get(self, restaurant_id):
+        i = self.by_id.get(restaurant_id)
+        return None if i is None else self.rows[i]
+
+    def rating_range(self, min_rating=None, max_rating=None):
+        """Rows with min_rating <= rating <= max_rating, in ascending rating order."""
+        lo = 0 if min_rating is None else bisect.bisect_left(self.rating_values, min_rating)
+        hi = len(self.rating_values) if max_rating is None else bisect.bisect_right(self.rating_values, max_rating)
+        return self.rating_order[lo:hi]
+
+    def _rating_descending(self):
+        """Rated rows by descending rating, ties in ascending row order (as the sort path)."""
+        hi = len(self.rating_values)
+        while hi:
+            lo = bisect.bisect_left(self.rating_values, self.rating_values[hi - 1])
+            yield from self.rating_order[lo:hi]
+            hi = lo
+
+    def within(self, lat, lon, radius_km):
+        """{row: distance_km} for rows within radius_km of (lat, lon)."""
+        dlat = radius_km / 111.0
+        dlon = radius_km / (111.0 * max(math.cos(math.radians(lat)), 1e-6))
+        (c0, d0), (c1, d1) = _cell(lat - dlat, lon - dlon), _cell(lat + dlat, lon + dlon)
+        found = {}
+        for cx in range(c0, c1 + 1):
+            for cy in range(d0, d1 + 1):
+                for i in self.grid.get((cx, cy), ()):
+                    row = self.rows[i]
+                    d = haversine_km(lat, lon, row['latitude'], row['longitude'])
+                    if d <= radius_km:
+                        found[i] = d
+        return found
+
+    def nearest(self, lat, lon, n=10, candidates=None):
+        """[(row, distance_km)] for the n closest rows (optionally among `candidates`).
+
+        Searches rings of grid cells outward until the n-th distance found is
+        inside the area already covered.
+        """
+        if not self.grid or n <= 0:
+            return []
+        cx, cy = _cell(lat, lon)
+        cell_km = GRID_DEGREES * 111.0 * max(math.cos(math.radians(lat)), 1e-6)
+        max_ring = max(max(abs(x - cx), abs(y - cy)) for x, y in self.grid)
+        found = []
+
+        def visit(cells):
+            for cell in cells:
+                for i in self.grid.get(cell, ()):
+                    if candidates is None or i in candidates:
+                        row = self.rows[i]
+                        found.append((haversine_km(lat, lon, row['latitude'], row['longitude']), i))
+
+        for ring in range(max_ring + 1):
+            if (2 * ring + 1) ** 2 > 4 * len(self.grid):
+                # far from the data: visit the remaining occupied cells nearest
+                # first, until a cell's closest possible point is too far
+                half_diagonal = GRID_DEGREES * 111.0 * math.hypot(1.0, math.cos(math.radians(lat))) / 2
+                rest = sorted(
+                    (haversine_km(lat, lon, (x + 0.5) * GRID_DEGREES, (y + 0.5) * GRID_DEGREES), (x, y))
+                    for x, y in self.grid if max(abs(x - cx), abs(y - cy)) >= ring
+                )
+                for centre_km, cell in rest:
+                    if len(found) >= n:
+                        found.sort()
+                        if centre_km - half_diagonal > found[n - 1][0]:
+                            break
+                    visit([cell])
+                break
+            visit(_ring(cx, cy, ring))
+            if len(found) >= n:
+                found.sort()
+                if found[n - 1][0] <= ring * cell_km:
+                    break
+        found.sort()
+        return [(i, d) for d, i in found[:n]]
+
+    def query(self, category=None, price=None, min_rating=None, max_rating=None,
+              near=None, radius_km=None, sort=None, offset=0, limit=20):
+        """Filter, sort and paginate; returns {'total': N, 'results': [row, ...]}.
+
+        `category`/`price` take one value or a list. `near` is (lat, lon):
+        with radius_km it filters, and results carry 'distance_km'. `sort` is
+        one of SORT_KEYS, with a leading '-' for descending ("-rating").
+        """
+        sets = []
+        for values, index in ((category, self.by_category), (price, self.by_price)):
+            if values is not None:
+                values = [values] if isinstance(values, str) else values
+                if len(values) == 1:
+                    sets.append(index.get(values[0], set()))  # shared, never modified
+                else:
+                    sets.append(set().union(*(index.get(v, ()) for v in values)))
+        if min_rating is not None or max_rating is not None:
+            sets.append(set(self.rating_range(min_rating, max_rating)))
+        distances = {}
+        if near is not None and radius_km is not None:
+            distances = self.within(near[0], near[1], radius_km)
+            sets.append(set(distances))
+        sets.sort(key=len)
+        matches = sets[0].intersection(*sets[1:]) if sets else None  # None: every row
+
+        key, descending = (sort or "").lstrip("-"), (sort or "").startswith("-")
+        if key and key not in SORT_KEYS:
+            raise ValueError(f"Unknown sort key: {sort} (expected one of {SORT_KEYS})")
+        if key == "distance" and near is None:
+            raise ValueError("Sorting by distance needs near=(lat, lon)")
+
+        if key == "distance" and radius_km is None:
+            # only rows on the grid (with coordinates) have a distance to sort by
+            if matches is None:
+                total = sum(len(cell) for cell in self.grid.values())
+            else:
+                total = sum(1 for i in matches if self.rows[i]['latitude'] is not None)
+            if descending:  # farthest first: every located match has to be ranked
+                distances = {i: haversine_km(near[0], near[1], self.rows[i]['latitude'], self.rows[i]['longitude'])
+                             for cell in self.grid.values() for i in cell if matches is None or i in matches}
+                order = sorted(distances, key=distances.__getitem__, reverse=True)
+            else:
+                distances = dict(self.nearest(near[0], near[1], offset + limit, matches))
+                order = list(distances)
+        elif key == "rating" and (matches is None or len(matches) > len(self.rating_order) // 8):
+            # walk the rating index lazily instead of sorting a large match set
+            ranked = self._rating_descending() if descending else iter(self.rating_order)
+            ranked = itertools.chain(ranked, self.unrated)
+            if matches is not None:
+                ranked = (i for i in ranked if i in matches)
+            total = len(self.rows) if matches is None else len(matches)
+            order = list(itertools.islice(ranked, offset + limit))
+        else:
+            order = list(range(len(self.rows))) if matches is None else sorted(matches)
+            if key == "distance":
+                order.sort(key=distances.__getitem__, reverse=descending)
+            elif key:
+                missing = "" if key == "company" else 0
+                order.sort(key=lambda i: missing if self.rows[i][key] is None else self.rows[i][key],
+                           reverse=descending)
+                order.sort(key=lambda i: self.rows[i][key] is None)  # unknown values last
+            total = len(order)
+
+        results = []
+        for i in order[offset:offset + limit]:
+            row = dict(self.rows[i])
+            if i in distances:
+                row['distance_km'] = distances[i]
+            results.append(row)
+        return {'total': total, 'results': results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query restaurants with their Yelp data.")
+    parser.add_argument("--restaurants", default="./data/restaurants-v001.json")
+    parser.add_argument("--yelp", default="./data/yelp-data.json")
+    parser.add_argument("--index", default="./data/restaurant-index.pickle")
+    parser.add_argument("--category", nargs="*")
+    parser.add_argument("--price", nargs="*")
+    parser.add_argument("--min-rating", type=float)
+    parser.add_argument("--max-rating", type=float)
+    parser.add_argument("--near", help="LAT,LON")
+    parser.add_argument("--radius-km", type=float)
+    parser.add_argument("--sort", help=f"one of {SORT_KEYS}, '-' prefix for descending")
+    parser.add_argument("--offset", type=int, default=0)
+    parser.add_argument("--limit", type=int, default=20)
+    args = parser.parse_args()
+
+    index = RestaurantIndex.open(args.restaurants, args.yelp, args.index)
+    near = tuple(float(x) for x in args.near.split(",")) if args.near else None
+    result = index.query(args.category, args.price, args.min_rating, args.max_rating,
+                         near, args.radius_km, args.sort, args.offset, args.limit)
+    print(f"{result['total']} matches")
+    for row in result['results']:
+        distance = f"  {row['distance_km']:.2f} km" if 'distance_km' in row else ""
+        print(f"{row['id']}  {row['company']:<40} {row['category'] or '':<28} "
+              f"{row['price'] or '-':<4} {row['rating'] if row['rating'] is not None else '-':<4}{distance}")
@@ -0,0 +1,316 @@
+"""Inverted full-text index over Yelp review text, ranked with BM25.
+
+Each review is one document. Postings are stored CSR-style in flat arrays
+(term_ptr -> doc ids and term frequencies), next to per-document arrays for
+restaurant id, rating, length and category. save() writes everything to one
+file (a JSON header, then the raw arrays); open() maps that file with mmap,
+so postings and review texts are read in place instead of parsed.
+
+New reviews (add_entry, e.g. from YelpDataFetcher) go into an in-memory
+segment that search() merges with the mapped one. Adding a restaurant again
+replaces its earlier reviews. save() folds both segments into a new file.
+
+    python py_scripts/review_index.py build
+    python py_scripts/review_index.py search "wood fired pizza" --min-rating 4 --category Italian
+"""
+
+import argparse
+import heapq
+import json
+import math
+import mmap
+import os
+import re
+import struct
+from array import array
+
+from json_stream import iter_records
+
+MAGIC = b"REVIDX01"
+K1 = 1.2
+B = 0.75
+STOPWORDS = frozenset("""
+    a about after all also am an and any are as at be been but by can could did do does
+    for from had has have he her here him his how i if in into is it its just me more most
+    my no not of on or our out she so than that the their them then there these they this
+    to too up us very was we were what when where which who will with would you your
+""".split())
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+# section name -> array typecode, in file order
+SECTIONS = {
+    "term_ptr": "Q", "post_docs": "I", "post_tfs": "I",
+    "doc_restaurant": "q", "doc_rating": "f", "doc_length": "I", "doc_category": "I",
+    "text_ptr": "Q", "text_blob": "B", "rid_ptr": "Q", "rid_blob": "B",
+}
+
+
+def tokenize(text):
+    return [t for t in _TOKEN.findall((text or "").lower().replace("'", "")) if t not in STOPWORDS]
+
+
+def _data_start(header_len):
+    return (16 + header_len + 7) // 8 * 8
+
+
+def _pack_strings(strings):
+    ptr, blob = array("Q", [0]), bytearray()
+    for s in strings:
+        blob += s.encode("utf-8")
+        ptr.append(len(blob))
+    return ptr, array("B", blob)
+
+
+class ReviewIndex:
+    def __init__(self):
+        self.categories = []
+        self.category_codes = {}
+        self.doc_restaurant = array("q")
+        self.doc_rating = array("f")
+        self.doc_length = array("I")
+        self.doc_category = array("I")
+        self.total_length = 0
+        self.restaurant_docs = {}
+        self.deleted = set()
+        # mapped segment (empty until open())
+        self._mmap = None
+        self._terms = {}
+        self._term_ptr = array("Q", [0])
+        self._post_docs = array("I")
+        self._post_tfs = array("I")
+        self._texts = self._rids = (array("Q", [0]), array("B"))
+        self._n_base = 0
+        # in-memory segment
+        self._new_postings = {}
+        self._new_texts = []
+        self._new_rids = []
+
+    @classmethod
+    def open(cls, path):
+        """Map an index file; a missing file gives an empty index."""
+        index = cls()
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return index
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if mm[:len(MAGIC)] != MAGIC:
+            raise ValueError(f"Not a review index: {path}")
+        (header_len,) = struct.unpack_from("<Q", mm, len(MAGIC))
+        header = json.loads(mm[16:16 + header_len])
+        start = _data_start(header_len)
+        view = memoryview(mm)
+        sections = {}
+        for name, (offset, nbytes) in header["sections"].items():
+            sections[name] = view[start + offset:start + offset + nbytes].cast(SECTIONS[name])
+        index._mmap = mm
+        index._terms = {term: i for i, term in enumerate(header["terms"])}
+        index._term_ptr = sections["term_ptr"]
+        index._post_docs = sections["post_docs"]
+        index._post_tfs = sections["post_tfs"]
+        index._texts = (sections["text_ptr"], sections["text_blob"])
+        index._rids = (sections["rid_ptr"], sections["rid_blob"])
+        # per-document columns are small; copy them so new documents can be appended
+        index.doc_restaurant = array("q", sections["doc_restaurant"])
+        index.doc_rating = array("f", sections["doc_rating"])
+        index.doc_length = array("I", sections["doc_length"])
+        index.doc_category = array("I", sections["doc_category"])
+        index._n_base = len(index.doc_restaurant)
+        index.total_length = sum(index.doc_length)
+        index.categories = header["categories"]
+        index.category_codes = {c: i for i, c in enumerate(index.categories)}
+        for doc, rid in enumerate(index.doc_restaurant):
+            index.restaurant_docs.setdefault(rid, []).append(doc)
+        return index
+
+    @classmethod
+    def build(cls, yelp_entries, categories=None):
+        """Index every review of `yelp_entries`; `categories` maps restaurant_id -> category."""
+        index = cls()
+        categories = categories or {}
+        for entry in yelp_entries:
+            index.add_entry(entry, categories.get(entry.get("restaurant_id")))
+        return index
+
+    def __len__(self):
+        return len(self.doc_restaurant) - len(self.deleted)
+
+    def _category_code(self, category):
+        category = category or ""
+        if category not in self.category_codes:
+            self.category_codes[category] = len(self.categories)
+            self.categories.append(category)
+        return self.category_codes[category]
+
+    def add_entry(self, yelp_entry, category=None):
+        """Index the reviews of one yelp_entry, replacing that restaurant's earlier ones."""
+        rid = yelp_entry["restaurant_id"]
+        for doc in self.restaurant_docs.pop(rid, ()):
+            self.deleted.add(doc)
+            self.total_length -= self.doc_length[doc]
+        code = self._category_code(category)
+        for review in yelp_entry.get("reviews") or []:
+            doc = len(self.doc_restaurant)
+            tokens = tokenize(review.get("text"))
+            counts = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, tf in counts.items():
+                docs, tfs = self._new_postings.setdefault(token, (array("I"), array("I")))
+                docs.append(doc)
+                tfs.append(tf)
+            self.doc_restaurant.append(rid)
+            self.doc_rating.append(float(review.get("rating") or 0))
+            self.doc_length.append(len(tokens))
+            self.doc_category.append(code)
+            self.total_length += len(tokens)
+            self._new_texts.append(review.get("text") or "")
+            self._new_rids.append(str(review.get("id") or ""))
+            self.restaurant_docs.setdefault(rid, []).append(doc)
+
+    def _postings(self, term):
+        """(docs, tfs) pairs for the mapped and the in-memory segment."""
+        parts = []
+        t = self._terms.get(term)
+        if t is not None:
+            lo, hi = self._term_ptr[t], self._term_ptr[t + 1]
+            parts.append((self._post_docs[lo:hi], self._post_tfs[lo:hi]))
+        if term in self._new_postings:
+            parts.append(self._new_postings[term])
+        return parts
+
+    def _string(self, table, new, doc):
+        if doc >= self._n_base:
+            return new[doc - self._n_base]
+        ptr, blob = table
+        return bytes(blob[ptr[doc]:ptr[doc + 1]]).decode("utf-8")
+
+    def search(self, query, limit=10, min_rating=None, max_rating=None, categories=None):
+        """Top `limit` reviews for `query` by BM25, optionally filtered by rating and category."""
+        n_docs = len(self)
+        if not n_docs:
+            return []
+        avgdl = self.total_length / n_docs or 1.0
+        allowed = None
+        if categories is not None:
+            categories = [categories] if isinstance(categories, str) else categories
+            allowed = {self.category_codes[c] for c in categories if c in self.category_codes}
+        lo = -math.inf if min_rating is None else min_rating
+        hi = math.inf if max_rating is None else max_rating
+        ratings, lengths, cats, deleted = self.doc_rating, self.doc_length, self.doc_category, self.deleted
+
+        scores = {}
+        for term in set(tokenize(query)):
+            parts = self._postings(term)
+            df = sum(len(docs) for docs, _ in parts)
+            if deleted:  # replaced reviews don't count until save() drops them
+                df -= sum(1 for docs, _ in parts for doc in docs if doc in deleted)
+            if not df:
+                continue
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            for docs, tfs in parts:
+                for doc, tf in zip(docs, tfs):
+                    if doc in deleted or not lo <= ratings[doc] <= hi:
+                        continue
+                    if allowed is not None and cats[doc] not in allowed:
+                        continue
+                    norm = tf + K1 * (1 - B + B * lengths[doc] / avgdl)
+                    scores[doc] = scores.get(doc, 0.0) + idf * tf * (K1 + 1) / norm
+
+        results = []
+        for doc, score in heapq.nlargest(limit, scores.items(), key=lambda item: item[1]):
+            results.append({
+                "restaurant_id": self.doc_restaurant[doc],
+                "review_id": self._string(self._rids, self._new_rids, doc),
+                "rating": self.doc_rating[doc],
+                "category": self.categories[self.doc_category[doc]],
+                "score": score,
+                "text": self._string(self._texts, self._new_texts, doc),
+            })
+        return results
+
+    def save(self, path):
+        """Write both segments (minus replaced reviews) to `path` as one mappable file.
+
+        The index then maps the new file, with an empty in-memory segment.
+        """
+        live = [doc for doc in range(len(self.doc_restaurant)) if doc not in self.deleted]
+        renumber = {doc: i for i, doc in enumerate(live)}
+        terms = sorted(set(self._terms) | set(self._new_postings))
+        term_ptr, post_docs, post_tfs = array("Q", [0]), array("I"), array("I")
+        kept_terms = []
+        for term in terms:
+            before = len(post_docs)
+            for docs, tfs in self._postings(term):
+                if self.deleted:
+                    for doc, tf in zip(docs, tfs):
+                        if doc in renumber:
+                            post_docs.append(renumber[doc])
+                            post_tfs.append(tf)
+                else:
+                    post_docs.extend(docs)
+                    post_tfs.extend(tfs)
+            if len(post_docs) > before:
+                kept_terms.append(term)
+                term_ptr.append(len(post_docs))
+        text_ptr, text_blob = _pack_strings(self._string(self._texts, self._new_texts, d) for d in live)
+        rid_ptr, rid_blob = _pack_strings(self._string(self._rids, self._new_rids, d) for d in live)
+        columns = {
+            "term_ptr": term_ptr, "post_docs": post_docs, "post_tfs": post_tfs,
+            "doc_restaurant": array("q", (self.doc_restaurant[d] for d in live)),
+            "doc_rating": array("f", (self.doc_rating[d] for d in live)),
+            "doc_length": array("I", (self.doc_length[d] for d in live)),
+            "doc_category": array("I", (self.doc_category[d] for d in live)),
+            "text_ptr": text_ptr, "text_blob": text_blob, "rid_ptr": rid_ptr, "rid_blob": rid_blob,
+        }
+
+        # sections start on 8-byte boundaries after the header, so they can be
+        # cast in place; offsets are relative to the first section
+        sections, offset = {}, 0
+        for name in SECTIONS:
+            nbytes = len(columns[name]) * columns[name].itemsize
+            sections[name] = [offset, nbytes]
+            offset += (nbytes + 7) // 8 * 8
+        header = {"version": 1, "terms": kept_terms, "categories": self.categories, "sections": sections}
+        blob = json.dumps(header).encode("utf-8")
+        start = _data_start(len(blob))
+
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(MAGIC + struct.pack("<Q", len(blob)) + blob)
+            f.write(b"\0" * (start - 16 - len(blob)))
+            for name in SECTIONS:
+                data = columns[name].tobytes()
+                f.write(data + b"\0" * (-len(data) % 8))
+        os.replace(tmp, path)
+        # continue from the new file (the old mapping goes away with its last view)
+        self.__dict__.update(type(self).open(path).__dict__)
+
+
+def load_categories(restaurants_file):
+    return {r.get("id"): r.get("category") for r in iter_records(restaurants_file)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Full-text search over Yelp reviews.")
+    parser.add_argument("--index", default="./data/review-index.bin")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("build", help="index every review in the Yelp data")
+    p.add_argument("--yelp", default="./data/yelp-data.json", help="yelp-data.json or a .jsonl checkpoint")
+    p.add_argument("--restaurants", default="./data/restaurants-v001.json")
+    p = sub.add_parser("search")
+    p.add_argument("query")
+    p.add_argument("--limit", type=int, default=10)
+    p.add_argument("--min-rating", type=float)
+    p.add_argument("--max-rating", type=float)
+    p.add_argument("--category", nargs="*")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        index = ReviewIndex.build(iter_records(args.yelp), load_categories(args.restaurants))
+        index.save(args.index)
+        print(f"Indexed {len(index)} reviews into {args.index}")
+    else:
+        index = ReviewIndex.open(args.index)
+        for hit in index.search(args.query, args.limit, args.min_rating, args.max_rating, args.category):
+            print(f"{hit['score']:6.2f}  restaurant {hit['restaurant_id']}  {hit['rating']:.0f}*  "
+                  f"{hit['category']}: {hit['text']}")
@@ -1,16 +1,13 @@
-import json
+from json_stream import iter_records, open_writer
 
 def add_ids_to_restaurants(file_path):
-    with open(file_path, 'r') as file:
-        restaurants = json.load(file)
-    
-    for i, restaurant in enumerate(restaurants):
-        restaurant['id'] = 1000 + i
-    
-    with open(file_path, 'w') as file:
-        json.dump(restaurants, file, indent=4)
+    # streams the records through a temporary file, so the list is never loaded whole
+    with open_writer(file_path, indent=4) as writer:
+        for i, restaurant in enumerate(iter_records(file_path)):
+            restaurant['id'] = 1000 + i
+            writer.write(restaurant)
 
 if __name__ == "__main__":
     file_path = "./data/restaurants-v001.json"
     add_ids_to_restaurants(file_path)
-    print("Successfully added IDs to restaurants")
\ No newline at end of file
+    print("Successfully added IDs to restaurants")
@@ -0,0 +1,206 @@
+"""Columnar snapshot of the Yelp data for analytics.
+
+build() streams yelp-data.json (or the .jsonl checkpoint) once and writes a
+directory of .npy files:
+
+* restaurants.npy: one structured row per restaurant (id, rating,
+  review_count, and dictionary codes for company, category, price and Yelp
+  business id);
+* reviews.npy: one structured row per review (rating, time_created);
+* review_offsets.npy: reviews of restaurant i are reviews[offsets[i]:offsets[i + 1]];
+* dictionaries.json: the strings behind each code column.
+
+YelpSnapshot.open() maps the arrays with np.load(mmap_mode="r"), so opening
+is instant and the aggregates below read the columns in place:
+
+    python py_scripts/yelp_snapshot.py build
+    python py_scripts/yelp_snapshot.py summary
+"""
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+from json_stream import iter_records
+from review_index import load_categories
+
+RESTAURANT_DTYPE = np.dtype([
+    ("restaurant_id", "<i8"),
+    ("rating", "<f4"),          # NaN when Yelp has none
+    ("review_count", "<i4"),
+    ("company", "<u4"),
+    ("category", "<u2"),
+    ("price", "<u1"),           # code 0 is "no price"
+    ("business_id", "<u4"),
+])
+REVIEW_DTYPE = np.dtype([
+    ("rating", "<f4"),
+    ("time_created", "<M8[s]"),
+])
+DICTIONARIES = ("company", "category", "price", "business_id")
+
+
+class _Dictionary:
+    def __init__(self, first=None):
+        self.values = [] if first is None else [first]
+        self.codes = {v: i for i, v in enumerate(self.values)}
+
+    def code(self, value):
+        if value not in self.codes:
+            self.codes[value] = len(self.values)
+            self.values.append(value)
+        return self.codes[value]
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def build(yelp_entries, out_dir, categories=None):
+    """Write a snapshot of `yelp_entries` to out_dir; `categories` maps restaurant_id -> category."""
+    categories = categories or {}
+    dicts = {name: _Dictionary() for name in DICTIONARIES}
+    dicts["price"] = _Dictionary("")
+    rows, reviews, position = [], [], {}
+    for entry in yelp_entries:
+        data = entry.get("yelp_data") or {}
+        row = (
+            entry["restaurant_id"],
+            _float(data.get("rating")),
+            data.get("review_count") or 0,
+            dicts["company"].code(entry.get("company") or ""),
+            dicts["category"].code(categories.get(entry["restaurant_id"]) or ""),
+            dicts["price"].code(data.get("price") or ""),
+            dicts["business_id"].code(entry.get("yelp_business_id") or ""),
+        )
+        entry_reviews = []
+        for review in entry.get("reviews") or []:
+            created = review.get("time_created")
+            entry_reviews.append((_float(review.get("rating")),
+                                  np.datetime64(created.replace(" ", "T")) if created else np.datetime64("NaT")))
+        i = position.get(row[0])
+        if i is None:  # a checkpoint can list a restaurant again after a retry; the later entry wins
+            position[row[0]] = len(rows)
+            rows.append(row)
+            reviews.append(entry_reviews)
+        else:
+            rows[i], reviews[i] = row, entry_reviews
+    offsets = np.zeros(len(rows) + 1, dtype="<i8")
+    np.cumsum([len(r) for r in reviews], out=offsets[1:])
+
+    os.makedirs(out_dir, exist_ok=True)
+    np.save(os.path.join(out_dir, "restaurants.npy"), np.array(rows, dtype=RESTAURANT_DTYPE))
+    np.save(os.path.join(out_dir, "reviews.npy"),
+            np.array([r for entry_reviews in reviews for r in entry_reviews], dtype=REVIEW_DTYPE))
+    np.save(os.path.join(out_dir, "review_offsets.npy"), offsets)
+    with open(os.path.join(out_dir, "dictionaries.json"), "w") as f:
+        json.dump({name: d.values for name, d in dicts.items()}, f)
+    return len(rows), int(offsets[-1])
+
+
+class YelpSnapshot:
+    def __init__(self, restaurants, reviews, review_offsets, dictionaries):
+        self.restaurants = restaurants
+        self.reviews = reviews
+        self.review_offsets = review_offsets
+        self.dictionaries = dictionaries
+
+    @classmethod
+    def open(cls, snapshot_dir):
+        def load(name):
+            return np.load(os.path.join(snapshot_dir, name), mmap_mode="r")
+
+        with open(os.path.join(snapshot_dir, "dictionaries.json")) as f:
+            dictionaries = json.load(f)
+        return cls(load("restaurants.npy"), load("reviews.npy"), load("review_offsets.npy"), dictionaries)
+
+    def __len__(self):
+        return len(self.restaurants)
+
+    def decode(self, column, codes):
+        values = self.dictionaries[column]
+        return [values[c] for c in np.asarray(codes).tolist()]
+
+    def mean_rating_by(self, column="category"):
+        """{value: mean Yelp rating} over restaurants with a rating, grouped by a code column."""
+        codes = self.restaurants[column]
+        rating = self.restaurants["rating"]
+        rated = ~np.isnan(rating)
+        size = len(self.dictionaries[column])
+        totals = np.bincount(codes[rated], weights=rating[rated], minlength=size)
+        counts = np.bincount(codes[rated], minlength=size)
+        values = self.dictionaries[column]
+        return {values[i]: totals[i] / counts[i] for i in np.flatnonzero(counts).tolist()}
+
+    def count_by(self, column="price", by=None):
+        """Restaurant counts per value of `column`, or a {by value: {value: count}} crosstab."""
+        codes = self.restaurants[column].astype(np.int64)
+        size = len(self.dictionaries[column])
+        if by is None:
+            counts = np.bincount(codes, minlength=size)
+            return dict(zip(self.dictionaries[column], counts.tolist()))
+        groups = self.restaurants[by].astype(np.int64)
+        table = np.bincount(groups * size + codes, minlength=len(self.dictionaries[by]) * size)
+        table = table.reshape(-1, size)
+        return {g: dict(zip(self.dictionaries[column], row.tolist()))
+                for g, row in zip(self.dictionaries[by], table) if row.any()}
+
+    def rating_histogram(self, reviews=False, bins=None):
+        """(counts, bin_edges) of restaurant ratings, or of review ratings with reviews=True.
+
+        The default bins are half stars from 1 to 5 (restaurants) and whole
+        stars (reviews).
+        """
+        rating = (self.reviews if reviews else self.restaurants)["rating"]
+        rating = rating[~np.isnan(rating)]
+        if bins is None:
+            bins = np.arange(0.5, 5.51, 1.0) if reviews else np.arange(0.75, 5.26, 0.5)
+        return np.histogram(rating, bins=bins)
+
+    def review_mean_rating(self):
+        """Mean review rating per restaurant (NaN where it has no reviews)."""
+        offsets = np.asarray(self.review_offsets)
+        totals = np.concatenate(([0.0], np.cumsum(self.reviews["rating"], dtype=np.float64)))
+        sums = totals[offsets[1:]] - totals[offsets[:-1]]
+        counts = np.diff(offsets)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return sums / counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Columnar snapshot of the Yelp data.")
+    parser.add_argument("--snapshot", default="./data/yelp-snapshot")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("build")
+    p.add_argument("--yelp", default="./data/yelp-data.json", help="yelp-data.json or a .jsonl checkpoint")
+    p.add_argument("--restaurants", default="./data/restaurants-v001.json")
+    sub.add_parser("summary")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        start = time.perf_counter()
+        n_restaurants, n_reviews = build(iter_records(args.yelp), args.snapshot,
+                                         load_categories(args.restaurants))
+        print(f"Wrote {n_restaurants} restaurants and {n_reviews} reviews to {args.snapshot} "
+              f"in {time.perf_counter() - start:.2f}s")
+    else:
+        start = time.perf_counter()
+        snap = YelpSnapshot.open(args.snapshot)
+        by_category = snap.mean_rating_by("category")
+        prices = snap.count_by("price")
+        counts, edges = snap.rating_histogram(reviews=True)
+        elapsed = time.perf_counter() - start
+        print(f"{len(snap)} restaurants, {len(snap.reviews)} reviews")
+        print("Mean rating by category:")
+        for category, mean in sorted(by_category.items(), key=lambda kv: -kv[1]):
+            print(f"  {category or '(none)':<30} {mean:.2f}")
+        print("Restaurants by price: " + ", ".join(f"{p or 'n/a'}={n}" for p, n in prices.items()))
+        print("Review ratings: " + ", ".join(f"{(lo + hi) / 2:.0f}*={n}"
+                                             for lo, hi, n in zip(edges[:-1], edges[1:], counts.tolist())))
+        print(f"(opened and aggregated in {elapsed * 1000:.1f} ms)")